@@ -1,34 +1,125 @@
+import os
+import signal
 import pygame
-from src.game import Game
+from src.allocations import AllocationTracker
+from src.broadcast import BroadcastServer, DEFAULT_PORT
+from src.capture import FrameCapture
+from src.config import load_config
+from src.display import get_display
+from src.game import Game, KEY_PLAYERS
+from src.leaderboard import LeaderboardClient
+from src.pacing import FramePacer
+from src.performance import PerformanceMonitor
+from src.quality import QualityGovernor
+from src.profiler import SamplingProfiler, DEFAULT_DURATION
 from src.menu import Menu
 from src.settings import Settings
-from src.constants import *
-
-pygame.init()
+from src.sound_manager import SoundManager
+from src.startup import StartupTimer
 
 class GameManager:
-    def __init__(self):
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-        pygame.display.set_caption("Endless Jumper - Enhanced Edition")
-        self.clock = pygame.time.Clock()
+    def __init__(self, startup=None):
+        # pygame modules are initialised on first use (display here, fonts
+        # in the registry) instead of all at once with pygame.init()
+        self.startup = startup or StartupTimer()
+        self.config = load_config()
+        # The only place the window is created; everything draws to display.surface
+        self.display = get_display(self.config)
+        self.screen = self.display.surface
+        self.startup.mark("display")
+        fps = self.config["game"]["fps"]
+        pacing = self.config["game"]["pacing"]
+        if pacing == "vsync" and not self.display.vsync:
+            # flip() won't block, so the pacer has to hold the rate on its own
+            pacing = "hybrid"
+        self.pacer = FramePacer(fps, pacing)
+        self.late_input = self.config["game"]["input_timing"] == "late"
         self.running = True
         self.state = "MENU"  # MENU, PLAYING, SETTINGS
         
         self.menu = Menu(self.screen)
         self.settings = Settings(self.screen)
+        # The mixer opens and effects decode in the background once the
+        # first frame is up
+        self.sound = SoundManager(self.settings, load=False)
+        self.startup.mark("menu")
         self.game = None
+        options = self.config["leaderboard"]
+        self.leaderboard = None
+        if options["url"]:
+            self.leaderboard = LeaderboardClient(options["url"], options["outbox"],
+                                                 options["name"], options["top"])
+        self.performance = PerformanceMonitor(max_samples=120)
+        self.show_performance = self.config["display"]["performance_overlay"]
+        self.quality = QualityGovernor(budget_ms=1000 / fps,
+                                       cooldown_frames=self.performance.max_samples)
+
+        # Set JUMPER_TRACE_ALLOC=1 to report per-frame allocations on exit
+        self.alloc_tracker = None
+        if os.environ.get("JUMPER_TRACE_ALLOC"):
+            self.alloc_tracker = AllocationTracker()
+            self.alloc_tracker.start()
+
+        # Set JUMPER_CAPTURE=dir (PNG frames) or file.raw to record gameplay
+        self.capture = None
+        if os.environ.get("JUMPER_CAPTURE"):
+            self.capture = FrameCapture(os.environ["JUMPER_CAPTURE"], self.screen)
+
+        # Set JUMPER_BROADCAST=1 (or a port) to let spectators watch on localhost
+        self.broadcast = None
+        if os.environ.get("JUMPER_BROADCAST"):
+            port = os.environ["JUMPER_BROADCAST"]
+            self.broadcast = BroadcastServer(port=int(port) if port != "1" else DEFAULT_PORT)
+            print(f"Broadcasting on port {self.broadcast.start()}")
+
+        # F9, SIGUSR1 or JUMPER_PROFILE=seconds start a sampling profile of
+        # the main loop; JUMPER_PROFILE_PSTATS=1 also writes a pstats file
+        self.profiler = SamplingProfiler(pstats=bool(os.environ.get("JUMPER_PROFILE_PSTATS")))
+        self.profile_duration = float(os.environ.get("JUMPER_PROFILE") or DEFAULT_DURATION)
+        self.profile_requested = bool(os.environ.get("JUMPER_PROFILE"))
+        if hasattr(signal, "SIGUSR1"):
+            signal.signal(signal.SIGUSR1, self.request_profile)
+
+    def request_profile(self, signum=None, frame=None):
+        # Only sets a flag, since it may run as a signal handler
+        self.profile_requested = True
         
     def run(self):
+        profiler = self.profiler
         while self.running:
-            for event in pygame.event.get():
+            # The allocation tracker brackets the whole iteration, so frames
+            # are back to back and share snapshots
+            if self.alloc_tracker:
+                self.alloc_tracker.begin_frame()
+            self.performance.start_work()
+            if self.profile_requested:
+                self.profile_requested = False
+                profiler.start(self.profile_duration)
+
+            profiler.phase = "events"
+            events = pygame.event.get()
+            self.performance.input_pumped(events, KEY_PLAYERS)
+            for event in events:
                 if event.type == pygame.QUIT:
                     self.running = False
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                    self.show_performance = not self.show_performance
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_F9:
+                    if profiler.running:
+                        profiler.stop()
+                    else:
+                        self.request_profile()
                 
                 if self.state == "MENU":
                     choice = self.menu.handle_input(event)
+                    if choice >= 0:
+                        self.sound.play("select")
                     if choice == 0:  # Start Game
                         self.state = "PLAYING"
-                        self.game = Game()
+                        self.game = Game(quality=self.quality, display=self.display,
+                                         sound=self.sound,
+                                         players=self.config["game"]["players"],
+                                         leaderboard=self.leaderboard)
                     elif choice == 1:  # Settings
                         self.state = "SETTINGS"
                     elif choice == 2:  # Quit
@@ -50,31 +141,81 @@ class GameManager:
                             elif event.key == pygame.K_p and not self.game.game_over:
                                 self.game.paused = not self.game.paused
             
+            profiler.phase = "menu"
             if self.state == "MENU":
                 self.menu.draw()
             elif self.state == "SETTINGS":
                 self.settings.draw()
             elif self.state == "PLAYING" and self.game:
+                profiler.phase = "update"
                 # Handle continuous key presses
                 if not self.game.paused and not self.game.game_over:
-                    keys = pygame.key.get_pressed()
-                    self.game.player.vel_x = (keys[pygame.K_RIGHT] - keys[pygame.K_LEFT]) * MOVE_SPEED
-                    
-                    if keys[pygame.K_UP] and self.game.player.double_jumps_left > 0:
-                        self.game.player.jump()
-                        self.game.total_jumps += 1
+                    changed = self.game.apply_input(pygame.key.get_pressed())
+                    self.performance.input_applied(changed)
                 
                 self.game.update()
+                if self.broadcast:
+                    self.broadcast.publish(self.game)
+                profiler.phase = "draw"
                 self.game.draw()
+                if self.capture:
+                    self.capture.capture(self.screen)
                 if not self.game.running:
                     self.state = "MENU"
-            
-            self.clock.tick(60)
+
+            if self.show_performance:
+                self.performance.draw_stats(self.screen, self.screen.get_width() - 230)
+            profiler.phase = "present"
+            self.performance.end_draw()
+            self.display.present()
+            self.performance.frame_presented()
+            self.sound.update()
+            if self.startup:
+                self.startup.mark("first frame")
+                self.sound.start_loading()
+                # Set JUMPER_STARTUP_REPORT=1 to print how long startup took
+                if os.environ.get("JUMPER_STARTUP_REPORT"):
+                    print(self.startup.format_report())
+                self.startup = None
+
+            self.performance.end_work()
+            if self.state == "PLAYING":
+                self.quality.update(self.performance)
+            profiler.phase = "pacing"
+            self.pacer.wait()
+            if self.late_input:
+                # Start the next frame only as early as it usually needs. Work
+                # times include the refresh flip() waits for, so they can't be used
+                lead = self.performance.get_percentile_ms(95, self.performance.draw_times)
+                self.pacer.wait_for_input(lead / 1000)
+            self.performance.update()
+            if self.alloc_tracker:
+                self.alloc_tracker.end_frame()
         
+        if self.game:
+            self.game.flush_high_score()
+        if self.alloc_tracker:
+            print(self.alloc_tracker.format_report())
+            self.alloc_tracker.stop()
+        if self.capture:
+            self.capture.close()
+            print(self.capture.format_report())
+        if self.broadcast:
+            self.broadcast.stop()
+        self.profiler.stop()
+        if self.leaderboard:
+            if self.game:
+                # A game over from the last frame may still be queued on the bus
+                self.game.events.dispatch()
+            self.leaderboard.close(timeout=5)
+        # Don't shut the mixer down while the loader is still opening it
+        self.sound.wait_until_loaded(timeout=2)
         pygame.quit()
 
 def main():
-    game_manager = GameManager()
+    startup = StartupTimer()
+    startup.mark("imports")
+    game_manager = GameManager(startup)
     game_manager.run()
 
 if __name__ == "__main__":
@@ -0,0 +1,162 @@
+import ast
+import fnmatch
+import os
+import re
+import tracemalloc
+from collections import defaultdict
+
+
+class FrameAllocations:
+    def __init__(self, blocks, size, peak, by_function):
+        self.blocks = blocks
+        self.size = size
+        self.peak = peak
+        self.by_function = by_function
+
+
+class AllocationTracker:
+    """Per-frame allocation tracking built on tracemalloc.
+
+    Each frame is bracketed by begin_frame()/end_frame(). The difference
+    between the two snapshots is grouped by (module, function) so hot spots
+    show up the same way they read in the source tree. Net growth is what
+    drives the cyclic GC, while the transient peak shows short-lived churn.
+    """
+
+    def __init__(self, depth=1, root=None):
+        self.depth = depth
+        self.root = root or os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        self.frames = []
+        self._functions = {}
+        self._snapshot = None
+        self._started = False
+        self._filters = [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+            # Modules the tracker itself leans on while taking snapshots
+            tracemalloc.Filter(False, ast.__file__),
+            tracemalloc.Filter(False, fnmatch.__file__),
+            tracemalloc.Filter(False, os.path.join(os.path.dirname(re.__file__), "*")),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<unknown>"),
+        ]
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.depth)
+            self._started = True
+
+    def stop(self):
+        if self._started:
+            tracemalloc.stop()
+            self._started = False
+        self._snapshot = None
+
+    def reset(self):
+        self.frames = []
+        self._snapshot = None
+
+    def begin_frame(self):
+        # Back-to-back frames share a snapshot: the one that ended the last
+        # frame is this frame's baseline. Blocks the snapshotting itself
+        # releases are then charged back to the frame that made them,
+        # instead of counting as growth that is never paid off. Anything run
+        # between end_frame() and begin_frame() would be charged to the next
+        # frame, so callers bracket the whole loop iteration, or call
+        # reset() to start from a fresh baseline.
+        if self._snapshot is None:
+            self._snapshot = tracemalloc.take_snapshot().filter_traces(self._filters)
+        if hasattr(tracemalloc, "reset_peak"):
+            tracemalloc.reset_peak()
+        self._frame_start_size = tracemalloc.get_traced_memory()[0]
+
+    def end_frame(self):
+        current, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot().filter_traces(self._filters)
+        by_function = defaultdict(lambda: [0, 0])
+        blocks = 0
+        size = 0
+        for stat in snapshot.compare_to(self._snapshot, "lineno"):
+            if stat.count_diff == 0 and stat.size_diff == 0:
+                continue
+            frame = stat.traceback[0]
+            entry = by_function[self._function_key(frame.filename, frame.lineno)]
+            entry[0] += stat.count_diff
+            entry[1] += stat.size_diff
+            blocks += stat.count_diff
+            size += stat.size_diff
+        frame_stats = FrameAllocations(blocks, size,
+                                       max(0, peak - self._frame_start_size),
+                                       dict(by_function))
+        self.frames.append(frame_stats)
+        self._snapshot = snapshot
+        return frame_stats
+
+    def _function_key(self, filename, lineno):
+        if filename not in self._functions:
+            self._functions[filename] = self._index_functions(filename)
+        module, spans = self._functions[filename]
+        function = "<module>"
+        for start, end, name in spans:
+            if start <= lineno <= end:
+                function = name
+        return module, function
+
+    def _index_functions(self, filename):
+        if filename.startswith(self.root):
+            module = os.path.relpath(filename, self.root)
+        else:
+            module = os.path.basename(filename)
+
+        spans = []
+        try:
+            with open(filename, "r") as f:
+                tree = ast.parse(f.read())
+        except (OSError, SyntaxError, ValueError):
+            return module, spans
+
+        def visit(node, prefix):
+            for child in ast.iter_child_nodes(node):
+                if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                    name = prefix + child.name
+                    if not isinstance(child, ast.ClassDef):
+                        spans.append((child.lineno, child.end_lineno, name))
+                    visit(child, name + ".")
+
+        visit(tree, "")
+        # Outer functions first so the innermost match wins in _function_key
+        spans.sort(key=lambda span: (span[0], -span[1]))
+        return module, spans
+
+    def totals(self):
+        totals = defaultdict(lambda: [0, 0])
+        for frame in self.frames:
+            for key, (blocks, size) in frame.by_function.items():
+                totals[key][0] += blocks
+                totals[key][1] += size
+        return totals
+
+    def average_blocks(self):
+        if not self.frames:
+            return 0
+        return sum(frame.blocks for frame in self.frames) / len(self.frames)
+
+    def average_peak(self):
+        if not self.frames:
+            return 0
+        return sum(frame.peak for frame in self.frames) / len(self.frames)
+
+    def format_report(self, limit=15):
+        count = len(self.frames)
+        lines = [f"Allocations over {count} frames: "
+                 f"{self.average_blocks():+.1f} blocks/frame, "
+                 f"{self.average_peak() / 1024:.1f} KiB transient peak/frame"]
+        if not count:
+            return "\n".join(lines)
+        totals = sorted(self.totals().items(),
+                        key=lambda item: abs(item[1][1]), reverse=True)
+        for (module, function), (blocks, size) in totals[:limit]:
+            lines.append(f"  {module}:{function}  "
+                         f"{blocks / count:+.2f} blocks/frame  "
+                         f"{size / count:+.1f} B/frame")
+        return "\n".join(lines)
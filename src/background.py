@@ -0,0 +1,114 @@
+import random
+import pygame
+from .constants import *
+
+# Background art is drawn from its own seed so it looks the same every run
+BACKGROUND_SEED = 7
+SKY_TOP = (10, 12, 40)
+SKY_BOTTOM = (0, 0, 8)
+
+_backgrounds = {}
+
+def _clear():
+    # The strips are converted to the display's format, which pygame.quit() drops
+    _backgrounds.clear()
+
+def get_background(target):
+    """Return the shared Background for surfaces like `target`, building it once."""
+    key = (target.get_size(), target.get_bitsize())
+    background = _backgrounds.get(key)
+    if background is None:
+        if not _backgrounds:
+            pygame.register_quit(_clear)
+        background = _backgrounds[key] = Background(target)
+    return background
+
+class ParallaxLayer:
+    """One background layer, prerendered into a strip that wraps vertically.
+
+    The strip holds the tile followed by enough repeats of it to cover a
+    screen, so the window seen at any scroll position is one contiguous
+    area of it and presenting the layer is a single blit, however much
+    was painted into the tile.
+    """
+
+    def __init__(self, factor, tile, target, transparent=False):
+        width, height = tile.get_size()
+        # Fraction of the camera's movement the layer follows; far layers crawl
+        self.factor = factor
+        self.height = height
+        strip = pygame.Surface((width, height + target.get_height()))
+        for y in range(0, strip.get_height(), height):
+            strip.blit(tile, (0, y))
+        if transparent:
+            strip.set_colorkey(BLACK, pygame.RLEACCEL)
+        self.strip = strip.convert(target)
+        self.area = pygame.Rect(0, 0, target.get_width(), target.get_height())
+
+    def draw(self, screen, camera_y):
+        self.area.y = int(camera_y * self.factor) % self.height
+        screen.blit(self.strip, (0, 0), self.area)
+
+class Background:
+    """Parallax backdrop of prerendered layers, drawn furthest first.
+
+    The first layer is opaque and replaces clearing the screen; the others
+    are keyed on black. All painting happens here, once; a frame only
+    blits the visible window of each layer.
+    """
+
+    def __init__(self, target):
+        rng = random.Random(BACKGROUND_SEED)
+        width = target.get_width()
+        self.layers = [
+            ParallaxLayer(0.05, sky_tile(rng, width, 1200), target),
+            ParallaxLayer(0.2, star_tile(rng, width, 900, 90, (90, 90, 120), 1), target, True),
+            ParallaxLayer(0.45, cloud_tile(rng, width, 1500), target, True),
+        ]
+
+    def draw(self, screen, camera_y, layers=None):
+        """Draw the first `layers` layers (all by default); none is a black fill."""
+        if layers == 0:
+            screen.fill(BLACK)
+            return
+        for layer in self.layers[:layers]:
+            layer.draw(screen, camera_y)
+
+def blend(top, bottom, t):
+    return tuple(int(a + (b - a) * t) for a, b in zip(top, bottom))
+
+def sky_tile(rng, width, height):
+    # Fades to the bottom colour and back, so the tile wraps without a seam
+    tile = pygame.Surface((width, height))
+    half = height // 2
+    for y in range(height):
+        t = y / half if y < half else (height - y) / half
+        pygame.draw.line(tile, blend(SKY_TOP, SKY_BOTTOM, t), (0, y), (width, y))
+    for _ in range(160):
+        shade = rng.randint(30, 70)
+        tile.set_at((rng.randrange(width), rng.randrange(height)), (shade, shade, shade + 20))
+    return tile
+
+def star_tile(rng, width, height, count, color, radius):
+    tile = pygame.Surface((width, height))
+    for _ in range(count):
+        x = rng.randrange(width)
+        y = rng.randrange(radius, height - radius)
+        scale = rng.uniform(0.5, 1.0)
+        pygame.draw.circle(tile, tuple(int(c * scale) for c in color), (x, y), radius)
+    return tile
+
+def cloud_tile(rng, width, height):
+    # Soft bands of overlapping ellipses, kept clear of the tile's ends
+    tile = pygame.Surface((width, height))
+    for _ in range(7):
+        cx = rng.randrange(width)
+        cy = rng.randrange(80, height - 80)
+        shade = rng.randint(18, 30)
+        for _ in range(rng.randint(4, 8)):
+            w = rng.randint(80, 200)
+            h = rng.randint(20, 50)
+            x = cx + rng.randint(-120, 120) - w // 2
+            y = cy + rng.randint(-25, 25) - h // 2
+            pygame.draw.ellipse(tile, (shade, shade, shade + 12), (x, y, w, h))
+    return tile
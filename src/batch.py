@@ -0,0 +1,356 @@
+import argparse
+import random
+import sys
+import time
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .constants import *
+from .level import LevelGenerator, POWERUP_TYPES, max_platforms
+
+# Platforms kept per world; Game never holds more than 15 at once
+WINDOW = 16
+# Game.update removes platforms and power-ups this far below the camera
+PLATFORM_CULL = SCREEN_HEIGHT + 200
+POWERUP_CULL = SCREEN_HEIGHT + 100
+
+class BatchSim:
+    """Steps many independent games in lockstep with NumPy arrays.
+
+    Player state is one array per field with an entry per world. Each
+    world's platforms live in WINDOW slots holding exactly the platforms
+    Game would have in its list; new ones come from the same
+    LevelGenerator and RNG stream as Game(seed=seed), so a world given the
+    same inputs as a scalar game follows it frame for frame. Physics,
+    landing, pickups, scoring and game over are array operations over all
+    worlds; only level generation runs per world, a platform at a time.
+    """
+
+    def __init__(self, seeds):
+        if np is None:
+            raise RuntimeError("The batch simulator needs numpy (pip install .[sim])")
+        self.seeds = list(seeds)
+        count = self.count = len(self.seeds)
+        self.levels = [LevelGenerator(random.Random(seed)) for seed in self.seeds]
+        # Last generated Platform of each world, for the next generation step
+        self.tops = [None] * count
+
+        shape = (count, WINDOW)
+        self.plat_x = np.zeros(shape)
+        self.plat_y = np.zeros(shape)
+        self.plat_width = np.zeros(shape)
+        self.plat_normal = np.zeros(shape, dtype=bool)
+        # Motion as in Platform.set_motion; axis 0 is still, 1 is x, 2 is y
+        self.plat_axis = np.zeros(shape, dtype=np.int8)
+        self.plat_amplitude = np.zeros(shape, dtype=np.int64)
+        self.plat_period = np.full(shape, 2, dtype=np.int64)
+        self.plat_phase = np.zeros(shape, dtype=np.int64)
+        self.plat_crumbling = np.zeros(shape, dtype=bool)
+        self.plat_crumble = np.full(shape, -1, dtype=np.int64)
+        self.plat_solid = np.zeros(shape, dtype=bool)
+        self.powerup_x = np.zeros(shape)
+        self.powerup_y = np.zeros(shape)
+        self.powerup_type = np.full(shape, -1, dtype=np.int8)
+        self.powerup_alive = np.zeros(shape, dtype=bool)
+        self.plat_live = np.zeros(shape, dtype=bool)
+        # Slots are reused round-robin; by the time one comes round again
+        # its platform has long been culled
+        self.next_slot = [0] * count
+        self.top_y = np.zeros(count)
+
+        self.x = np.zeros(count)
+        self.y = np.zeros(count)
+        self.vel_x = np.zeros(count)
+        self.vel_y = np.zeros(count)
+        self.is_falling = np.zeros(count, dtype=bool)
+        self.fall_start_y = np.zeros(count)
+        self.double_jumps_left = np.zeros(count, dtype=np.int64)
+        self.big_platforms_timer = np.zeros(count, dtype=np.int64)
+        self.slow_motion_timer = np.zeros(count, dtype=np.int64)
+        self.shield_timer = np.zeros(count, dtype=np.int64)
+        self.magnet_timer = np.zeros(count, dtype=np.int64)
+        self.super_jump_timer = np.zeros(count, dtype=np.int64)
+
+        self.highest_point = np.full(count, float(SCREEN_HEIGHT))
+        self.score = np.zeros(count)
+        self.camera_y = np.zeros(count)
+        self.total_jumps = np.zeros(count, dtype=np.int64)
+        self.powerups_collected = np.zeros(count, dtype=np.int64)
+        self.frames = np.zeros(count, dtype=np.int64)
+        self.alive = np.ones(count, dtype=bool)
+
+        for world, level in enumerate(self.levels):
+            platforms = level.initial_platforms()
+            for platform in platforms:
+                self.add_platform(world, platform, None)
+            start = platforms[0]
+            self.x[world] = start.x + start.width // 2 - PLAYER_SIZE // 2
+            self.y[world] = start.y - PLAYER_SIZE
+        self.fall_start_y[:] = self.y
+
+    def add_platform(self, world, platform, powerup_type):
+        slot = self.next_slot[world]
+        self.next_slot[world] = (slot + 1) % WINDOW
+        self.plat_x[world, slot] = platform.home_x
+        self.plat_y[world, slot] = platform.home_y
+        self.plat_width[world, slot] = platform.width
+        self.plat_normal[world, slot] = platform.type == "normal"
+        if platform.axis:
+            self.plat_axis[world, slot] = 1 if platform.axis == "x" else 2
+            self.plat_amplitude[world, slot] = platform.amplitude
+            self.plat_period[world, slot] = platform.period
+            self.plat_phase[world, slot] = platform.phase
+        else:
+            self.plat_axis[world, slot] = 0
+        self.plat_crumbling[world, slot] = platform.type == "crumbling"
+        self.plat_crumble[world, slot] = -1
+        self.plat_solid[world, slot] = True
+        self.plat_live[world, slot] = True
+        self.powerup_alive[world, slot] = powerup_type is not None
+        if powerup_type is not None:
+            # Same placement as Game.spawn_powerup
+            self.powerup_x[world, slot] = platform.x + int(platform.width) // 2 - POWERUP_SIZE // 2
+            self.powerup_y[world, slot] = platform.y - 35
+            self.powerup_type[world, slot] = POWERUP_TYPES.index(powerup_type)
+        self.tops[world] = platform
+        self.top_y[world] = platform.home_y
+
+    def generate(self, worlds, counts):
+        # `counts` is how many platforms each of `worlds` has in play
+        for world, count in zip(worlds.tolist(), counts.tolist()):
+            level = self.levels[world]
+            for _ in range(max_platforms(self.tops[world].home_y) - count):
+                platform = level.next_platform(self.tops[world])
+                self.add_platform(world, platform, level.roll_powerup())
+
+    def step(self, vel_x, jump=None):
+        """Advance every live world by one frame.
+
+        `vel_x` is each world's horizontal input (as Game.handle_events or
+        AutoPlayer.act would set it) and `jump` whether Game.jump() is
+        called this frame. Returns the number of worlds still alive.
+        """
+        live = np.flatnonzero(self.alive)
+        if len(live) == 0:
+            return 0
+        if len(live) == self.count:
+            # Basic slices are views, so the common case skips the gathers
+            live = slice(None)
+        rows = np.arange(self.count)[live]
+
+        vel_x = np.broadcast_to(np.asarray(vel_x, dtype=float), (self.count,))[live]
+        vel_y = self.vel_y[live]
+        double_jumps_left = self.double_jumps_left[live]
+        total_jumps = self.total_jumps[live]
+        if jump is not None:
+            jump = np.broadcast_to(np.asarray(jump, dtype=bool), (self.count,))[live]
+            jumped = jump & (vel_y > 0) & (double_jumps_left > 0)
+            vel_y = np.where(jumped, JUMP_SPEED * 0.8, vel_y)
+            double_jumps_left = double_jumps_left - jumped
+            total_jumps = total_jumps + jumped
+
+        # Player.update
+        slow = self.slow_motion_timer[live] > 0
+        gravity_multiplier = np.where(slow, 0.5, 1.0)
+        vel_y = np.minimum(vel_y + GRAVITY * gravity_multiplier,
+                           MAX_FALL_SPEED * gravity_multiplier)
+        falling = vel_y > 0
+        y = self.y[live]
+        fall_start_y = np.where(falling & ~self.is_falling[live], y, self.fall_start_y[live])
+
+        prev_y = y
+        x = self.x[live] + vel_x * gravity_multiplier
+        y = y + vel_y
+        x = np.where(x + PLAYER_SIZE < 0, SCREEN_WIDTH,
+                     np.where(x > SCREEN_WIDTH, -PLAYER_SIZE, x))
+
+        big_platforms_timer = np.maximum(self.big_platforms_timer[live] - 1, 0)
+        slow_motion_timer = np.maximum(self.slow_motion_timer[live] - 1, 0)
+        shield_timer = np.maximum(self.shield_timer[live] - 1, 0)
+        magnet_timer = np.maximum(self.magnet_timer[live] - 1, 0)
+        super_jump_timer = np.maximum(self.super_jump_timer[live] - 1, 0)
+
+        # Magnet pull (Game.attract_powerups), before any collisions
+        powerup_x = self.powerup_x[live]
+        powerup_y = self.powerup_y[live]
+        alive = self.powerup_alive[live]
+        magnet = magnet_timer > 0
+        if magnet.any():
+            dx = (x + PLAYER_SIZE // 2)[:, None] - (powerup_x + POWERUP_SIZE // 2)
+            dy = (y + PLAYER_SIZE // 2)[:, None] - (powerup_y + POWERUP_SIZE // 2)
+            distance_sq = dx * dx + dy * dy
+            pull = (alive & magnet[:, None] & (distance_sq > 0) &
+                    (distance_sq <= MAGNET_RADIUS * MAGNET_RADIUS))
+            distance = np.sqrt(np.where(pull, distance_sq, 1.0))
+            step = np.minimum(MAGNET_SPEED, distance)
+            powerup_x = powerup_x + np.where(pull, dx * step / distance, 0.0)
+            powerup_y = powerup_y + np.where(pull, dy * step / distance, 0.0)
+            self.powerup_x[live] = powerup_x
+            self.powerup_y[live] = powerup_y
+
+        # Moving platforms (Platform.move_to). Game only moves the ones near
+        # the camera, but those are the only ones a player can touch
+        top = self.plat_y[live]
+        left = self.plat_x[live]
+        axis = self.plat_axis[live]
+        if axis.any():
+            period = self.plat_period[live]
+            half = period // 2
+            step = (self.frames[live] + 1)[:, None] + self.plat_phase[live]
+            step %= period
+            step = np.where(step > half, period - step, step)
+            offset = (2 * step - half) * self.plat_amplitude[live] // half
+            left = left + np.where(axis == 1, offset, 0)
+            top = top + np.where(axis == 2, offset, 0)
+
+        # Crumbling platforms count down once stood on, then drop out
+        crumble = self.plat_crumble[live]
+        solid = self.plat_solid[live]
+        ticking = crumble > 0
+        if ticking.any():
+            crumble = crumble - ticking
+            solid = solid & ~(ticking & (crumble == 0))
+
+        # Platform collisions. A world's hits are on the platform with the
+        # lowest top, which is also the first Game finds: tops stay at least
+        # 14px apart however the platforms move (bar the first two, which
+        # share a height and never crumble)
+        width = self.plat_width[live]
+        big = (big_platforms_timer > 0)[:, None] & self.plat_normal[live]
+        width = np.where(big, np.minimum(width * 1.5, PLATFORM_WIDTH), width)
+        bottom = (y + PLAYER_SIZE)[:, None]
+        hit = (self.plat_live[live] & solid & falling[:, None] &
+               ((prev_y + PLAYER_SIZE)[:, None] <= top) &
+               (bottom >= top) & (bottom <= top + PLATFORM_HEIGHT) &
+               ((x + PLAYER_SIZE)[:, None] >= left) &
+               (x[:, None] <= left + width))
+        landed = hit.any(axis=1)
+        tops_hit = np.where(hit, top, -np.inf)
+        land_top = tops_hit.max(axis=1)
+        landed_on = (np.arange(WINDOW) == tops_hit.argmax(axis=1)[:, None]) & landed[:, None]
+        crumble = np.where(landed_on & self.plat_crumbling[live] & (crumble < 0), CRUMBLE_FRAMES, crumble)
+        self.plat_crumble[live] = crumble
+        self.plat_solid[live] = solid
+        y = np.where(landed, land_top - PLAYER_SIZE, y)
+        bounce = np.where(super_jump_timer > 0, JUMP_SPEED * SUPER_JUMP_BOOST, JUMP_SPEED)
+        vel_y = np.where(landed, bounce, vel_y)
+        total_jumps = total_jumps + landed
+
+        # Power-up collisions: the boxes overlap
+        taken = (alive &
+                 (x[:, None] < powerup_x + POWERUP_SIZE) & (powerup_x < (x + PLAYER_SIZE)[:, None]) &
+                 (y[:, None] < powerup_y + POWERUP_SIZE) &
+                 (powerup_y < (y + PLAYER_SIZE)[:, None]))
+        alive &= ~taken
+        kinds = np.where(taken, self.powerup_type[live], -1)
+
+        # Score and camera
+        highest_point = np.minimum(self.highest_point[live], y)
+        score = (SCREEN_HEIGHT - highest_point) // 10
+        camera_y = y - SCREEN_HEIGHT // 2
+
+        # Culling, which never comes back: Game drops them from its lists
+        alive &= powerup_y - camera_y[:, None] < POWERUP_CULL
+        self.powerup_alive[live] = alive
+
+        # Game over; the screen-bottom check in Game.update cannot fire
+        # because the camera is placed relative to the player
+        dead = falling & (y - fall_start_y > MAX_FALL_DISTANCE)
+        shielded = dead & (shield_timer > 0)
+        if shielded.any():
+            dead &= ~shielded
+            shield_timer = np.where(shielded, 0, shield_timer)
+            vel_y = np.where(shielded, JUMP_SPEED * SHIELD_BOUNCE, vel_y)
+            falling = falling & ~shielded
+            fall_start_y = np.where(shielded, y, fall_start_y)
+
+        # Power-up effects, applied at dispatch time like Game.on_powerup_collected
+        double_jumps_left = np.where((kinds == 0).any(axis=1), 2, double_jumps_left)
+        big_platforms_timer = np.where((kinds == 1).any(axis=1), 600, big_platforms_timer)
+        slow_motion_timer = np.where((kinds == 2).any(axis=1), 300, slow_motion_timer)
+        shield_timer = np.where((kinds == 3).any(axis=1), SHIELD_DURATION, shield_timer)
+        magnet_timer = np.where((kinds == 4).any(axis=1), MAGNET_DURATION, magnet_timer)
+        super_jump_timer = np.where((kinds == 5).any(axis=1), SUPER_JUMP_DURATION, super_jump_timer)
+
+        self.vel_x[live] = vel_x
+        self.vel_y[live] = vel_y
+        self.x[live] = x
+        self.y[live] = y
+        self.is_falling[live] = falling
+        self.fall_start_y[live] = fall_start_y
+        self.double_jumps_left[live] = double_jumps_left
+        self.big_platforms_timer[live] = big_platforms_timer
+        self.slow_motion_timer[live] = slow_motion_timer
+        self.shield_timer[live] = shield_timer
+        self.magnet_timer[live] = magnet_timer
+        self.super_jump_timer[live] = super_jump_timer
+        self.highest_point[live] = highest_point
+        self.score[live] = score
+        self.camera_y[live] = camera_y
+        self.total_jumps[live] = total_jumps
+        self.powerups_collected[live] += taken.sum(axis=1)
+        self.frames[live] += 1
+        self.alive[rows[dead]] = False
+
+        # Top up every world that fell short, then drop what scrolled away
+        difficulty = np.minimum(1.0, ((SCREEN_HEIGHT - self.top_y[live]) // 10) / 150.0)
+        targets = np.maximum(6, 15 - (difficulty * 9).astype(np.int64))
+        counts = self.plat_live[live].sum(axis=1)
+        short = counts < targets
+        if short.any():
+            self.generate(rows[short], counts[short])
+        self.plat_live[live] &= self.plat_y[live] - camera_y[:, None] < PLATFORM_CULL
+        return len(rows) - int(dead.sum())
+
+    def steer(self):
+        """Simple vectorized policy for balance runs.
+
+        Heads for the lowest platform above the feet (or, with none, the
+        highest one below) and spends double jumps when falling beneath
+        it. Returns (vel_x, jump) for step().
+        """
+        top = self.plat_y
+        feet = (self.y + PLAYER_SIZE)[:, None]
+        above = self.plat_live & (top < feet - 10)
+        below = self.plat_live & ~above & (top < feet + MAX_FALL_DISTANCE)
+        pick = np.where(above.any(axis=1),
+                        np.where(above, top, -np.inf).argmax(axis=1),
+                        np.where(below, top, np.inf).argmin(axis=1))
+        index = np.arange(self.count)
+        target_top = top[index, pick]
+        centre = self.plat_x[index, pick] + self.plat_width[index, pick] / 2
+        period = SCREEN_WIDTH + PLAYER_SIZE
+        dx = (centre - (self.x + PLAYER_SIZE / 2) + period / 2) % period - period / 2
+        vel_x = np.where(np.abs(dx) > MOVE_SPEED, np.sign(dx) * MOVE_SPEED, 0.0)
+        jump = (self.double_jumps_left > 0) & (self.vel_y > 0) & (self.y + PLAYER_SIZE > target_top)
+        return vel_x, jump
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate many seeded games at once with NumPy")
+    parser.add_argument("--worlds", type=int, default=10000)
+    parser.add_argument("--start", type=int, default=0, help="first seed")
+    parser.add_argument("--steps", type=int, default=3000)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    sim = BatchSim(range(args.start, args.start + args.worlds))
+    setup = time.perf_counter() - start
+    start = time.perf_counter()
+    steps = 0
+    while steps < args.steps and sim.step(*sim.steer()):
+        steps += 1
+    elapsed = time.perf_counter() - start
+
+    heights = np.sort(sim.score)
+    print(f"{args.worlds} worlds, {steps} steps: {elapsed / max(steps, 1) * 1000:.2f} ms per step, "
+          f"{sim.frames.sum() / elapsed:.0f} world-frames/s (setup {setup:.1f}s)")
+    print(f"Alive: {int(sim.alive.sum())}, height median {heights[len(heights) // 2]:.0f}, "
+          f"p90 {heights[int(len(heights) * 0.9)]:.0f}, max {heights[-1]:.0f}")
+    print(f"Power-ups: {sim.powerups_collected.sum() / max(sim.frames.sum(), 1) * 3600:.2f} per minute of play")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
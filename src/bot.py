@@ -0,0 +1,179 @@
+import math
+from .constants import *
+
+# Horizontal distance after which the player reappears on the other side
+WRAP_PERIOD = SCREEN_WIDTH + PLAYER_SIZE
+# How far inside a platform's edge the player aims to stand; steering
+# stops within half a step of the aim, so this keeps it on the platform
+EDGE_MARGIN = MOVE_SPEED // 2 + 1
+
+def wrapped_dx(from_x, to_x):
+    dx = to_x - from_x
+    if dx > WRAP_PERIOD / 2:
+        dx -= WRAP_PERIOD
+    elif dx < -WRAP_PERIOD / 2:
+        dx += WRAP_PERIOD
+    return dx
+
+class AutoPlayer:
+    """Heuristic autoplayer used by the headless tools.
+
+    While rising it steers toward the next platform it can still reach;
+    while falling it steers toward the highest platform below its feet and
+    spends double jumps when it drops under its target. On the target it
+    lines up for the platform after it, across the wrap if that is shorter.
+    """
+
+    def __init__(self, rng=None, wobble=0.0):
+        self.rng = rng
+        # Chance per frame of ignoring the plan, to spread outcomes over seeds
+        self.wobble = wobble
+        self.target = None
+        self.last_vel_y = 0
+
+    def reset(self):
+        self.target = None
+        self.last_vel_y = 0
+
+    def airtime(self, player, top, gravity):
+        # Frames until the feet come back down to `top`, or None if the
+        # current jump never gets that high. Player.update adds gravity
+        # before moving, so after n frames the feet have dropped
+        # n * vel_y + g * n * (n + 1) / 2 (ignoring the fall speed cap,
+        # which only ever adds frames)
+        feet = player.y + PLAYER_SIZE
+        b = player.vel_y + gravity / 2
+        disc = b * b + 2 * gravity * (top - feet)
+        if disc < 0:
+            return None
+        return math.ceil((-b + math.sqrt(disc)) / gravity - 1e-9)
+
+    def fall_floor(self, player, gravity):
+        # The run ends once the feet drop MAX_FALL_DISTANCE below where the
+        # fall started, which for a jump still rising is its apex
+        if player.is_falling:
+            return player.fall_start_y + PLAYER_SIZE + MAX_FALL_DISTANCE
+        feet = player.y + PLAYER_SIZE
+        vel_y = player.vel_y + gravity
+        while vel_y <= 0:
+            feet += vel_y
+            vel_y += gravity
+        return feet + MAX_FALL_DISTANCE
+
+    def horizontal_gap(self, player, platform, width):
+        # Distance the player still has to travel before overlapping the platform
+        left = platform.x - PLAYER_SIZE + EDGE_MARGIN
+        right = platform.x + width - EDGE_MARGIN
+        if left <= player.x <= right:
+            return 0
+        return min(abs(wrapped_dx(player.x, left)), abs(wrapped_dx(player.x, right)))
+
+    def reachable(self, player, platform, gravity, speed):
+        if platform.crumbled:
+            return False
+        frames = self.airtime(player, platform.y, gravity)
+        if frames is None or 0 < platform.crumble_timer <= frames:
+            # Out of reach, or it will have crumbled away by then
+            return False
+        width = platform.get_display_width(POWERUP_BIG_PLATFORMS in player.effects.active)
+        return self.horizontal_gap(player, platform, width) <= frames * speed
+
+    def pick_target(self, game):
+        player = game.player
+        feet = player.y + PLAYER_SIZE
+        slow = POWERUP_SLOW_MOTION in player.effects.active
+        gravity = GRAVITY * (0.5 if slow else 1.0)
+        speed = MOVE_SPEED * (0.5 if slow else 1.0)
+        rising = player.vel_y < 0
+        floor = self.fall_floor(player, gravity)
+
+        # Stick with the current target until a new bounce or jump starts
+        # (the player turns from falling to rising) or it can no longer be
+        # reached
+        bounced = rising and self.last_vel_y >= 0
+        self.last_vel_y = player.vel_y
+        target = self.target
+        if (target is not None and not bounced and
+                target in game.platforms and
+                self.reachable(player, target, gravity, speed)):
+            return target
+
+        best = None
+        fallback = None
+        for platform in game.platforms:
+            top = platform.y
+            if top >= floor:
+                continue
+            if rising and top >= feet - 10:
+                # Still climbing: only platforms above are worth aiming for
+                continue
+            if not self.reachable(player, platform, gravity, speed):
+                if top >= feet - 1 and (fallback is None or top < fallback.y):
+                    fallback = platform
+                continue
+            # Lowest platform above while rising, highest below while falling
+            if best is None or (top > best.y if rising else top < best.y):
+                best = platform
+        if best is None and rising:
+            # Nothing above is reachable; come back down somewhere safe
+            for platform in game.platforms:
+                top = platform.y
+                if (feet - 10 <= top < floor and
+                        self.reachable(player, platform, gravity, speed) and
+                        (best is None or top < best.y)):
+                    best = platform
+        return best or fallback
+
+    def aim_x(self, game, target, width):
+        # Land on the part of the target closest to the platform after it,
+        # so the next jump starts with as little horizontal travel as
+        # possible. Gaps are measured the way the level generator measures
+        # them (reachability.horizontal_gap): from anywhere the player still
+        # stands on the target to anywhere it overlaps the goal, either way
+        # round the wrap, since only the best spot is promised a jump.
+        low = target.x - PLAYER_SIZE + EDGE_MARGIN
+        high = target.x + width - EDGE_MARGIN
+        goal = None
+        for platform in game.platforms:
+            top = platform.y
+            # Crumbling platforms that were stood on are gone or soon will be
+            if (top < target.y - 10 and platform.crumble_timer < 0 and
+                    (goal is None or top > goal.y)):
+                goal = platform
+        if goal is None or high <= low:
+            return target.x + width / 2
+        goal_width = goal.get_display_width(POWERUP_BIG_PLATFORMS in game.player.effects.active)
+        best = None
+        best_gap = None
+        for shift in (-WRAP_PERIOD, 0, WRAP_PERIOD):
+            goal_low = goal.x - PLAYER_SIZE + EDGE_MARGIN + shift
+            goal_high = goal.x + goal_width - EDGE_MARGIN + shift
+            if goal_high < low:
+                x, gap = low, low - goal_high
+            elif goal_low > high:
+                x, gap = high, goal_low - high
+            else:
+                x, gap = (max(low, goal_low) + min(high, goal_high)) / 2, 0
+            if best_gap is None or gap < best_gap:
+                best, best_gap = x, gap
+        return best + PLAYER_SIZE // 2
+
+    def act(self, game):
+        player = game.player
+        self.target = target = self.pick_target(game)
+
+        vel_x = 0
+        if target is not None:
+            width = target.get_display_width(POWERUP_BIG_PLATFORMS in player.effects.active)
+            dx = wrapped_dx(player.x + PLAYER_SIZE // 2, self.aim_x(game, target, width))
+            if abs(dx) > MOVE_SPEED / 2:
+                vel_x = MOVE_SPEED if dx > 0 else -MOVE_SPEED
+        if self.wobble and self.rng is not None and self.rng.random() < self.wobble:
+            vel_x = self.rng.choice((-MOVE_SPEED, 0, MOVE_SPEED))
+        player.vel_x = vel_x
+
+        jump = (player.double_jumps_left > 0 and player.vel_y > 0 and
+                (target is None or player.y + PLAYER_SIZE > target.y))
+        if jump:
+            game.jump()
+        return vel_x, jump
@@ -0,0 +1,324 @@
+import argparse
+import asyncio
+import os
+import random
+import struct
+import sys
+import threading
+import time
+
+from .constants import *
+
+DEFAULT_PORT = 8765
+# Frames handed to the server thread but not yet sent; past this the game
+# stops queueing and the next frame it sends is a keyframe
+MAX_PENDING = 30
+# Bytes queued for one spectator before it is skipped until it catches up
+MAX_CLIENT_BUFFER = 64 * 1024
+
+PLATFORM_TYPES = ("normal", "special", "moving", "crumbling")
+POWERUP_TYPES = (POWERUP_DOUBLE_JUMP, POWERUP_BIG_PLATFORMS, POWERUP_SLOW_MOTION,
+                 POWERUP_SHIELD, POWERUP_MAGNET, POWERUP_SUPER_JUMP)
+# Player flag bits after bit 0 (double jumps left), in this order
+PLAYER_EFFECTS = (POWERUP_BIG_PLATFORMS, POWERUP_SLOW_MOTION, POWERUP_SHIELD,
+                  POWERUP_MAGNET, POWERUP_SUPER_JUMP)
+
+# A message is a header, the ids removed since the last one, then the
+# entities added or changed. A keyframe ("K") replaces everything the
+# receiver holds; a delta ("D") applies on top of it. On the wire each
+# message is prefixed with its length.
+KEYFRAME = b"K"
+DELTA = b"D"
+LENGTH = struct.Struct("<I")
+HEADER = struct.Struct("<cIfIIBHH")
+REMOVED = struct.Struct("<I")
+ENTITY = struct.Struct("<IB")
+PLAYER, PLATFORM, POWERUP = 0, 1, 2
+RECORDS = (
+    struct.Struct("<iiBB"),    # player: x, y, color index, flags
+    struct.Struct("<iiHBb"),   # platform: x, y, width, type, crumble timer
+    struct.Struct("<iiB"),     # power-up: x, y, type
+)
+GAME_OVER_FLAG = 1
+PAUSED_FLAG = 2
+
+class StateEncoder:
+    """Turns a Game into per-frame messages holding only what changed.
+
+    Every player, platform and power-up on screen gets a small fixed
+    record, compared as bytes with the one sent last frame. Entities are
+    identified by the object itself and numbered in the order they first
+    appear, which for the level is climbing order.
+    """
+
+    def __init__(self):
+        self.ids = {}
+        self.records = {}
+        self.next_id = 0
+        self.last_header = None
+
+    def reset(self):
+        # The next message is a keyframe
+        self.ids = {}
+        self.records = {}
+        self.last_header = None
+
+    def encode(self, game):
+        """Message for the game's current state, or None if nothing changed."""
+        keyframe = not self.records
+        ids = self.ids
+        records = self.records
+        current = {}
+        changed = []
+
+        def add(item, kind, record):
+            entity = ids.get(item)
+            if entity is None:
+                entity = ids[item] = self.next_id
+                self.next_id += 1
+            current[item] = record
+            if records.get(item) != record:
+                changed.append(ENTITY.pack(entity, kind) + record)
+
+        pack = RECORDS[PLATFORM].pack
+        for platform in game.platforms:
+            if not platform.crumbled:
+                add(platform, PLATFORM, pack(round(platform.x), round(platform.y),
+                                             round(platform.width),
+                                             PLATFORM_TYPES.index(platform.type),
+                                             max(-1, min(platform.crumble_timer, 127))))
+        pack = RECORDS[POWERUP].pack
+        for powerup in game.powerups:
+            add(powerup, POWERUP, pack(round(powerup.x), round(powerup.y),
+                                       POWERUP_TYPES.index(powerup.type)))
+        pack = RECORDS[PLAYER].pack
+        for player in game.players:
+            if player.alive:
+                active = player.effects.active
+                flags = player.double_jumps_left > 0
+                for bit, effect in enumerate(PLAYER_EFFECTS, 1):
+                    if effect in active:
+                        flags |= 1 << bit
+                add(player, PLAYER, pack(round(player.x), round(player.y),
+                                         PLAYER_COLORS.index(player.color), flags))
+
+        removed = [REMOVED.pack(ids.pop(item)) for item in records if item not in current]
+        self.records = current
+
+        flags = (game.game_over and GAME_OVER_FLAG) | (game.paused and PAUSED_FLAG)
+        header = (round(game.camera_y), int(game.score), int(game.high_score), flags)
+        if not keyframe and not changed and not removed and header == self.last_header:
+            return None
+        self.last_header = header
+        return b"".join([HEADER.pack(KEYFRAME if keyframe else DELTA, game.frame, game.camera_y,
+                                     int(game.score), int(game.high_score), flags,
+                                     len(removed), len(changed))] + removed + changed)
+
+def parse(message):
+    """Split a message into (header, removed ids, [(id, kind, record bytes)])."""
+    header = HEADER.unpack_from(message, 0)
+    removed_count, changed_count = header[-2:]
+    offset = HEADER.size
+    removed = [REMOVED.unpack_from(message, offset + i * REMOVED.size)[0]
+               for i in range(removed_count)]
+    offset += removed_count * REMOVED.size
+    changed = []
+    for _ in range(changed_count):
+        entity, kind = ENTITY.unpack_from(message, offset)
+        offset += ENTITY.size
+        size = RECORDS[kind].size
+        changed.append((entity, kind, message[offset:offset + size]))
+        offset += size
+    return header, removed, changed
+
+class StateMirror:
+    """The latest state as records, rebuilt from messages.
+
+    The server keeps one to greet new spectators with a keyframe.
+    """
+
+    def __init__(self):
+        self.entities = {}
+        self.header = None
+
+    def apply(self, message):
+        header, removed, changed = parse(message)
+        if header[0] == KEYFRAME:
+            self.entities.clear()
+        for entity in removed:
+            self.entities.pop(entity, None)
+        for entity, kind, record in changed:
+            self.entities[entity] = (kind, record)
+        self.header = header
+
+    def keyframe(self):
+        if self.header is None:
+            return None
+        _, frame, camera_y, score, high_score, flags, _, _ = self.header
+        changed = [ENTITY.pack(entity, kind) + record
+                   for entity, (kind, record) in self.entities.items()]
+        return b"".join([HEADER.pack(KEYFRAME, frame, camera_y, score, high_score, flags,
+                                     0, len(changed))] + changed)
+
+class BroadcastServer:
+    """Streams a game to spectators from an asyncio loop on its own thread.
+
+    The game thread calls publish() once per frame. It encodes the frame
+    and hands the bytes to the loop with call_soon_threadsafe, which
+    never blocks; if the loop falls MAX_PENDING frames behind, frames
+    are skipped and the next one sent is a keyframe. Each spectator gets
+    a keyframe on connecting and deltas after that. One whose socket
+    backs up past MAX_CLIENT_BUFFER is skipped until its buffer drains,
+    then resynced with a keyframe, so a slow spectator costs neither the
+    game nor the other spectators anything.
+    """
+
+    def __init__(self, host="127.0.0.1", port=DEFAULT_PORT):
+        self.host = host
+        self.port = port
+        self.encoder = StateEncoder()
+        self.mirror = StateMirror()
+        self.clients = set()
+        self.stale = set()
+        # Written by the game thread and the loop thread respectively
+        self.submitted = 0
+        self.delivered = 0
+        self.skipped = 0
+        self.bytes_sent = 0
+        self.loop = None
+        self.server = None
+        self.thread = None
+
+    def start(self):
+        """Start serving on a background thread; returns the bound port."""
+        ready = threading.Event()
+        errors = []
+
+        def run():
+            loop = self.loop = asyncio.new_event_loop()
+            try:
+                self.server = loop.run_until_complete(
+                    asyncio.start_server(self.handle, self.host, self.port))
+            except OSError as error:
+                errors.append(error)
+                ready.set()
+                loop.close()
+                return
+            self.port = self.server.sockets[0].getsockname()[1]
+            ready.set()
+            loop.run_forever()
+            self.server.close()
+            for writer in self.clients:
+                writer.close()
+            loop.run_until_complete(self.server.wait_closed())
+            loop.close()
+
+        self.thread = threading.Thread(target=run, name="broadcast", daemon=True)
+        self.thread.start()
+        ready.wait()
+        if errors:
+            self.thread = None
+            raise errors[0]
+        return self.port
+
+    def stop(self):
+        if self.thread is None:
+            return
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.thread = None
+
+    def publish(self, game):
+        if self.submitted - self.delivered >= MAX_PENDING:
+            self.skipped += 1
+            self.encoder.reset()
+            return
+        message = self.encoder.encode(game)
+        if message is not None:
+            self.submitted += 1
+            self.loop.call_soon_threadsafe(self.broadcast, message)
+
+    def send(self, writer, message):
+        writer.write(LENGTH.pack(len(message)) + message)
+        self.bytes_sent += LENGTH.size + len(message)
+
+    def broadcast(self, message):
+        self.delivered += 1
+        self.mirror.apply(message)
+        framed = LENGTH.pack(len(message)) + message
+        for writer in list(self.clients):
+            if writer.is_closing():
+                self.clients.discard(writer)
+                self.stale.discard(writer)
+                continue
+            backlog = writer.transport.get_write_buffer_size()
+            if writer in self.stale:
+                if backlog == 0:
+                    self.stale.discard(writer)
+                    self.send(writer, self.mirror.keyframe())
+            elif backlog > MAX_CLIENT_BUFFER:
+                self.stale.add(writer)
+            else:
+                writer.write(framed)
+                self.bytes_sent += len(framed)
+
+    async def handle(self, reader, writer):
+        keyframe = self.mirror.keyframe()
+        if keyframe is not None:
+            self.send(writer, keyframe)
+        self.clients.add(writer)
+        try:
+            # Spectators never send anything; this returns when they leave
+            await reader.read()
+        except ConnectionError:
+            pass
+        finally:
+            self.clients.discard(writer)
+            self.stale.discard(writer)
+            writer.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Broadcast an autoplayed headless game to spectators")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--frames", type=int, default=None, help="stop after this many frames")
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import pygame
+    from .bot import AutoPlayer
+    from .game import Game
+
+    pygame.init()
+    rng = random.Random(args.seed)
+    game = Game(seed=args.seed, high_score_path=None)
+    bot = AutoPlayer(rng, wobble=0.02)
+    server = BroadcastServer(args.host, args.port)
+    port = server.start()
+    print(f"Broadcasting on {args.host}:{port}; watch with python -m src.spectator --port {port}")
+    frames = 0
+    start = time.perf_counter()
+    try:
+        while args.frames is None or frames < args.frames:
+            if game.game_over:
+                game.game_over = False
+                game.init_game()
+                bot.reset()
+            bot.act(game)
+            game.update()
+            server.publish(game)
+            frames += 1
+            time.sleep(max(0.0, start + frames / 60 - time.perf_counter()))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        pygame.quit()
+    elapsed = time.perf_counter() - start
+    print(f"{frames} frames, {server.bytes_sent / max(elapsed, 1e-9) / 1024:.1f} KB/s sent "
+          f"to all spectators, {server.skipped} frames skipped")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
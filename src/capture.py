@@ -0,0 +1,136 @@
+import multiprocessing
+import os
+import struct
+from multiprocessing import shared_memory
+
+import pygame
+
+# Frame buffers in flight between the game and the writer
+POOL_SIZE = 8
+# slot, frame number; an empty message tells the writer to finish
+FRAME = struct.Struct("<BI")
+
+def _writer(conn, name, slots, frame_bytes, size, pitch, bitsize, masks, path):
+    shm = shared_memory.SharedMemory(name=name)
+    views = [shm.buf[slot * frame_bytes:(slot + 1) * frame_bytes] for slot in range(slots)]
+    raw = path.endswith(".raw")
+    row = size[0] * bitsize // 8
+    if raw:
+        out = open(path, "wb")
+    else:
+        os.makedirs(path, exist_ok=True)
+        image = pygame.Surface(size, 0, bitsize, masks)
+    try:
+        while True:
+            message = conn.recv_bytes()
+            if not message:
+                break
+            slot, frame = FRAME.unpack(message)
+            view = views[slot]
+            if raw:
+                if pitch == row:
+                    out.write(view)
+                else:
+                    for offset in range(0, frame_bytes, pitch):
+                        out.write(view[offset:offset + row])
+            else:
+                memoryview(image.get_view("0"))[:] = view
+                pygame.image.save(image, os.path.join(path, f"frame_{frame:06d}.png"))
+            conn.send_bytes(bytes((slot,)))
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        if raw:
+            out.close()
+        for view in views:
+            view.release()
+        shm.close()
+
+class FrameCapture:
+    """Records drawn frames without stalling the render loop.
+
+    capture() copies the surface's pixels through its buffer interface
+    into one of a fixed pool of shared-memory slots and hands the slot to
+    a writer process, which encodes it and hands it back. When every slot
+    is still being written the frame is dropped and counted instead of
+    waiting. A `path` ending in .raw gets the raw frames back to back, in
+    the surface's pixel layout; any other path is a directory of numbered
+    PNGs (dropped frames leave gaps in the numbering).
+    """
+
+    def __init__(self, path, surface, slots=POOL_SIZE):
+        self.path = path
+        self.size = surface.get_size()
+        self.bitsize = surface.get_bitsize()
+        self.masks = surface.get_masks()
+        self.frame_bytes = surface.get_pitch() * self.size[1]
+        self.frames = 0
+        self.captured = 0
+        self.dropped = 0
+        self.free = list(range(slots))
+        self.shm = shared_memory.SharedMemory(create=True, size=slots * self.frame_bytes)
+        self.views = [self.shm.buf[slot * self.frame_bytes:(slot + 1) * self.frame_bytes]
+                      for slot in range(slots)]
+
+        context = multiprocessing.get_context("spawn")
+        self.conn, child = context.Pipe()
+        self.process = context.Process(
+            target=_writer, daemon=True,
+            args=(child, self.shm.name, slots, self.frame_bytes, self.size,
+                  surface.get_pitch(), self.bitsize, self.masks, path))
+        self.process.start()
+        child.close()
+
+    def capture(self, surface):
+        """Queue the surface's current pixels; returns False if the frame was dropped."""
+        frame = self.frames
+        self.frames += 1
+        conn = self.conn
+        free = self.free
+        try:
+            while conn.poll():
+                free.append(conn.recv_bytes()[0])
+            if free:
+                slot = free.pop()
+                self.views[slot][:] = surface.get_view("0")
+                conn.send_bytes(FRAME.pack(slot, frame))
+                self.captured += 1
+                return True
+        except (OSError, EOFError):
+            # The writer is gone; the game carries on without it
+            pass
+        self.dropped += 1
+        return False
+
+    def close(self):
+        """Wait for the writer to finish the queued frames and release the pool."""
+        if self.process is None:
+            return
+        try:
+            self.conn.send_bytes(b"")
+        except OSError:
+            pass
+        self.process.join(30)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join()
+        self.process = None
+        self.conn.close()
+        for view in self.views:
+            view.release()
+        self.shm.close()
+        self.shm.unlink()
+
+    def format_report(self):
+        width, height = self.size
+        lines = [f"Captured {self.captured} of {self.frames} frames to {self.path} "
+                 f"({self.dropped} dropped)"]
+        if self.path.endswith(".raw"):
+            red, green, blue, alpha = self.masks
+            if self.bitsize == 32 and (red, green, blue) == (0xFF0000, 0xFF00, 0xFF):
+                pix_fmt = "bgra" if alpha else "bgr0"
+                lines.append(f"  ffmpeg -f rawvideo -pix_fmt {pix_fmt} -s {width}x{height} "
+                             f"-i {self.path} capture.mp4")
+            else:
+                lines.append(f"  {width}x{height}, {self.bitsize}-bit, masks {self.masks}")
+        return "\n".join(lines)
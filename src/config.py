@@ -0,0 +1,58 @@
+import copy
+import json
+import os
+import warnings
+
+DEFAULT_CONFIG = {
+    "game": {
+        "fps": 60,
+        # tick, busy, vsync or hybrid
+        "pacing": "hybrid",
+        # early or late: late holds off reading input until just before the
+        # next frame has to be drawn; it does nothing unless pacing is vsync
+        "input_timing": "early",
+        # Local players sharing the screen (1-4)
+        "players": 1,
+    },
+    "display": {
+        # Window size; null uses the render size (or the desktop in fullscreen)
+        "window_width": None,
+        "window_height": None,
+        "fullscreen": False,
+        # auto, nearest, smooth or hardware
+        "scale": "auto",
+        # Show the performance overlay from the start (F3 toggles it)
+        "performance_overlay": False,
+    },
+    "leaderboard": {
+        # Base URL of the leaderboard server; null keeps scores local only
+        "url": None,
+        "name": "Player",
+        # Entries shown on the game over screen
+        "top": 5,
+        # Runs not uploaded yet, kept across restarts
+        "outbox": "leaderboard_outbox.json",
+    },
+}
+
+def merge(base, overrides):
+    for key, value in overrides.items():
+        if isinstance(value, dict) and isinstance(base.get(key), dict):
+            merge(base[key], value)
+        else:
+            base[key] = value
+    return base
+
+def load_config(path="config.json"):
+    config = copy.deepcopy(DEFAULT_CONFIG)
+    try:
+        if os.path.exists(path):
+            with open(path, "r") as f:
+                merge(config, json.load(f))
+    except (OSError, ValueError):
+        pass
+    game = config["game"]
+    if game["input_timing"] == "late" and game["pacing"] != "vsync":
+        warnings.warn(f'game.input_timing "late" has no effect with "{game["pacing"]}" '
+                      'pacing; it only applies with "vsync"', stacklevel=2)
+    return config
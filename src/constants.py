@@ -6,6 +6,8 @@ JUMP_SPEED = -16
 MOVE_SPEED = 6
 PLATFORM_WIDTH = 200
 PLATFORM_HEIGHT = 20
+PLAYER_SIZE = 40
+POWERUP_SIZE = 30
 MAX_FALL_SPEED = 20
 MAX_FALL_DISTANCE = 400
 MIN_PLATFORM_WIDTH = 90
@@ -24,6 +26,8 @@ ORANGE = (255, 165, 0)
 PURPLE = (128, 0, 128)
 CYAN = (0, 255, 255)
 GRAY = (128, 128, 128)
+# One per local player, in join order
+PLAYER_COLORS = (WHITE, CYAN, YELLOW, GRAY)
 
 # Power-up types
 POWERUP_DOUBLE_JUMP = "double_jump"
@@ -31,4 +35,23 @@ POWERUP_BIG_PLATFORMS = "big_platforms"
 POWERUP_SLOW_MOTION = "slow_motion"
 POWERUP_SHIELD = "shield"
 POWERUP_MAGNET = "magnet"
-POWERUP_SUPER_JUMP = "super_jump"
\ No newline at end of file
+POWERUP_SUPER_JUMP = "super_jump"
+
+# Shield, magnet and super jump tuning (durations in frames)
+SHIELD_DURATION = 900
+SHIELD_BOUNCE = 1.5
+MAGNET_DURATION = 600
+MAGNET_RADIUS = 220
+MAGNET_SPEED = 8
+SUPER_JUMP_DURATION = 480
+SUPER_JUMP_BOOST = 1.35
+
+# Moving and crumbling platforms; their share grows with the difficulty
+MOVING_CHANCE = 0.25
+CRUMBLING_CHANCE = 0.15
+MOVE_AMPLITUDE_X = (30, 80)
+MOVE_AMPLITUDE_Y = 8
+MOVE_PERIOD = (120, 240)
+CRUMBLE_FRAMES = 30
+# Moving platforms this far outside the view sleep
+PLATFORM_WAKE_MARGIN = 200
\ No newline at end of file
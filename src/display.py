@@ -0,0 +1,113 @@
+import warnings
+import pygame
+from .constants import *
+
+CAPTION = "Endless Jumper - Enhanced Edition"
+SCALE_MODES = ("auto", "nearest", "smooth", "hardware")
+
+class Display:
+    """Owns the window and the internal surface everything is drawn on.
+
+    The game always renders at render_size. present() scales that surface
+    into the window: straight to the screen when the sizes match, by a
+    nearest-neighbour integer factor when one fits, smoothly otherwise, or
+    by SDL itself in "hardware" mode. The scaled image is written directly
+    into a subsurface of the window, so presenting allocates nothing.
+
+    pygame only syncs to the display through an SDL renderer, so asking for
+    vsync always uses "hardware" scaling. Where that fails, a warning is
+    given and `vsync` is False.
+    """
+
+    def __init__(self, render_size=(SCREEN_WIDTH, SCREEN_HEIGHT), window_size=None,
+                 fullscreen=False, scale="auto", vsync=False):
+        if scale not in SCALE_MODES:
+            raise ValueError(f"Unknown scale mode: {scale}")
+        self.render_size = render_size
+        self.scale_mode = scale
+        self.fullscreen = fullscreen
+
+        # Only the video subsystem is needed to get a window up
+        if not pygame.display.get_init():
+            pygame.display.init()
+        flags = pygame.FULLSCREEN if fullscreen else 0
+        self.vsync = vsync
+        self.window = None
+        if vsync:
+            # Without SCALED there is no renderer and pygame ignores vsync
+            try:
+                self.window = pygame.display.set_mode(render_size, flags | pygame.SCALED,
+                                                      vsync=1)
+                self.scale_mode = "hardware"
+            except pygame.error as error:
+                warnings.warn(f"vsync is not available ({error}); frames are only "
+                              "capped by the frame pacer", stacklevel=2)
+                self.vsync = False
+        if self.window is None:
+            if scale == "hardware":
+                # SDL scales the render-sized window surface on the GPU
+                size, flags = render_size, flags | pygame.SCALED
+            else:
+                if window_size is None:
+                    window_size = (0, 0) if fullscreen else render_size
+                size = window_size
+            self.window = pygame.display.set_mode(size, flags)
+        pygame.display.set_caption(CAPTION)
+
+        self.window_size = self.window.get_size()
+        if self.window_size == tuple(render_size):
+            # Nothing to scale, draw straight into the window
+            self.surface = self.window
+            self.target = None
+            self.smooth = False
+        else:
+            self.surface = pygame.Surface(render_size).convert(self.window)
+            self.layout()
+
+    def layout(self):
+        render_w, render_h = self.render_size
+        window_w, window_h = self.window_size
+        factor = min(window_w / render_w, window_h / render_h)
+        integer_factor = int(factor)
+
+        if self.scale_mode == "nearest" or (self.scale_mode == "auto" and integer_factor >= 1 and
+                                            factor - integer_factor < 0.25):
+            # Whole-pixel scaling stays sharp and is the cheapest to compute
+            if integer_factor >= 1 and self.scale_mode == "auto":
+                factor = integer_factor
+            self.smooth = False
+        else:
+            self.smooth = True
+
+        size = (max(1, int(render_w * factor)), max(1, int(render_h * factor)))
+        offset = ((window_w - size[0]) // 2, (window_h - size[1]) // 2)
+        # Letterbox bars are cleared once; present() never touches them
+        self.window.fill(BLACK)
+        self.target = self.window.subsurface(pygame.Rect(offset, size))
+
+    def present(self):
+        if self.target is not None:
+            size = self.target.get_size()
+            if self.smooth:
+                pygame.transform.smoothscale(self.surface, size, self.target)
+            else:
+                pygame.transform.scale(self.surface, size, self.target)
+        pygame.display.flip()
+
+_display = None
+
+def get_display(config=None):
+    """Return the shared Display, creating the window on first use only."""
+    global _display
+    if (_display is None or not pygame.display.get_init() or
+            pygame.display.get_surface() is not _display.window):
+        config = config or {}
+        options = config.get("display", {})
+        window_size = None
+        if options.get("window_width") and options.get("window_height"):
+            window_size = (options["window_width"], options["window_height"])
+        _display = Display(window_size=window_size,
+                           fullscreen=options.get("fullscreen", False),
+                           scale=options.get("scale", "auto"),
+                           vsync=config.get("game", {}).get("pacing") == "vsync")
+    return _display
@@ -0,0 +1,66 @@
+import heapq
+
+class StatusEffects:
+    """Timed effects on a player, expiring off a heap of absolute ticks.
+
+    Each effect has an expiry tick; advance() moves the clock on and only
+    does work when the earliest expiry comes due, so a frame costs the same
+    however many effects exist. Starting an effect again refreshes it, or
+    with stack=True adds the new duration to what is left. Refreshing leaves
+    the old heap entry behind; it is recognised as stale and dropped when it
+    comes up.
+
+    `active` is a frozenset of the running effects' names, rebuilt only when
+    an effect starts or ends, so checking a flag is a set lookup.
+    """
+
+    def __init__(self):
+        self.now = 0
+        self.expiry = {}
+        self.heap = []
+        self.active = frozenset()
+
+    def start(self, name, duration, stack=False):
+        if duration <= 0:
+            self.stop(name)
+            return
+        expires = self.now + duration
+        if stack and name in self.expiry:
+            expires = self.expiry[name] + duration
+        self.expiry[name] = expires
+        heapq.heappush(self.heap, (expires, name))
+        if name not in self.active:
+            self.active = frozenset(self.expiry)
+
+    def stop(self, name):
+        if self.expiry.pop(name, None) is not None:
+            self.active = frozenset(self.expiry)
+
+    def clear(self):
+        self.expiry.clear()
+        self.heap.clear()
+        self.active = frozenset()
+
+    def remaining(self, name):
+        expires = self.expiry.get(name)
+        if expires is None:
+            return 0
+        return expires - self.now
+
+    def advance(self):
+        self.now += 1
+        heap = self.heap
+        if heap and heap[0][0] <= self.now:
+            self.expire()
+
+    def expire(self):
+        heap = self.heap
+        expiry = self.expiry
+        changed = False
+        while heap and heap[0][0] <= self.now:
+            expires, name = heapq.heappop(heap)
+            if expiry.get(name) == expires:
+                del expiry[name]
+                changed = True
+        if changed:
+            self.active = frozenset(expiry)
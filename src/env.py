@@ -0,0 +1,326 @@
+import argparse
+import math
+import multiprocessing
+import os
+import sys
+import time
+from array import array
+from multiprocessing import shared_memory
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+# Lets Pool/Process.terminate() stop workers that have SDL loaded
+os.environ.setdefault("SDL_NO_SIGNAL_HANDLERS", "1")
+
+from .constants import *
+from .game import Game
+from .quality import QualityGovernor, QUALITY_LEVELS
+
+# Discrete actions as (horizontal direction, jump)
+ACTIONS = (
+    (0, False),
+    (-1, False),
+    (1, False),
+    (0, True),
+    (-1, True),
+    (1, True),
+)
+
+PLAYER_FEATURES = 11
+PLATFORM_FEATURES = 8
+NEAREST_PLATFORMS = 5
+WRAP_PERIOD = SCREEN_WIDTH + PLAYER_SIZE
+
+def observation_size(platforms=NEAREST_PLATFORMS):
+    return PLAYER_FEATURES + platforms * PLATFORM_FEATURES
+
+class JumperEnv:
+    """reset()/step() wrapper around a headless Game.
+
+    Observations are flat float32 arrays, built straight from the
+    simulation without drawing anything:
+
+      player:      x, vel_x, vel_y, falling, distance fallen,
+                   double jumps left, big platform, slow motion,
+                   shield, magnet and super jump timers
+      per platform (the nearest standing platforms by height to the
+      player's feet, closest first, zero-padded): present, dx, dy, width,
+                   special, moving, crumbling and crumble timer
+
+    Positions are relative to the player and scaled to roughly -1..1. The
+    reward is the score gained this step. An episode ends when the game
+    does (terminated) or after max_steps (truncated).
+    """
+
+    def __init__(self, seed=None, max_steps=None, platforms=NEAREST_PLATFORMS):
+        quality = QualityGovernor(enabled=False)
+        # Nothing is drawn, so skip spawning landing particles too
+        quality.level_index = len(QUALITY_LEVELS) - 1
+        self.game = Game(quality=quality, seed=seed, high_score_path=None)
+        # The first reset replays this seed, so it starts the same level as Game(seed=seed)
+        self.seed = seed
+        self.max_steps = max_steps
+        self.platforms = platforms
+        self.obs = array("f", bytes(4 * observation_size(platforms)))
+        self.steps = 0
+
+    @property
+    def observation_size(self):
+        return len(self.obs)
+
+    def reset(self, seed=None):
+        game = self.game
+        if seed is None:
+            seed = self.seed
+        self.seed = None
+        if seed is not None:
+            # The level generator shares this RNG, so this fixes the level
+            game.rng.seed(seed)
+            game.particles.rng.seed(seed)
+        game.game_over = False
+        game.paused = False
+        game.init_game()
+        self.steps = 0
+        return self.observe(), {"score": 0}
+
+    def step(self, action):
+        reward, terminated, truncated = self.advance(action)
+        info = {"score": self.game.score}
+        if terminated:
+            info["cause"] = self.game.death_cause
+        return self.observe(), reward, terminated, truncated, info
+
+    def advance(self, action):
+        """Run one frame without building an observation; returns (reward, terminated, truncated)."""
+        game = self.game
+        direction, jump = ACTIONS[action]
+        game.player.vel_x = direction * MOVE_SPEED
+        if jump:
+            game.jump()
+        score = game.score
+        game.update()
+        self.steps += 1
+        terminated = game.game_over
+        truncated = not terminated and self.max_steps is not None and self.steps >= self.max_steps
+        return float(game.score - score), terminated, truncated
+
+    def observe(self, out=None, offset=0):
+        """Write the observation into `out` (default: this env's own array)."""
+        if out is None:
+            out = self.obs
+        player = self.game.player
+        feet = player.y + PLAYER_SIZE
+        center = player.x + PLAYER_SIZE // 2
+        values = [player.x / SCREEN_WIDTH,
+                  player.vel_x / MOVE_SPEED,
+                  player.vel_y / MAX_FALL_SPEED,
+                  1.0 if player.is_falling else 0.0,
+                  (player.y - player.fall_start_y) / MAX_FALL_DISTANCE if player.is_falling else 0.0,
+                  player.double_jumps_left,
+                  player.big_platforms_timer / 600,
+                  player.slow_motion_timer / 300,
+                  player.shield_timer / SHIELD_DURATION,
+                  player.magnet_timer / MAGNET_DURATION,
+                  player.super_jump_timer / SUPER_JUMP_DURATION]
+
+        big = POWERUP_BIG_PLATFORMS in player.effects.active
+        # Crumbled platforms stay in the list until they scroll away, but are gone
+        nearest = sorted((p for p in self.game.platforms if not p.crumbled),
+                         key=lambda p: abs(p.y - feet))
+        for platform in nearest[:self.platforms]:
+            width = platform.get_display_width(big)
+            dx = (platform.x + width / 2 - center) % WRAP_PERIOD
+            if dx > WRAP_PERIOD / 2:
+                dx -= WRAP_PERIOD
+            values += (1.0, dx / SCREEN_WIDTH, (platform.y - feet) / SCREEN_HEIGHT,
+                       width / PLATFORM_WIDTH,
+                       1.0 if platform.type == "special" else 0.0,
+                       1.0 if platform.type == "moving" else 0.0,
+                       1.0 if platform.type == "crumbling" else 0.0,
+                       max(platform.crumble_timer, 0) / CRUMBLE_FRAMES)
+        size = observation_size(self.platforms)
+        values += [0.0] * (size - len(values))
+        out[offset:offset + size] = array("f", values)
+        return out
+
+class SharedBuffers:
+    """Observations, rewards, flags and actions for a vector env in one block.
+
+    Layout: float32 obs[n * obs_size], float32 reward[n], uint8
+    terminated[n], uint8 truncated[n], uint8 action[n]. The parent and the
+    workers map the same block, so stepping only moves a byte per worker
+    through the pipes.
+    """
+
+    def __init__(self, count, obs_size, name=None):
+        self.count = count
+        self.obs_size = obs_size
+        size = 4 * count * (obs_size + 1) + 3 * count
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+        else:
+            # Spawned workers share the parent's resource tracker, so the
+            # block is still unlinked once, by the parent
+            self.shm = shared_memory.SharedMemory(name=name)
+        buf = self.shm.buf
+        floats = 4 * count * obs_size
+        self.obs = buf[:floats].cast("f")
+        self.reward = buf[floats:floats + 4 * count].cast("f")
+        flags = floats + 4 * count
+        self.terminated = buf[flags:flags + count]
+        self.truncated = buf[flags + count:flags + 2 * count]
+        self.action = buf[flags + 2 * count:flags + 3 * count]
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def close(self):
+        for view in (self.obs, self.reward, self.terminated, self.truncated, self.action):
+            view.release()
+        self.shm.close()
+
+def _worker(conn, name, count, obs_size, first, seeds, max_steps, platforms):
+    buffers = SharedBuffers(count, obs_size, name)
+    envs = [JumperEnv(seed, max_steps, platforms) for seed in seeds]
+    obs = buffers.obs
+    try:
+        while True:
+            command = conn.recv_bytes()
+            if command == b"s":
+                actions = buffers.action
+                for i, env in enumerate(envs):
+                    index = first + i
+                    reward, terminated, truncated = env.advance(actions[index])
+                    buffers.reward[index] = reward
+                    buffers.terminated[index] = terminated
+                    buffers.truncated[index] = truncated
+                    if terminated or truncated:
+                        # Auto-reset; the observation is the new episode's first
+                        env.reset()
+                    env.observe(obs, index * obs_size)
+            elif command == b"r":
+                for i, env in enumerate(envs):
+                    env.reset(seeds[i])
+                    env.observe(obs, (first + i) * obs_size)
+            else:
+                break
+            conn.send_bytes(b"k")
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        del obs
+        buffers.close()
+
+class VectorEnv:
+    """Runs `count` JumperEnvs across worker processes.
+
+    Each worker owns a contiguous slice of the environments and writes
+    their observations, rewards and done flags straight into shared
+    memory. step() returns memoryviews over that memory (obs shaped
+    (count, obs_size), which numpy.asarray() wraps without copying); they
+    are overwritten by the next step, so copy anything that must be kept.
+    Finished episodes reset automatically.
+    """
+
+    def __init__(self, count, seeds=None, workers=None, max_steps=None, platforms=NEAREST_PLATFORMS):
+        self.count = count
+        self.obs_size = observation_size(platforms)
+        if seeds is None:
+            seeds = range(count)
+        seeds = list(seeds)
+        workers = max(1, min(count, workers or os.cpu_count()))
+        self.buffers = SharedBuffers(count, self.obs_size)
+        self.obs = self.buffers.obs.cast("B").cast("f", (count, self.obs_size))
+
+        context = multiprocessing.get_context("spawn")
+        self.conns = []
+        self.processes = []
+        per_worker = math.ceil(count / workers)
+        for first in range(0, count, per_worker):
+            here = min(per_worker, count - first)
+            parent, child = context.Pipe()
+            process = context.Process(
+                target=_worker, daemon=True,
+                args=(child, self.buffers.name, count, self.obs_size, first,
+                      seeds[first:first + here], max_steps, platforms))
+            process.start()
+            child.close()
+            self.conns.append(parent)
+            self.processes.append(process)
+
+    def _call(self, command):
+        for conn in self.conns:
+            conn.send_bytes(command)
+        for conn in self.conns:
+            conn.recv_bytes()
+
+    def reset(self):
+        self._call(b"r")
+        return self.obs
+
+    def step(self, actions):
+        """Apply one action per env; returns (obs, reward, terminated, truncated)."""
+        self.buffers.action[:] = bytes(actions)
+        self._call(b"s")
+        buffers = self.buffers
+        return self.obs, buffers.reward, buffers.terminated, buffers.truncated
+
+    def close(self):
+        if not self.processes:
+            return
+        for conn in self.conns:
+            try:
+                conn.send_bytes(b"q")
+            except OSError:
+                pass
+        for process in self.processes:
+            process.join(5)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+        for conn in self.conns:
+            conn.close()
+        self.processes = []
+        self.obs.release()
+        self.buffers.close()
+        self.buffers.shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure environment steps per second")
+    parser.add_argument("--envs", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=None, help="defaults to every core")
+    parser.add_argument("--steps", type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    import random
+    rng = random.Random(0)
+
+    env = JumperEnv(seed=0)
+    env.reset()
+    start = time.perf_counter()
+    for _ in range(args.steps):
+        _, _, terminated, truncated, _ = env.step(rng.randrange(len(ACTIONS)))
+        if terminated or truncated:
+            env.reset()
+    single = args.steps / (time.perf_counter() - start)
+    print(f"Single env: {single:.0f} steps/s")
+
+    with VectorEnv(args.envs, workers=args.workers) as vector:
+        vector.reset()
+        steps = max(1, args.steps // args.envs)
+        start = time.perf_counter()
+        for _ in range(steps):
+            vector.step([rng.randrange(len(ACTIONS)) for _ in range(args.envs)])
+        rate = steps * args.envs / (time.perf_counter() - start)
+        print(f"Vector env ({args.envs} envs, {len(vector.processes)} workers): {rate:.0f} steps/s")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,59 @@
+# Event types, used as indexes into the handler table
+LAND = 0
+JUMP = 1
+POWERUP_COLLECTED = 2
+NEW_HIGH_SCORE = 3
+GAME_OVER = 4
+SHIELD_USED = 5
+
+EVENT_NAMES = ("land", "jump", "powerup_collected", "new_high_score", "game_over",
+               "shield_used")
+
+# Payload of each event, passed to handlers as (a, b)
+#   land:              x, y of the player's feet
+#   jump:              x, y of the player's feet
+#   powerup_collected: power-up type, index of the player who took it
+#   new_high_score:    score, previous high score
+#   game_over:         score, high score
+#   shield_used:       x, y of the player's center
+
+class EventBus:
+    """Queues gameplay events and delivers them once per frame.
+
+    The simulation only appends a (type, a, b) tuple while it runs, so the
+    collision loops pay the same small cost however many systems listen.
+    dispatch() then hands every queued event to the handlers for its type,
+    in the order the events happened. Events emitted by a handler are
+    delivered in the same pass.
+    """
+
+    def __init__(self):
+        self.queue = []
+        self.handlers = [[] for _ in EVENT_NAMES]
+
+    def subscribe(self, event_type, handler):
+        self.handlers[event_type].append(handler)
+
+    def unsubscribe(self, event_type, handler):
+        if handler in self.handlers[event_type]:
+            self.handlers[event_type].remove(handler)
+
+    def emit(self, event_type, a=0, b=0):
+        self.queue.append((event_type, a, b))
+
+    def dispatch(self):
+        queue = self.queue
+        if not queue:
+            return 0
+        handlers = self.handlers
+        i = 0
+        while i < len(queue):
+            event_type, a, b = queue[i]
+            for handler in handlers[event_type]:
+                handler(a, b)
+            i += 1
+        queue.clear()
+        return i
+
+    def clear(self):
+        self.queue.clear()
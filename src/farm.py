@@ -0,0 +1,141 @@
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import random
+import sys
+import time
+from collections import Counter
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+# SDL would otherwise swallow the SIGTERM that Pool.terminate() sends workers
+os.environ.setdefault("SDL_NO_SIGNAL_HANDLERS", "1")
+
+from .bot import AutoPlayer
+from .game import Game
+
+FRAMES_PER_SECOND = 60
+
+class SeedResult:
+    def __init__(self, seed, height, cause, frames, powerups):
+        self.seed = seed
+        self.height = height
+        # "bottom", "fall", "stalled" or "timeout"
+        self.cause = cause
+        self.frames = frames
+        self.powerups = powerups
+
+def run_seed(seed, max_frames=20000, stall_frames=1800, wobble=0.02):
+    """Play one seed with the autoplayer until it dies, stalls or runs out of frames."""
+    game = Game(seed=seed, high_score_path=None)
+    bot = AutoPlayer(random.Random(seed), wobble=wobble)
+    best_score = 0
+    last_progress = 0
+    frame = 0
+    while not game.game_over and frame < max_frames:
+        if game.score > best_score:
+            best_score = game.score
+            last_progress = frame
+        elif frame - last_progress > stall_frames:
+            game.end_game("stalled")
+            break
+        bot.act(game)
+        game.update()
+        frame += 1
+    cause = game.death_cause if game.game_over else "timeout"
+    # Plain tuples keep the result cheap to send back from the worker
+    return seed, int(game.score), cause, frame, game.powerups_collected
+
+def _run_seed(args):
+    return run_seed(*args)
+
+def percentile(ordered, p):
+    if not ordered:
+        return 0
+    return ordered[max(0, math.ceil(len(ordered) * p / 100.0) - 1)]
+
+class FarmReport:
+    def __init__(self, results):
+        self.results = sorted(results, key=lambda r: r.seed)
+
+    def summary(self):
+        count = len(self.results)
+        heights = sorted(r.height for r in self.results)
+        deaths = sorted(r.frames for r in self.results if r.cause in ("bottom", "fall"))
+        frames = sum(r.frames for r in self.results)
+        powerups = sum(r.powerups for r in self.results)
+        minutes = frames / FRAMES_PER_SECOND / 60
+        return {
+            "seeds": count,
+            "causes": dict(Counter(r.cause for r in self.results)),
+            "height": {
+                "mean": sum(heights) / count if count else 0,
+                "p10": percentile(heights, 10),
+                "median": percentile(heights, 50),
+                "p90": percentile(heights, 90),
+                "max": heights[-1] if heights else 0,
+            },
+            "frames_to_death": {
+                "deaths": len(deaths),
+                "mean": sum(deaths) / len(deaths) if deaths else 0,
+                "median": percentile(deaths, 50),
+                "p10": percentile(deaths, 10),
+            },
+            "powerups_per_minute": powerups / minutes if minutes else 0,
+            "frames": frames,
+        }
+
+    def format(self):
+        s = self.summary()
+        height = s["height"]
+        death = s["frames_to_death"]
+        lines = [f"{s['seeds']} seeds, {s['frames']} frames simulated",
+                 "Causes: " + ", ".join(f"{cause} {count} ({count / s['seeds']:.1%})"
+                                        for cause, count in sorted(s["causes"].items())),
+                 f"Height: mean {height['mean']:.0f}, p10 {height['p10']}, "
+                 f"median {height['median']}, p90 {height['p90']}, max {height['max']}",
+                 f"Frames to death: {death['deaths']} deaths, mean {death['mean']:.0f}, "
+                 f"p10 {death['p10']}, median {death['median']}",
+                 f"Power-ups: {s['powerups_per_minute']:.2f} per minute of play"]
+        return "\n".join(lines)
+
+def run_farm(seeds, workers=None, max_frames=20000, stall_frames=1800, chunksize=8,
+             wobble=0.02):
+    tasks = [(seed, max_frames, stall_frames, wobble) for seed in seeds]
+    results = []
+    # Spawned workers start clean instead of inheriting the parent's SDL state
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(workers or os.cpu_count()) as pool:
+        # Seeds differ a lot in length, so hand them out in small chunks
+        for result in pool.imap_unordered(_run_seed, tasks, chunksize):
+            results.append(SeedResult(*result))
+    return FarmReport(results)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score generated levels with the autoplayer across many seeds")
+    parser.add_argument("--seeds", type=int, default=10000)
+    parser.add_argument("--start", type=int, default=0, help="first seed")
+    parser.add_argument("--workers", type=int, default=None, help="defaults to every core")
+    parser.add_argument("--max-frames", type=int, default=20000)
+    parser.add_argument("--stall-frames", type=int, default=1800)
+    parser.add_argument("--wobble", type=float, default=0.02,
+                        help="chance per frame that the autoplayer ignores its plan")
+    parser.add_argument("--json", help="also write the summary to this file")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    report = run_farm(range(args.start, args.start + args.seeds), args.workers,
+                      args.max_frames, args.stall_frames, wobble=args.wobble)
+    elapsed = time.perf_counter() - start
+
+    print(report.format())
+    print(f"Finished in {elapsed:.1f}s on {args.workers or os.cpu_count()} workers")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report.summary(), f, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
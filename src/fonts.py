@@ -0,0 +1,21 @@
+import pygame
+
+_fonts = {}
+
+def _clear():
+    # Fonts do not survive pygame.quit(); rendering with a stale one crashes
+    _fonts.clear()
+
+def get_font(size, name=None):
+    """Return a shared Font, loading it (and the font module) on first use."""
+    if not pygame.font.get_init():
+        pygame.font.init()
+        _fonts.clear()
+    key = (name, size)
+    font = _fonts.get(key)
+    if font is None:
+        if not _fonts:
+            # Quit hooks run once, so register again for every fresh cache
+            pygame.register_quit(_clear)
+        font = _fonts[key] = pygame.font.Font(name, size)
+    return font
@@ -2,51 +2,172 @@ import pygame
 import random
 import json
 import os
+import base64
+import binascii
+import zlib
+import math
 from .constants import *
+from .fonts import get_font
+from .background import get_background
 from .player import Player
-from .platform import Platform
+from .platform import PlatformScheduler
 from .powerup import PowerUp
 from .particles import ParticleSystem
+from .quality import QualityGovernor
+from .display import get_display
+from .config import load_config
+from .pacing import FramePacer
+from .snapshot import snapshot_game, restore_game
+from .ghost import GhostRecorder, GhostPlayer
+from .level import LevelGenerator, max_platforms
+from .spatial import SpatialGrid
+from .events import EventBus, LAND, JUMP, POWERUP_COLLECTED, NEW_HIGH_SCORE, GAME_OVER, SHIELD_USED
+
+# Effects played for gameplay events when the game has a sound manager
+EVENT_SOUNDS = {
+    LAND: "land",
+    JUMP: "jump",
+    POWERUP_COLLECTED: "powerup",
+    SHIELD_USED: "powerup",
+    GAME_OVER: "game_over",
+}
+
+# How long each timed power-up lasts, in frames
+EFFECT_DURATIONS = {
+    POWERUP_BIG_PLATFORMS: 600,
+    POWERUP_SLOW_MOTION: 300,
+    POWERUP_SHIELD: SHIELD_DURATION,
+    POWERUP_MAGNET: MAGNET_DURATION,
+    POWERUP_SUPER_JUMP: SUPER_JUMP_DURATION,
+}
+
+# Left, right and jump keys for each local player
+PLAYER_KEYS = (
+    (pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP),
+    (pygame.K_a, pygame.K_d, pygame.K_w),
+    (pygame.K_j, pygame.K_l, pygame.K_i),
+    (pygame.K_KP4, pygame.K_KP6, pygame.K_KP8),
+)
+# Control key to the index of the player it belongs to
+KEY_PLAYERS = {key: index for index, keys in enumerate(PLAYER_KEYS) for key in keys}
+# Gap between players' starting spots on the first platform
+PLAYER_SPACING = 45
+GRID_CELL = 100
 
 class Game:
-    def __init__(self):
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-        pygame.display.set_caption("Endless Jumper - Enhanced Edition")
-        self.clock = pygame.time.Clock()
+    def __init__(self, quality=None, display=None, sound=None, seed=None,
+                 high_score_path="high_score.json", players=1, leaderboard=None):
+        # Reuses the window if there is one; starting a game never switches modes
+        self.display = display or get_display()
+        self.screen = self.display.surface
         self.running = True
+        # Level generation draws only from this, so a seed reproduces a run
+        self.rng = random.Random(seed)
+        self.level = LevelGenerator(self.rng)
+        self.player_count = max(1, min(players, len(PLAYER_KEYS)))
+        # Broad-phase indexes over the level, shared by every player
+        self.platform_grid = SpatialGrid(GRID_CELL)
+        self.powerup_grid = SpatialGrid(GRID_CELL)
+        self.indexed = None
+        self.scheduler = PlatformScheduler()
         self.game_over = False
         self.paused = False
-        self.font = pygame.font.Font(None, 36)
-        self.small_font = pygame.font.Font(None, 24)
+        self.font = get_font(36)
+        self.small_font = get_font(24)
         
+        # None keeps the high score in memory only (headless tools)
+        self.high_score_path = high_score_path
         self.high_score = self.load_high_score()
+        self.saved_high_score = self.high_score
+        self.best_ghost = self.load_ghost()
+        self.ghost_surface = None
+        # Prerendered on the first draw, so headless games never build it
+        self.background = None
         self.start_time = pygame.time.get_ticks()
         self.end_time = None
         self.total_jumps = 0
         self.powerups_collected = 0
-        self.particles = ParticleSystem()
+        self.particles = ParticleSystem(random.Random(seed))
+        self.overlays = {}
+        self.text_cache = {}
+        self.quality = quality or QualityGovernor(enabled=False)
+        self.hud_lines = []
+        self.hud_age = 0
+        self.sound = sound
+        # Finished runs are handed to it; it never blocks the game
+        self.leaderboard = leaderboard
+
+        self.events = EventBus()
+        self.events.subscribe(LAND, self.on_land)
+        self.events.subscribe(JUMP, self.on_jump)
+        self.events.subscribe(POWERUP_COLLECTED, self.on_powerup_collected)
+        self.events.subscribe(SHIELD_USED, self.on_shield_used)
+        if sound:
+            for event_type, name in EVENT_SOUNDS.items():
+                self.events.subscribe(event_type, lambda a, b, name=name: sound.play(name))
+        if leaderboard:
+            self.events.subscribe(GAME_OVER, lambda score, high_score: leaderboard.submit(self))
         
         self.init_game()
 
     def load_high_score(self):
         try:
-            if os.path.exists("high_score.json"):
-                with open("high_score.json", "r") as f:
+            if self.high_score_path and os.path.exists(self.high_score_path):
+                with open(self.high_score_path, "r") as f:
                     data = json.load(f)
                     return data.get("high_score", 0)
         except:
             pass
         return 0
 
+    def load_ghost(self):
+        # The best run's track is stored next to its score
+        try:
+            if self.high_score_path and os.path.exists(self.high_score_path):
+                with open(self.high_score_path, "r") as f:
+                    data = json.load(f).get("ghost")
+                if data:
+                    data = base64.b64decode(data)
+                    GhostPlayer(data)
+                    return data
+        except (OSError, ValueError, binascii.Error, zlib.error):
+            pass
+        return None
+
     def save_high_score(self):
+        if not self.high_score_path:
+            self.saved_high_score = self.high_score
+            return
         try:
-            with open("high_score.json", "w") as f:
-                json.dump({"high_score": self.high_score}, f)
+            data = {"high_score": self.high_score}
+            if self.best_ghost:
+                data["ghost"] = base64.b64encode(self.best_ghost).decode("ascii")
+            with open(self.high_score_path, "w") as f:
+                json.dump(data, f)
+            self.saved_high_score = self.high_score
         except:
             pass
 
+    def flush_high_score(self):
+        # The score climbs almost every frame, so the file is only written
+        # once a run ends instead of on every new record
+        if self.high_score > self.saved_high_score:
+            if self.new_record:
+                # This run set the record, so it becomes the ghost to race
+                self.best_ghost = self.recorder.encode()
+            self.save_high_score()
+
+    def end_game(self, cause=None):
+        if not self.game_over:
+            self.death_cause = cause
+            self.end_time = pygame.time.get_ticks()
+            self.flush_high_score()
+            self.events.emit(GAME_OVER, self.score, self.high_score)
+        self.game_over = True
+
     def init_game(self):
-        self.platforms = []
+        # Whatever the last run left queued (its game_over) is delivered first
+        self.events.dispatch()
         self.powerups = []
         self.camera_y = 0
         self.score = 0
@@ -55,21 +176,66 @@ class Game:
         self.end_time = None
         self.total_jumps = 0
         self.powerups_collected = 0
+        self.new_record = False
+        self.death_cause = None
+        # Simulation frames since the start; moving platforms are timed by it
+        self.frame = 0
+
+        self.platforms = self.level.initial_platforms()
+        initial_platform = self.platforms[0]
+        self.index_level()
+
+        self.players = []
+        for i in range(self.player_count):
+            offset = int((i - (self.player_count - 1) / 2) * PLAYER_SPACING)
+            player = Player(initial_platform.x + initial_platform.width // 2 - PLAYER_SIZE // 2 + offset,
+                            initial_platform.y - PLAYER_SIZE)
+            player.color = PLAYER_COLORS[i]
+            self.players.append(player)
+        # The first player is the one recorded for ghosts and driven by the tools
+        self.player = self.players[0]
+        self.recorder = GhostRecorder()
+        self.player.recorder = self.recorder
+        self.ghost = GhostPlayer(self.best_ghost) if self.best_ghost else None
+        self.ghost_position = None
+
+    def snapshot(self):
+        return snapshot_game(self)
+
+    def restore(self, data):
+        restore_game(self, data)
+
+    def index_level(self):
+        # Rebuilds the collision grids and the platform scheduler from the
+        # platform and power-up lists
+        self.platform_grid.clear()
+        for platform in self.platforms:
+            if not platform.crumbled:
+                self.index_platform(platform)
+        self.scheduler.reset(self.platforms)
+        self.powerup_grid.clear()
+        for powerup in self.powerups:
+            self.index_powerup(powerup)
+        self.mark_indexed()
+
+    def index_platform(self, platform):
+        # Filed under its top edge at the widest it can be drawn
+        self.platform_grid.insert(platform, platform.x, platform.y, platform.x + platform.reach, platform.y)
 
-        initial_platform = Platform(SCREEN_WIDTH // 2 - PLATFORM_WIDTH // 2, 
-                                 SCREEN_HEIGHT - 100, 
-                                 PLATFORM_WIDTH)
-        self.platforms.append(initial_platform)
+    def index_powerup(self, powerup):
+        self.powerup_grid.insert(powerup, powerup.x, powerup.y,
+                                 powerup.x + POWERUP_SIZE, powerup.y + POWERUP_SIZE)
 
-        for i in range(1, 10):
-            x = random.randint(0, SCREEN_WIDTH - PLATFORM_WIDTH)
-            y = SCREEN_HEIGHT - (i * 100)
-            platform_width = max(MIN_PLATFORM_WIDTH, 
-                               PLATFORM_WIDTH * (PLATFORM_WIDTH_SCALE ** i))
-            platform_type = "special" if random.random() < 0.1 else "normal"
-            self.platforms.append(Platform(x, y, platform_width, platform_type))
+    def mark_indexed(self):
+        self.indexed = (self.platforms, len(self.platforms), self.powerups, len(self.powerups))
 
-        self.player = Player(initial_platform.rect.centerx - 20, initial_platform.rect.top - 40)
+    def sync_index(self):
+        # The lists may have been replaced or edited from outside (snapshot
+        # restore, tools, tests); the grids are rebuilt if so
+        indexed = self.indexed
+        if (indexed is None or indexed[0] is not self.platforms or indexed[1] != len(self.platforms) or
+                indexed[2] is not self.powerups or indexed[3] != len(self.powerups)):
+            self.index_level()
 
     def handle_events(self):
         for event in pygame.event.get():
@@ -83,238 +249,324 @@ class Game:
                     self.paused = not self.paused
 
         if not self.paused and not self.game_over:
-            keys = pygame.key.get_pressed()
-            self.player.vel_x = (keys[pygame.K_RIGHT] - keys[pygame.K_LEFT]) * MOVE_SPEED
-            
-            if keys[pygame.K_UP] and self.player.double_jumps_left > 0:
-                self.player.jump()
-                self.total_jumps += 1
+            self.apply_input(pygame.key.get_pressed())
+
+    def apply_input(self, keys):
+        # Returns a bitmask of the players whose movement this changed
+        changed = 0
+        for index, player in enumerate(self.players):
+            left, right, up = PLAYER_KEYS[index]
+            vel_x = (keys[right] - keys[left]) * MOVE_SPEED
+            if vel_x != player.vel_x:
+                player.vel_x = vel_x
+                changed |= 1 << index
+            if keys[up] and self.jump(index):
+                changed |= 1 << index
+        return changed
+
+    def jump(self, index=0):
+        # Mid-air jump from input; platform bounces are reported as LAND
+        player = self.players[index]
+        if player.alive and player.jump():
+            self.events.emit(JUMP, player.x + PLAYER_SIZE // 2, player.y + PLAYER_SIZE)
+            return True
+        return False
+
+    def on_land(self, x, y):
+        self.total_jumps += 1
+        self.particles.add_explosion(x, y, GREEN, 5)
+
+    def on_jump(self, x, y):
+        self.total_jumps += 1
+
+    def on_powerup_collected(self, powerup_type, index):
+        self.powerups_collected += 1
+        player = self.players[index]
+        if powerup_type == POWERUP_DOUBLE_JUMP:
+            player.double_jumps_left = 2
+        elif powerup_type in EFFECT_DURATIONS:
+            player.effects.start(powerup_type, EFFECT_DURATIONS[powerup_type])
+
+    def on_shield_used(self, x, y):
+        self.particles.add_explosion(x, y, CYAN, 12)
+
+    def attract_powerups(self, player):
+        # Pulls power-ups within MAGNET_RADIUS of the player's center a
+        # step closer. Only the grid cells around the player are looked at,
+        # so dense pickup fields cost no more than the few nearby pickups.
+        x = player.x + PLAYER_SIZE // 2
+        y = player.y + PLAYER_SIZE // 2
+        grid = self.powerup_grid
+        for powerup in grid.query_radius(x, y, MAGNET_RADIUS):
+            dx = x - (powerup.x + POWERUP_SIZE // 2)
+            dy = y - (powerup.y + POWERUP_SIZE // 2)
+            distance_sq = dx * dx + dy * dy
+            if distance_sq == 0 or distance_sq > MAGNET_RADIUS * MAGNET_RADIUS:
+                continue
+            distance = math.sqrt(distance_sq)
+            step = min(MAGNET_SPEED, distance)
+            powerup.x += dx * step / distance
+            powerup.y += dy * step / distance
+            grid.move(powerup, powerup.x, powerup.y, powerup.x + POWERUP_SIZE, powerup.y + POWERUP_SIZE)
 
     def spawn_powerup(self, platform):
-        if random.random() < 0.15:
-            powerup_type = random.choice([POWERUP_DOUBLE_JUMP, POWERUP_BIG_PLATFORMS, POWERUP_SLOW_MOTION])
-            powerup_x = platform.rect.x + platform.rect.width // 2 - 15
-            powerup_y = platform.rect.y - 35
-            self.powerups.append(PowerUp(powerup_x, powerup_y, powerup_type))
+        powerup_type = self.level.roll_powerup()
+        if powerup_type is not None:
+            powerup_x = platform.x + int(platform.width) // 2 - POWERUP_SIZE // 2
+            powerup_y = platform.y - 35
+            powerup = PowerUp(powerup_x, powerup_y, powerup_type)
+            self.powerups.append(powerup)
+            self.index_powerup(powerup)
 
     def update(self):
         if self.game_over or self.paused:
+            self.events.dispatch()
             return
 
-        prev_y = self.player.rect.y
-        self.player.update()
+        self.sync_index()
+        self.frame += 1
+        players = self.players
+        prev_ys = []
+        for player in players:
+            prev_ys.append(player.y)
+            if player.alive:
+                player.update()
+        if self.ghost is not None:
+            self.ghost_position = self.ghost.next()
+        self.particles.density = self.quality.particle_density
         self.particles.update()
 
-        # Platform collisions
-        for platform in self.platforms:
-            prev_bottom = prev_y + self.player.rect.height
-            platform_width = platform.get_display_width(self.player.big_platforms_timer > 0)
-
-            if (self.player.vel_y > 0 and
-                    prev_bottom <= platform.rect.top and
-                    self.player.rect.bottom >= platform.rect.top and
-                    self.player.rect.bottom <= platform.rect.bottom and
-                    self.player.rect.right >= platform.rect.left and
-                    self.player.rect.left <= platform.rect.left + platform_width):
-                self.player.y = platform.rect.top - self.player.rect.height
-                self.player.rect.bottom = platform.rect.top
-                self.player.vel_y = JUMP_SPEED
-                self.total_jumps += 1
-                self.particles.add_explosion(self.player.rect.centerx, self.player.rect.bottom, GREEN, 5)
-                
-                if self.player.double_jumps_left == 0:
-                    self.player.double_jumps_left = 1 if self.player.double_jumps_left > 0 else 0
-
-        # Power-up collisions
-        for powerup in self.powerups[:]:
-            if self.player.rect.colliderect(powerup.rect):
-                self.powerups.remove(powerup)
-                self.powerups_collected += 1
-                
-                if powerup.type == POWERUP_DOUBLE_JUMP:
-                    self.player.double_jumps_left = 2
-                elif powerup.type == POWERUP_BIG_PLATFORMS:
-                    self.player.big_platforms_timer = 600
-                elif powerup.type == POWERUP_SLOW_MOTION:
-                    self.player.slow_motion_timer = 300
+        platform_grid = self.platform_grid
+        powerup_grid = self.powerup_grid
+        fallen = self.scheduler.tick(self.frame, self.camera_y - PLATFORM_WAKE_MARGIN,
+                                     self.camera_y + SCREEN_HEIGHT + PLATFORM_WAKE_MARGIN,
+                                     platform_grid)
+        if fallen:
+            for platform in fallen:
+                self.particles.add_explosion(platform.x + platform.width / 2,
+                                             platform.y + PLATFORM_HEIGHT / 2, GRAY, 10)
+        leader = None
+        for index, player in enumerate(players):
+            if not player.alive:
+                continue
+            if POWERUP_MAGNET in player.effects.active:
+                self.attract_powerups(player)
+            left = player.x
+            right = left + PLAYER_SIZE
+
+            # Platform collisions: only platforms whose top lies in the band
+            # the feet swept this frame can be landed on
+            if player.vel_y > 0:
+                prev_bottom = prev_ys[index] + PLAYER_SIZE
+                bottom = player.y + PLAYER_SIZE
+                big_platforms_active = POWERUP_BIG_PLATFORMS in player.effects.active
+                for platform in platform_grid.query(left, prev_bottom, right, bottom):
+                    top = platform.y
+                    if (prev_bottom <= top <= bottom <= top + PLATFORM_HEIGHT and
+                            right >= platform.x and
+                            left <= platform.x + platform.get_display_width(big_platforms_active)):
+                        player.y = top - PLAYER_SIZE
+                        player.vel_y = player.bounce_speed()
+                        self.scheduler.trigger(platform)
+                        self.events.emit(LAND, left + PLAYER_SIZE // 2, top)
+                        break
+
+            # Power-up collisions
+            top = player.y
+            bottom = top + PLAYER_SIZE
+            for powerup in reversed(powerup_grid.query(left, top, right, bottom)):
+                if (left < powerup.x + POWERUP_SIZE and powerup.x < right and
+                        top < powerup.y + POWERUP_SIZE and powerup.y < bottom):
+                    self.powerups.remove(powerup)
+                    powerup_grid.remove(powerup)
+                    self.events.emit(POWERUP_COLLECTED, powerup.type, index)
+
+            if leader is None or player.y < leader.y:
+                leader = player
 
         # Update score
-        if self.player.y < self.highest_point:
-            self.highest_point = self.player.y
+        if leader.y < self.highest_point:
+            self.highest_point = leader.y
             self.score = (SCREEN_HEIGHT - self.highest_point) // 10
             
             if self.score > self.high_score:
+                if not self.new_record:
+                    self.new_record = True
+                    self.events.emit(NEW_HIGH_SCORE, self.score, self.high_score)
                 self.high_score = self.score
-                self.save_high_score()
 
-        self.camera_y = self.player.y - SCREEN_HEIGHT // 2
+        # The view follows whoever is highest; anyone left below it is out
+        self.camera_y = leader.y - SCREEN_HEIGHT // 2
 
         # Generate platforms
-        if len(self.platforms) > 0:
-            current_score = (SCREEN_HEIGHT - self.platforms[-1].y) // 10
-            difficulty_factor = min(1.0, current_score / 150.0)
-        else:
-            difficulty_factor = 0.0
-            
-        max_platforms = max(6, 15 - int(difficulty_factor * 9))
-        while len(self.platforms) < max_platforms:
-            prev_platform = self.platforms[-1]
-            current_score = (SCREEN_HEIGHT - prev_platform.y) // 10
-            difficulty_factor = min(1.0, current_score / 150.0)
-            
-            base_min_gap = 30
-            base_max_gap = 60
-            min_gap = int(base_min_gap + difficulty_factor * 40)
-            max_gap = int(base_max_gap + difficulty_factor * 60)
-            max_gap = min(max_gap, 120)
-            min_gap = min(min_gap, max_gap - 10)
-            
-            vertical_gap = random.randint(min_gap, max_gap)
-            y = prev_platform.y - vertical_gap
-            
-            width_reduction_factor = 1.0 - (difficulty_factor * 0.8)
-            platform_width = max(MIN_PLATFORM_WIDTH, 
-                               int(PLATFORM_WIDTH * width_reduction_factor))
-            
-            prev_center = prev_platform.rect.centerx
-            base_range = SCREEN_WIDTH * 0.2
-            max_range = SCREEN_WIDTH * 0.8
-            current_range = base_range + (max_range - base_range) * difficulty_factor
-            max_horizontal_offset = int(min(500, current_range))
-            
-            potential_positions = []
-            
-            if difficulty_factor < 0.2:
-                spread_offset = random.randint(-100, 100)
-                x1 = prev_center + spread_offset - platform_width // 2
-                potential_positions.append(x1)
-                
-                wider_offset = random.randint(-160, 160)
-                x2 = prev_center + wider_offset - platform_width // 2
-                potential_positions.append(x2)
-                
-            elif difficulty_factor < 0.5:
-                wide_offset = random.randint(-180, 180)
-                x1 = prev_center + wide_offset - platform_width // 2
-                potential_positions.append(x1)
-                
-                very_wide_offset = random.randint(-280, 280)
-                x2 = prev_center + very_wide_offset - platform_width // 2
-                potential_positions.append(x2)
-                
+        target = max_platforms(self.platforms[-1].home_y)
+        while len(self.platforms) < target:
+            platform = self.level.next_platform(self.platforms[-1])
+            self.platforms.append(platform)
+            self.index_platform(platform)
+            self.scheduler.add(platform)
+            self.spawn_powerup(platform)
+
+        # Both lists are kept in generation order (lowest first), so everything
+        # that scrolled off the bottom is a prefix and can be dropped in place
+        culled = 0
+        for platform in self.platforms:
+            if platform.home_y - self.camera_y < SCREEN_HEIGHT + 200:
+                break
+            platform_grid.remove(platform)
+            culled += 1
+        if culled:
+            del self.platforms[:culled]
+            self.scheduler.cull(self.camera_y + SCREEN_HEIGHT + 200)
+        culled = 0
+        for powerup in self.powerups:
+            if powerup.y - self.camera_y < SCREEN_HEIGHT + 100:
+                break
+            powerup_grid.remove(powerup)
+            culled += 1
+        if culled:
+            del self.powerups[:culled]
+        self.mark_indexed()
+
+        # Game over conditions, once every player is out
+        cause = None
+        remaining = 0
+        for player in players:
+            if not player.alive:
+                continue
+            if player.y - self.camera_y > SCREEN_HEIGHT:
+                out = "bottom"
+            elif player.is_falling and (player.y - player.fall_start_y) > MAX_FALL_DISTANCE:
+                out = "fall"
             else:
-                extreme_offset = random.randint(-250, 250)
-                x1 = prev_center + extreme_offset - platform_width // 2
-                potential_positions.append(x1)
-                
-                massive_offset = random.randint(-400, 400)
-                x2 = prev_center + massive_offset - platform_width // 2
-                potential_positions.append(x2)
-                
-                if random.random() < 0.5:
-                    if prev_center < SCREEN_WIDTH // 2:
-                        far_right_x = random.randint(SCREEN_WIDTH - platform_width - 50, SCREEN_WIDTH - platform_width - 10)
-                        potential_positions.append(far_right_x)
-                    else:
-                        far_left_x = random.randint(10, 50)
-                        potential_positions.append(far_left_x)
-            
-            max_offset = min(max_horizontal_offset, 450)
-            extreme_random_offset = random.randint(-max_offset, max_offset)
-            x3 = prev_center + extreme_random_offset - platform_width // 2
-            potential_positions.append(x3)
-            
-            best_x = None
-            best_score = -1
-            
-            for x in potential_positions:
-                x_clamped = max(0, min(x, SCREEN_WIDTH - platform_width))
-                
-                on_screen_ratio = 1.0
-                if x < 0:
-                    on_screen_ratio = max(0, (platform_width + x) / platform_width)
-                elif x + platform_width > SCREEN_WIDTH:
-                    on_screen_ratio = max(0, (SCREEN_WIDTH - x) / platform_width)
-                
-                distance_penalty = abs(x_clamped + platform_width//2 - prev_center) / SCREEN_WIDTH
-                penalty_weight = 0.15 + difficulty_factor * 0.1
-                score = on_screen_ratio - distance_penalty * penalty_weight
-                
-                if score > best_score:
-                    best_score = score
-                    best_x = x_clamped
-            
-            platform_type = "special" if random.random() < 0.08 else "normal"
-            new_platform = Platform(best_x, y, platform_width, platform_type)
-            self.platforms.append(new_platform)
-            self.spawn_powerup(new_platform)
-
-        self.platforms = [p for p in self.platforms
-                          if p.y - self.camera_y < SCREEN_HEIGHT + 200]
-        self.powerups = [p for p in self.powerups
-                        if p.rect.y - self.camera_y < SCREEN_HEIGHT + 100]
-
-        # Game over conditions
-        if self.player.y - self.camera_y > SCREEN_HEIGHT:
-            if not self.game_over:
-                self.end_time = pygame.time.get_ticks()
-            self.game_over = True
-        elif self.player.is_falling and (self.player.y - self.player.fall_start_y) > MAX_FALL_DISTANCE:
-            if not self.game_over:
-                self.end_time = pygame.time.get_ticks()
-            self.game_over = True
+                out = None
+            if out and POWERUP_SHIELD in player.effects.active:
+                # The shield breaks instead, throwing the player back up
+                player.effects.stop(POWERUP_SHIELD)
+                player.vel_y = JUMP_SPEED * SHIELD_BOUNCE
+                player.is_falling = False
+                player.fall_start_y = player.y
+                self.events.emit(SHIELD_USED, player.x + PLAYER_SIZE // 2, player.y + PLAYER_SIZE // 2)
+                out = None
+            if out:
+                player.alive = False
+                cause = out
+            else:
+                remaining += 1
+        if not remaining:
+            self.end_game(cause)
 
-    def draw_ui(self):
-        score_text = self.font.render(f'Score: {int(self.score)}', True, WHITE)
-        self.screen.blit(score_text, (10, 10))
-        
-        high_score_text = self.small_font.render(f'High Score: {int(self.high_score)}', True, YELLOW)
-        self.screen.blit(high_score_text, (10, 50))
+        # Side effects of everything above run in one pass, after the simulation
+        self.events.dispatch()
+
+    def render_text(self, key, text, font, color):
+        # HUD lines only change a few times per second, so the rendered
+        # surface is kept until its text differs
+        cached = self.text_cache.get(key)
+        if cached is None or cached[0] != text:
+            cached = (text, font.render(text, True, color))
+            self.text_cache[key] = cached
+        return cached[1]
+
+    def build_hud(self):
+        lines = self.hud_lines
+        lines.clear()
+        lines.append((self.render_text('score', f'Score: {int(self.score)}', self.font, WHITE), (10, 10)))
+        lines.append((self.render_text('high_score', f'High Score: {int(self.high_score)}', self.small_font, YELLOW), (10, 50)))
         
         if self.end_time:
             game_time = (self.end_time - self.start_time) // 1000
         else:
             game_time = (pygame.time.get_ticks() - self.start_time) // 1000
-        time_text = self.small_font.render(f'Time: {game_time}s', True, WHITE)
-        self.screen.blit(time_text, (10, 75))
+        lines.append((self.render_text('time', f'Time: {game_time}s', self.small_font, WHITE), (10, 75)))
         
         y_offset = 100
+        if len(self.players) > 1:
+            left = sum(1 for player in self.players if player.alive)
+            lines.append((self.render_text('players', f'Players: {left}/{len(self.players)}', self.small_font, WHITE), (10, y_offset)))
+            y_offset += 25
+
+        active = self.player.effects.active
         if self.player.double_jumps_left > 0:
-            double_jump_text = self.small_font.render(f'Double Jumps: {self.player.double_jumps_left}', True, BLUE)
-            self.screen.blit(double_jump_text, (10, y_offset))
+            lines.append((self.render_text('double_jump', f'Double Jumps: {self.player.double_jumps_left}', self.small_font, BLUE), (10, y_offset)))
             y_offset += 25
             
-        if self.player.big_platforms_timer > 0:
-            big_platform_text = self.small_font.render(f'Big Platforms: {self.player.big_platforms_timer // 60}s', True, ORANGE)
-            self.screen.blit(big_platform_text, (10, y_offset))
+        if POWERUP_BIG_PLATFORMS in active:
+            lines.append((self.render_text('big_platforms', f'Big Platforms: {self.player.big_platforms_timer // 60}s', self.small_font, ORANGE), (10, y_offset)))
             y_offset += 25
             
-        if self.player.slow_motion_timer > 0:
-            slow_motion_text = self.small_font.render(f'Slow Motion: {self.player.slow_motion_timer // 60}s', True, PURPLE)
-            self.screen.blit(slow_motion_text, (10, y_offset))
+        if POWERUP_SLOW_MOTION in active:
+            lines.append((self.render_text('slow_motion', f'Slow Motion: {self.player.slow_motion_timer // 60}s', self.small_font, PURPLE), (10, y_offset)))
+            y_offset += 25
+
+        if POWERUP_SHIELD in active:
+            lines.append((self.render_text('shield', f'Shield: {self.player.shield_timer // 60}s', self.small_font, CYAN), (10, y_offset)))
+            y_offset += 25
+
+        if POWERUP_MAGNET in active:
+            lines.append((self.render_text('magnet', f'Magnet: {self.player.magnet_timer // 60}s', self.small_font, RED), (10, y_offset)))
+            y_offset += 25
+
+        if POWERUP_SUPER_JUMP in active:
+            lines.append((self.render_text('super_jump', f'Super Jump: {self.player.super_jump_timer // 60}s', self.small_font, YELLOW), (10, y_offset)))
             y_offset += 25
         
-        controls_text = self.small_font.render('Controls: Left/Right arrows, P to pause', True, GRAY)
-        self.screen.blit(controls_text, (10, SCREEN_HEIGHT - 30))
+        if len(self.players) > 1:
+            controls = 'Controls: P1 arrows, P2 WASD, P3 IJKL, P4 keypad 4/6/8, P to pause'
+        else:
+            controls = 'Controls: Left/Right arrows, P to pause'
+        lines.append((self.render_text('controls', controls, self.small_font, GRAY), (10, SCREEN_HEIGHT - 30)))
+
+    def draw_ui(self):
+        # The HUD is rebuilt every hud_interval frames and replayed in between
+        if self.hud_age <= 0 or self.game_over or self.paused:
+            self.build_hud()
+            self.hud_age = self.quality.hud_interval
+        self.hud_age -= 1
+        for surface, position in self.hud_lines:
+            self.screen.blit(surface, position)
+
+    def get_overlay(self, alpha):
+        overlay = self.overlays.get(alpha)
+        if overlay is None:
+            overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+            overlay.set_alpha(alpha)
+            overlay.fill(BLACK)
+            self.overlays[alpha] = overlay
+        return overlay
+
+    def get_ghost_surface(self):
+        if self.ghost_surface is None:
+            self.ghost_surface = pygame.Surface((40, 40))
+            self.ghost_surface.set_alpha(80)
+            self.ghost_surface.fill(WHITE)
+        return self.ghost_surface
 
     def draw(self):
-        self.screen.fill(BLACK)
+        if self.background is None:
+            self.background = get_background(self.screen)
+        self.background.draw(self.screen, self.camera_y, self.quality.background_layers)
 
+        big_platforms_active = any(player.alive and POWERUP_BIG_PLATFORMS in player.effects.active
+                                   for player in self.players)
+        borders = self.quality.platform_borders
         for platform in self.platforms:
-            platform.draw(self.screen, self.camera_y, self.player.big_platforms_timer > 0)
+            platform.draw(self.screen, self.camera_y, big_platforms_active, borders)
             
         for powerup in self.powerups:
             powerup.draw(self.screen, self.camera_y)
             
         self.particles.draw(self.screen, self.camera_y)
-        self.player.draw(self.screen, self.camera_y)
+        if self.ghost_position is not None:
+            x, y = self.ghost_position
+            self.screen.blit(self.get_ghost_surface(), (x, y - self.camera_y))
+        for player in self.players:
+            if player.alive:
+                player.draw(self.screen, self.camera_y, self.quality.trail)
         self.draw_ui()
 
         if self.paused:
-            pause_surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-            pause_surface.set_alpha(128)
-            pause_surface.fill(BLACK)
-            self.screen.blit(pause_surface, (0, 0))
+            self.screen.blit(self.get_overlay(128), (0, 0))
             
             pause_text = self.font.render('PAUSED', True, WHITE)
             pause_rect = pause_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2))
@@ -325,10 +577,7 @@ class Game:
             self.screen.blit(resume_text, resume_rect)
 
         if self.game_over:
-            game_over_surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-            game_over_surface.set_alpha(200)
-            game_over_surface.fill(BLACK)
-            self.screen.blit(game_over_surface, (0, 0))
+            self.screen.blit(self.get_overlay(200), (0, 0))
             
             game_over_text = self.font.render('Game Over!', True, RED)
             game_over_rect = game_over_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 - 80))
@@ -352,15 +601,26 @@ class Game:
             restart_rect = restart_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 50))
             self.screen.blit(restart_text, restart_rect)
 
-        pygame.display.flip()
+            # Whatever the leaderboard last fetched; it refreshes in the background
+            if self.leaderboard and self.leaderboard.top:
+                y = SCREEN_HEIGHT//2 + 90
+                for rank, (name, score) in enumerate(self.leaderboard.top, 1):
+                    text = self.render_text(f'leaderboard_{rank}', f'{rank}. {name}  {score}',
+                                            self.small_font, YELLOW if rank == 1 else WHITE)
+                    self.screen.blit(text, text.get_rect(center=(SCREEN_WIDTH//2, y)))
+                    y += 25
 
 
 
     def run(self):
+        config = load_config()
+        pacer = FramePacer(config["game"]["fps"], config["game"]["pacing"])
         while self.running:
-            self.clock.tick(60)
+            pacer.wait()
             self.handle_events()
             self.update()
             self.draw()
+            self.display.present()
 
+        self.flush_high_score()
         pygame.quit()
\ No newline at end of file
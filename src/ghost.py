@@ -0,0 +1,124 @@
+import struct
+import zlib
+
+MAGIC = b"EJGH"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sBI")
+# Decompressed bytes pulled in at a time during playback
+CHUNK = 256
+# Two varints of the largest size that can be needed for one frame
+MAX_FRAME_BYTES = 20
+
+def zigzag(value):
+    # Small negative numbers become small positive ones: 0, -1, 1, -2 -> 0, 1, 2, 3
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+def unzigzag(value):
+    return value >> 1 if not value & 1 else -((value + 1) >> 1)
+
+def write_varint(buffer, value):
+    while value >= 0x80:
+        buffer.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+class GhostRecorder:
+    """Records one position per frame as a compact track.
+
+    Each frame stores the change in velocity (the second difference of the
+    position) for x and y as zigzag varints. Under constant gravity and
+    steady steering that is almost always 0 or 1, which takes one byte
+    uncompressed and next to nothing once the track is zlib-compressed.
+    """
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.frames = 0
+        self.x = self.y = 0
+        self.vx = self.vy = 0
+
+    def record(self, x, y):
+        vx = x - self.x
+        vy = y - self.y
+        write_varint(self.buffer, zigzag(vx - self.vx))
+        write_varint(self.buffer, zigzag(vy - self.vy))
+        self.x, self.y = x, y
+        self.vx, self.vy = vx, vy
+        self.frames += 1
+
+    def encode(self):
+        return HEADER.pack(MAGIC, FORMAT_VERSION, self.frames) + zlib.compress(bytes(self.buffer), 9)
+
+class GhostPlayer:
+    """Plays back an encoded track one frame at a time.
+
+    The compressed data is inflated in small chunks as playback reaches
+    them, so only a few hundred bytes are decoded ahead of the ghost.
+    Seeking backwards restarts the stream and decodes up to the frame.
+    """
+
+    def __init__(self, data):
+        magic, version, frames = HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ValueError("Not a ghost track")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported ghost version: {version}")
+        self.frames = frames
+        self.data = bytes(data[HEADER.size:])
+        self.restart()
+
+    def restart(self):
+        self.frame = 0
+        self.decompressor = zlib.decompressobj()
+        self.pending = self.data
+        self.buffer = b""
+        self.pos = 0
+        self.x = self.y = 0
+        self.vx = self.vy = 0
+
+    def finished(self):
+        return self.frame >= self.frames
+
+    def seek(self, calls):
+        """Play to where `calls` calls of next() leave off; returns the last result."""
+        if calls < self.frame:
+            self.restart()
+        while self.frame < min(calls, self.frames):
+            self.next()
+        if calls == 0 or calls > self.frames:
+            return None
+        return self.x, self.y
+
+    def _fill(self):
+        chunk = self.decompressor.decompress(self.pending, CHUNK)
+        self.pending = self.decompressor.unconsumed_tail
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+
+    def _read_varint(self):
+        buffer = self.buffer
+        pos = self.pos
+        value = 0
+        shift = 0
+        while True:
+            byte = buffer[pos]
+            pos += 1
+            value |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                break
+            shift += 7
+        self.pos = pos
+        return value
+
+    def next(self):
+        """Return the ghost's (x, y) for the next frame, or None once it ends."""
+        if self.frame >= self.frames:
+            return None
+        if len(self.buffer) - self.pos < MAX_FRAME_BYTES and self.pending:
+            self._fill()
+        self.vx += unzigzag(self._read_varint())
+        self.vy += unzigzag(self._read_varint())
+        self.x += self.vx
+        self.y += self.vy
+        self.frame += 1
+        return self.x, self.y
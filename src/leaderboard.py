@@ -0,0 +1,184 @@
+import http.client
+import json
+import os
+import queue
+import random
+import threading
+import time
+import uuid
+from urllib.parse import urlsplit
+
+# Runs per upload request
+BATCH_SIZE = 20
+# Seconds between retries after a failure, doubling up to the maximum
+BACKOFF_MIN = 1.0
+BACKOFF_MAX = 60.0
+# Seconds between refreshes of the top table while idle
+REFRESH_INTERVAL = 60.0
+
+class Outbox:
+    """Finished runs waiting to be uploaded, kept in a JSON file.
+
+    Every change rewrites the file through a temporary file and a rename,
+    so a crash leaves either the old list or the new one. Runs carry an id
+    so the server can ignore a batch it already has when an upload is
+    retried after its response was lost.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.runs = []
+        try:
+            if path and os.path.exists(path):
+                with open(path, "r") as f:
+                    self.runs = json.load(f).get("runs", [])
+        except (OSError, ValueError):
+            pass
+
+    def add(self, runs):
+        self.runs.extend(runs)
+        self.save()
+
+    def remove(self, runs):
+        done = {run["id"] for run in runs}
+        self.runs = [run for run in self.runs if run["id"] not in done]
+        self.save()
+
+    def save(self):
+        if not self.path:
+            return
+        try:
+            temp = self.path + ".tmp"
+            with open(temp, "w") as f:
+                json.dump({"runs": self.runs}, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp, self.path)
+        except OSError:
+            pass
+
+class LeaderboardClient:
+    """Uploads finished runs and keeps the top of the leaderboard at hand.
+
+    submit() only puts the run on a queue; a worker thread does all the
+    file and network work. It moves queued runs into the outbox, uploads
+    them in batches (POST <url>/runs) over one keep-alive connection, and
+    drops them from the outbox once the server accepts them. When the
+    server can't be reached the runs stay in the outbox, including across
+    restarts, and the worker retries with exponential backoff. After each
+    upload, and every REFRESH_INTERVAL seconds otherwise, it fetches
+    GET <url>/top?limit=N into `top`, a tuple of (name, score) the game
+    over screen reads without waiting.
+    """
+
+    def __init__(self, url, outbox_path="leaderboard_outbox.json", name="Player",
+                 top_count=5, timeout=5.0, backoff=(BACKOFF_MIN, BACKOFF_MAX)):
+        parts = urlsplit(url)
+        self.https = parts.scheme == "https"
+        self.host = parts.hostname
+        self.port = parts.port
+        self.path = parts.path.rstrip("/")
+        self.name = name
+        self.top_count = top_count
+        self.timeout = timeout
+        self.backoff_min, self.backoff_max = backoff
+        self.outbox = Outbox(outbox_path)
+        self.top = ()
+        self.uploaded = 0
+        self.failures = 0
+        self.connections = 0
+        self.connection = None
+        self.queue = queue.SimpleQueue()
+        self.thread = threading.Thread(target=self.run, name="leaderboard", daemon=True)
+        self.thread.start()
+
+    def submit(self, game):
+        """Queue the finished run of `game` for upload."""
+        self.queue.put({
+            "id": uuid.uuid4().hex,
+            "name": self.name,
+            "score": int(game.score),
+            "time": (game.end_time - game.start_time) / 1000 if game.end_time else 0,
+            "jumps": game.total_jumps,
+            "powerups": game.powerups_collected,
+            "finished": int(time.time()),
+        })
+
+    def close(self, timeout=None):
+        """Stop the worker, after it tries once more to upload what is queued."""
+        self.queue.put(None)
+        self.thread.join(timeout)
+
+    def run(self):
+        delay = 0
+        retry_at = 0
+        refresh_at = 0
+        stopping = False
+        while not stopping:
+            if delay:
+                due = retry_at
+            else:
+                due = 0 if self.outbox.runs else refresh_at
+            try:
+                runs = [self.queue.get(timeout=max(0.0, due - time.monotonic()))]
+            except queue.Empty:
+                runs = []
+            while True:
+                try:
+                    runs.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            if None in runs:
+                stopping = True
+                runs.remove(None)
+            if runs:
+                self.outbox.add(runs)
+            if delay and not stopping and time.monotonic() < retry_at:
+                # Backing off; the new runs go out with the next retry
+                continue
+
+            try:
+                while self.outbox.runs:
+                    batch = self.outbox.runs[:BATCH_SIZE]
+                    self.request("POST", "/runs", {"runs": batch})
+                    self.outbox.remove(batch)
+                    self.uploaded += len(batch)
+                    refresh_at = 0
+                if time.monotonic() >= refresh_at and not stopping:
+                    data = self.request("GET", f"/top?limit={self.top_count}")
+                    self.top = tuple((entry.get("name", ""), int(entry["score"]))
+                                     for entry in data.get("top", ())[:self.top_count])
+                    refresh_at = time.monotonic() + REFRESH_INTERVAL
+                delay = 0
+            except (OSError, http.client.HTTPException, ValueError, KeyError, TypeError):
+                self.failures += 1
+                self.disconnect()
+                delay = min(max(delay * 2, self.backoff_min), self.backoff_max)
+                # Jitter keeps many clients from retrying in step
+                retry_at = time.monotonic() + delay * random.uniform(0.8, 1.2)
+        self.disconnect()
+
+    def request(self, method, path, payload=None):
+        if self.connection is None:
+            connection_class = http.client.HTTPSConnection if self.https else http.client.HTTPConnection
+            self.connection = connection_class(self.host, self.port, timeout=self.timeout)
+            self.connections += 1
+        headers = {"Accept": "application/json"}
+        body = None
+        if payload is not None:
+            body = json.dumps(payload).encode("utf-8")
+            headers["Content-Type"] = "application/json"
+        self.connection.request(method, self.path + path, body, headers)
+        response = self.connection.getresponse()
+        # The body has to be read in full before the connection can be reused
+        data = response.read()
+        if response.will_close:
+            self.disconnect()
+        if not 200 <= response.status < 300:
+            raise http.client.HTTPException(f"{method} {path}: HTTP {response.status}")
+        return json.loads(data) if data else {}
+
+    def disconnect(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
@@ -0,0 +1,177 @@
+import random
+from .constants import *
+from .platform import Platform
+from .reachability import is_reachable, reachable_range
+
+POWERUP_CHANCE = 0.15
+POWERUP_TYPES = (POWERUP_DOUBLE_JUMP, POWERUP_BIG_PLATFORMS, POWERUP_SLOW_MOTION,
+                 POWERUP_SHIELD, POWERUP_MAGNET, POWERUP_SUPER_JUMP)
+
+def max_platforms(top_platform_y):
+    # Fewer platforms are kept ahead of the player as the climb gets harder
+    current_score = (SCREEN_HEIGHT - top_platform_y) // 10
+    difficulty_factor = min(1.0, current_score / 150.0)
+    return max(6, 15 - int(difficulty_factor * 9))
+
+class LevelGenerator:
+    """Produces the platforms and power-up rolls of a level from one RNG.
+
+    Every platform depends only on the one before it and the RNG, so the
+    same seed always lays out the same level however the player moves.
+    The game and the batch simulator both build levels through this.
+    """
+
+    def __init__(self, rng=None):
+        self.rng = rng or random.Random()
+
+    def initial_platforms(self):
+        platforms = [Platform(SCREEN_WIDTH // 2 - PLATFORM_WIDTH // 2,
+                              SCREEN_HEIGHT - 100,
+                              PLATFORM_WIDTH)]
+        for i in range(1, 10):
+            x = self.rng.randint(0, SCREEN_WIDTH - PLATFORM_WIDTH)
+            y = SCREEN_HEIGHT - (i * 100)
+            platform_width = max(MIN_PLATFORM_WIDTH,
+                                 PLATFORM_WIDTH * (PLATFORM_WIDTH_SCALE ** i))
+            platform_type = "special" if self.rng.random() < 0.1 else "normal"
+            platforms.append(Platform(x, y, platform_width, platform_type))
+        return platforms
+
+    def next_platform(self, prev_platform):
+        current_score = (SCREEN_HEIGHT - prev_platform.home_y) // 10
+        difficulty_factor = min(1.0, current_score / 150.0)
+
+        base_min_gap = 30
+        base_max_gap = 60
+        min_gap = int(base_min_gap + difficulty_factor * 40)
+        max_gap = int(base_max_gap + difficulty_factor * 60)
+        max_gap = min(max_gap, 120)
+        min_gap = min(min_gap, max_gap - 10)
+
+        vertical_gap = self.rng.randint(min_gap, max_gap)
+        y = prev_platform.home_y - vertical_gap
+
+        width_reduction_factor = 1.0 - (difficulty_factor * 0.8)
+        platform_width = max(MIN_PLATFORM_WIDTH,
+                             int(PLATFORM_WIDTH * width_reduction_factor))
+
+        prev_center = prev_platform.home_x + int(prev_platform.width) // 2
+        base_range = SCREEN_WIDTH * 0.2
+        max_range = SCREEN_WIDTH * 0.8
+        current_range = base_range + (max_range - base_range) * difficulty_factor
+        max_horizontal_offset = int(min(500, current_range))
+
+        potential_positions = []
+
+        if difficulty_factor < 0.2:
+            spread_offset = self.rng.randint(-100, 100)
+            x1 = prev_center + spread_offset - platform_width // 2
+            potential_positions.append(x1)
+
+            wider_offset = self.rng.randint(-160, 160)
+            x2 = prev_center + wider_offset - platform_width // 2
+            potential_positions.append(x2)
+
+        elif difficulty_factor < 0.5:
+            wide_offset = self.rng.randint(-180, 180)
+            x1 = prev_center + wide_offset - platform_width // 2
+            potential_positions.append(x1)
+
+            very_wide_offset = self.rng.randint(-280, 280)
+            x2 = prev_center + very_wide_offset - platform_width // 2
+            potential_positions.append(x2)
+
+        else:
+            extreme_offset = self.rng.randint(-250, 250)
+            x1 = prev_center + extreme_offset - platform_width // 2
+            potential_positions.append(x1)
+
+            massive_offset = self.rng.randint(-400, 400)
+            x2 = prev_center + massive_offset - platform_width // 2
+            potential_positions.append(x2)
+
+            if self.rng.random() < 0.5:
+                if prev_center < SCREEN_WIDTH // 2:
+                    far_right_x = self.rng.randint(SCREEN_WIDTH - platform_width - 50, SCREEN_WIDTH - platform_width - 10)
+                    potential_positions.append(far_right_x)
+                else:
+                    far_left_x = self.rng.randint(10, 50)
+                    potential_positions.append(far_left_x)
+
+        max_offset = min(max_horizontal_offset, 450)
+        extreme_random_offset = self.rng.randint(-max_offset, max_offset)
+        x3 = prev_center + extreme_random_offset - platform_width // 2
+        potential_positions.append(x3)
+
+        best_x = None
+        best_score = -1
+
+        for x in potential_positions:
+            x_clamped = max(0, min(x, SCREEN_WIDTH - platform_width))
+            if not is_reachable(prev_platform.home_x, prev_platform.home_y, prev_platform.width,
+                                x_clamped, y, platform_width):
+                continue
+
+            on_screen_ratio = 1.0
+            if x < 0:
+                on_screen_ratio = max(0, (platform_width + x) / platform_width)
+            elif x + platform_width > SCREEN_WIDTH:
+                on_screen_ratio = max(0, (SCREEN_WIDTH - x) / platform_width)
+
+            distance_penalty = abs(x_clamped + platform_width//2 - prev_center) / SCREEN_WIDTH
+            penalty_weight = 0.15 + difficulty_factor * 0.1
+            score = on_screen_ratio - distance_penalty * penalty_weight
+
+            if score > best_score:
+                best_score = score
+                best_x = x_clamped
+
+        if best_x is None:
+            # No candidate can be reached; pull the last one back within a jump
+            span = reachable_range(prev_platform.home_x, prev_platform.home_y,
+                                   prev_platform.width, y, platform_width)
+            while span is None and y < prev_platform.home_y:
+                # Higher than a bounce can go; bring it down
+                y += 1
+                span = reachable_range(prev_platform.home_x, prev_platform.home_y,
+                                       prev_platform.width, y, platform_width)
+            if span is None:
+                # Nothing on screen is in reach of the last platform
+                best_x = max(0, min(prev_platform.home_x, SCREEN_WIDTH - platform_width))
+            else:
+                low, high = span
+                best_x = max(low, min(x3, high))
+
+        platform_type = "special" if self.rng.random() < 0.08 else "normal"
+        if platform_type == "normal" and difficulty_factor > 0:
+            roll = self.rng.random()
+            if roll < MOVING_CHANCE * difficulty_factor:
+                platform_type = "moving"
+            elif roll < (MOVING_CHANCE + CRUMBLING_CHANCE) * difficulty_factor:
+                platform_type = "crumbling"
+        platform = Platform(best_x, y, platform_width, platform_type)
+        if platform_type == "moving":
+            self.add_motion(prev_platform, platform)
+        return platform
+
+    def add_motion(self, prev_platform, platform):
+        # Horizontal swings stay on screen. Vertical ones are small enough
+        # that platform tops never cross, and are only used when the highest
+        # point of the swing can still be reached; otherwise it stays put.
+        period = self.rng.randint(*MOVE_PERIOD) // 2 * 2
+        phase = self.rng.randrange(period)
+        room = min(platform.home_x, SCREEN_WIDTH - platform.home_x - int(platform.width))
+        amplitude = min(self.rng.randint(*MOVE_AMPLITUDE_X), room)
+        if amplitude >= MOVE_AMPLITUDE_X[0]:
+            platform.set_motion("x", amplitude, period, phase)
+        elif is_reachable(prev_platform.home_x, prev_platform.home_y, prev_platform.width,
+                          platform.home_x, platform.home_y - MOVE_AMPLITUDE_Y, platform.width):
+            platform.set_motion("y", MOVE_AMPLITUDE_Y, period, phase)
+        else:
+            platform.type = "normal"
+
+    def roll_powerup(self):
+        """Power-up type to place on a freshly generated platform, or None."""
+        if self.rng.random() < POWERUP_CHANCE:
+            return self.rng.choice(POWERUP_TYPES)
+        return None
@@ -2,19 +2,23 @@ import logging
 import os
 from datetime import datetime
 
-def setup_logger(name="endless_jumping", level=logging.INFO):
+def setup_logger(name="endless_jumping", level=logging.INFO, log_dir="logs"):
     """Set up logger for the game"""
     
     # Create logs directory if it doesn't exist
-    if not os.path.exists("logs"):
-        os.makedirs("logs")
+    if not os.path.exists(log_dir):
+        os.makedirs(log_dir)
     
     # Create logger
     logger = logging.getLogger(name)
     logger.setLevel(level)
+
+    # Already configured; adding handlers again would leak file handles
+    if logger.handlers:
+        return logger
     
     # Create file handler
-    log_filename = f"logs/game_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
+    log_filename = os.path.join(log_dir, f"game_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log")
     file_handler = logging.FileHandler(log_filename)
     file_handler.setLevel(level)
     
@@ -1,11 +1,12 @@
 import pygame
 from .constants import *
+from .fonts import get_font
 
 class Menu:
     def __init__(self, screen):
         self.screen = screen
-        self.font = pygame.font.Font(None, 48)
-        self.small_font = pygame.font.Font(None, 32)
+        self.font = get_font(48)
+        self.small_font = get_font(32)
         self.selected = 0
         self.options = ["Start Game", "Settings", "Quit"]
         
@@ -30,6 +31,4 @@ class Menu:
             color = YELLOW if i == self.selected else WHITE
             text = self.small_font.render(option, True, color)
             text_rect = text.get_rect(center=(SCREEN_WIDTH//2, 250 + i * 50))
-            self.screen.blit(text, text_rect)
-        
-        pygame.display.flip()
\ No newline at end of file
+            self.screen.blit(text, text_rect)
\ No newline at end of file
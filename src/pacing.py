@@ -0,0 +1,75 @@
+import time
+import pygame
+
+PACING_MODES = ("tick", "busy", "vsync", "hybrid")
+
+class FramePacer:
+    """Holds the main loop to a fixed frame rate.
+
+    "tick" and "busy" are pygame's Clock.tick and Clock.tick_busy_loop.
+    "hybrid" sleeps until shortly before the frame deadline and spins for
+    the rest, which keeps intervals even without burning a whole core.
+    "vsync" expects the display to block in flip() and only applies the
+    hybrid wait as a cap, for monitors refreshing faster than fps.
+
+    Deadlines advance by a fixed interval rather than from the end of the
+    previous wait, so small oversleeps do not accumulate as drift.
+    """
+
+    def __init__(self, fps=60, mode="hybrid", spin_ms=2.0):
+        if mode not in PACING_MODES:
+            raise ValueError(f"Unknown pacing mode: {mode}")
+        self.fps = fps
+        self.mode = mode
+        # Sleep is only trusted up to this far from the deadline
+        self.spin_time = spin_ms / 1000.0
+        self.interval = 1.0 / fps if fps > 0 else 0
+        self.clock = pygame.time.Clock()
+        self.deadline = None
+
+    def wait(self):
+        if self.mode == "tick":
+            return self.clock.tick(self.fps)
+        if self.mode == "busy":
+            return self.clock.tick_busy_loop(self.fps)
+
+        now = time.perf_counter()
+        if self.interval <= 0:
+            self.deadline = now
+            return 0
+        if self.deadline is None:
+            self.deadline = now
+        self.deadline += self.interval
+        if self.deadline < now:
+            # Fell more than a frame behind; resync instead of rushing frames out
+            self.deadline = now
+            return 0
+
+        remaining = self.deadline - now - self.spin_time
+        if remaining > 0:
+            time.sleep(remaining)
+        while time.perf_counter() < self.deadline:
+            pass
+        # Milliseconds waited, like Clock.tick
+        return (self.deadline - now) * 1000
+
+    def wait_for_input(self, lead):
+        """Hold off reading input until `lead` seconds before the next flip.
+
+        For late input sampling, called straight after wait(). Only vsync
+        needs it: flip() returns at a refresh, so input read right away sits
+        a whole refresh in the finished frame before it is shown. The other
+        modes already end wait() at the frame deadline, just before the
+        input is read and the frame is drawn and presented.
+        """
+        if self.mode != "vsync" or self.interval <= 0:
+            return 0
+        remaining = self.interval - lead - self.spin_time
+        if remaining <= 0:
+            return 0
+        deadline = time.perf_counter() + remaining
+        if remaining > self.spin_time:
+            time.sleep(remaining - self.spin_time)
+        while time.perf_counter() < deadline:
+            pass
+        return remaining * 1000
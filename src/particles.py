@@ -5,6 +5,9 @@ from .constants import *
 
 class Particle:
     def __init__(self, x, y, vel_x, vel_y, color, life):
+        self.reset(x, y, vel_x, vel_y, color, life)
+
+    def reset(self, x, y, vel_x, vel_y, color, life):
         self.x = x
         self.y = y
         self.vel_x = vel_x
@@ -20,28 +23,46 @@ class Particle:
         self.life -= 1
         
     def draw(self, screen, camera_y):
-        alpha = int(255 * (self.life / self.max_life))
-        color = (*self.color, alpha)
-        pygame.draw.circle(screen, self.color[:3], 
+        pygame.draw.circle(screen, self.color, 
                          (int(self.x), int(self.y - camera_y)), 2)
 
 class ParticleSystem:
-    def __init__(self):
+    def __init__(self, rng=None):
+        # Kept apart from the level RNG so visual detail never changes the level
+        self.rng = rng or random.Random()
         self.particles = []
+        # Dead particles are recycled instead of reallocated
+        self.pool = []
+        # Scales burst sizes; lowered by the quality governor under load
+        self.density = 1.0
         
     def add_explosion(self, x, y, color=WHITE, count=10):
+        count = int(count * self.density + 0.5)
         for _ in range(count):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(2, 8)
+            angle = self.rng.uniform(0, 2 * math.pi)
+            speed = self.rng.uniform(2, 8)
             vel_x = math.cos(angle) * speed
             vel_y = math.sin(angle) * speed - 2
-            life = random.randint(30, 60)
-            self.particles.append(Particle(x, y, vel_x, vel_y, color, life))
+            life = self.rng.randint(30, 60)
+            if self.pool:
+                particle = self.pool.pop()
+                particle.reset(x, y, vel_x, vel_y, color, life)
+            else:
+                particle = Particle(x, y, vel_x, vel_y, color, life)
+            self.particles.append(particle)
     
     def update(self):
-        self.particles = [p for p in self.particles if p.life > 0]
-        for particle in self.particles:
-            particle.update()
+        # Compact the live particles in place and hand dead ones to the pool
+        particles = self.particles
+        alive = 0
+        for particle in particles:
+            if particle.life > 0:
+                particle.update()
+                particles[alive] = particle
+                alive += 1
+            else:
+                self.pool.append(particle)
+        del particles[alive:]
     
     def draw(self, screen, camera_y):
         for particle in self.particles:
@@ -1,20 +1,79 @@
+import math
 import time
 import pygame
 from collections import deque
+from .fonts import get_font
+
+INPUT_EVENTS = (pygame.KEYDOWN, pygame.KEYUP)
 
 class PerformanceMonitor:
     def __init__(self, max_samples=60):
         self.max_samples = max_samples
         self.frame_times = deque(maxlen=max_samples)
-        self.last_frame_time = time.time()
-        self.font = pygame.font.Font(None, 24)
+        # Time spent on input, simulation and drawing, without the frame cap sleep
+        self.work_times = deque(maxlen=max_samples)
+        # The part of the work before present(), which under vsync excludes
+        # the wait for the refresh inside flip()
+        self.draw_times = deque(maxlen=max_samples)
+        self.last_frame_time = time.perf_counter()
+        self.work_start = None
+        # Input latency of key events that changed a player's movement, from
+        # the pump that read them to the simulation using them (applied) and
+        # to the flip that showed the result (presented)
+        self.input_applied_times = deque(maxlen=max_samples)
+        self.input_presented_times = deque(maxlen=max_samples)
+        self.pending_inputs = []
+        self.applied_inputs = []
+        self.font = None
         
     def update(self):
-        current_time = time.time()
+        current_time = time.perf_counter()
         frame_time = current_time - self.last_frame_time
         self.frame_times.append(frame_time)
         self.last_frame_time = current_time
+
+    def start_work(self):
+        self.work_start = time.perf_counter()
+
+    def end_draw(self):
+        if self.work_start is not None:
+            self.draw_times.append(time.perf_counter() - self.work_start)
+
+    def end_work(self):
+        if self.work_start is not None:
+            self.work_times.append(time.perf_counter() - self.work_start)
+            self.work_start = None
         
+    def input_pumped(self, events, key_players):
+        # key_players maps each control key to the index of its player
+        now = time.perf_counter()
+        for event in events:
+            if event.type in INPUT_EVENTS:
+                player = key_players.get(event.key)
+                if player is not None:
+                    self.pending_inputs.append((player, now))
+
+    def input_applied(self, players):
+        # `players` is a bitmask of the players whose movement the input
+        # changed; events for anyone else had no effect and are dropped
+        if not self.pending_inputs:
+            return
+        now = time.perf_counter()
+        for player, pumped in self.pending_inputs:
+            if players >> player & 1:
+                self.applied_inputs.append((pumped, now))
+        self.pending_inputs.clear()
+
+    def frame_presented(self):
+        if self.applied_inputs:
+            now = time.perf_counter()
+            for pumped, applied in self.applied_inputs:
+                self.input_applied_times.append(applied - pumped)
+                self.input_presented_times.append(now - pumped)
+            self.applied_inputs.clear()
+        # Input a frame did not use (menus, pause) is never attributed later
+        self.pending_inputs.clear()
+
     def get_fps(self):
         if not self.frame_times:
             return 0
@@ -25,13 +84,40 @@ class PerformanceMonitor:
         if not self.frame_times:
             return 0
         return (sum(self.frame_times) / len(self.frame_times)) * 1000
+
+    def get_jitter_ms(self):
+        # Standard deviation of the frame interval; even pacing keeps it near zero
+        count = len(self.frame_times)
+        if count < 2:
+            return 0
+        mean = sum(self.frame_times) / count
+        variance = sum((t - mean) ** 2 for t in self.frame_times) / count
+        return math.sqrt(variance) * 1000
+
+    def get_percentile_ms(self, percentile, samples=None):
+        samples = self.work_times if samples is None else samples
+        if not samples:
+            return 0
+        # Nearest-rank percentile
+        ordered = sorted(samples)
+        index = max(0, math.ceil(len(ordered) * percentile / 100.0) - 1)
+        return ordered[index] * 1000
         
     def draw_stats(self, screen, x=10, y=10):
+        if self.font is None:
+            self.font = get_font(24)
         fps = self.get_fps()
         frame_time = self.get_frame_time_ms()
         
         fps_text = self.font.render(f"FPS: {fps:.1f}", True, (255, 255, 255))
         frame_time_text = self.font.render(f"Frame: {frame_time:.1f}ms", True, (255, 255, 255))
+        jitter_text = self.font.render(f"Jitter: {self.get_jitter_ms():.2f}ms", True, (255, 255, 255))
+        presented = self.input_presented_times
+        input_text = self.font.render(f"Input: {self.get_percentile_ms(50, presented):.1f}ms "
+                                      f"(p95 {self.get_percentile_ms(95, presented):.1f}ms)",
+                                      True, (255, 255, 255))
         
         screen.blit(fps_text, (x, y))
-        screen.blit(frame_time_text, (x, y + 25))
\ No newline at end of file
+        screen.blit(frame_time_text, (x, y + 25))
+        screen.blit(jitter_text, (x, y + 50))
+        screen.blit(input_text, (x, y + 75))
@@ -1,41 +1,181 @@
 import pygame
 from .constants import *
 
+def wave_offset(frame, amplitude, period, phase):
+    # Triangle wave in whole pixels, so the position on any frame can be
+    # computed directly (and exactly the same way by the batch simulator)
+    half = period // 2
+    step = (frame + phase) % period
+    if step > half:
+        step = period - step
+    return (2 * step - half) * amplitude // half
+
 class Platform:
+    """A platform's position and state as plain numbers.
+
+    (x, y) is the top-left corner where the platform is now and (home_x,
+    home_y) where it was generated; they only differ for moving platforms,
+    which swing around home. `width` is the generated width, which may be
+    fractional; big-platform power-ups widen what is drawn and landed on
+    without changing it. `rect` builds a pygame.Rect on demand.
+    """
+
+    __slots__ = ("x", "y", "width", "home_x", "home_y", "type", "axis", "amplitude",
+                 "period", "phase", "crumble_timer", "crumbled")
+
     def __init__(self, x, y, width, platform_type="normal"):
-        self.rect = pygame.Rect(x, y, width, PLATFORM_HEIGHT)
-        self.y = y
+        self.x = self.home_x = x
+        self.y = self.home_y = y
+        self.width = width
         self.type = platform_type
-        self.original_width = width
+        self.axis = None
+        self.amplitude = 0
+        self.period = 0
+        self.phase = 0
+        # Frames left before a crumbling platform gives way, -1 until stood on
+        self.crumble_timer = -1
+        self.crumbled = False
+
+    @property
+    def rect(self):
+        return pygame.Rect(round(self.x), round(self.y), round(self.width), PLATFORM_HEIGHT)
+
+    def set_motion(self, axis, amplitude, period, phase):
+        self.axis = axis
+        self.amplitude = amplitude
+        self.period = period
+        self.phase = phase
+
+    def move_to(self, frame):
+        offset = wave_offset(frame, self.amplitude, self.period, self.phase)
+        if self.axis == "x":
+            self.x = self.home_x + offset
+        else:
+            self.y = self.home_y + offset
+
+    @property
+    def reach(self):
+        # Widest the platform is ever drawn, which the collision grid files
+        return max(self.width, self.get_display_width(True))
 
     def get_display_width(self, big_platforms_active):
         if big_platforms_active and self.type == "normal":
-            return min(self.original_width * 1.5, PLATFORM_WIDTH)
-        return self.original_width
+            return min(self.width * 1.5, PLATFORM_WIDTH)
+        return self.width
 
-    def draw(self, screen, camera_y, big_platforms_active=False):
+    def draw(self, screen, camera_y, big_platforms_active=False, detailed=True):
         width = self.get_display_width(big_platforms_active)
         
+        if self.crumbled:
+            return
         if self.type == "special":
             color = YELLOW
+        elif self.type == "moving":
+            color = BLUE
+        elif self.type == "crumbling":
+            color = GRAY
         elif width < 100:
             color = RED
         elif width < 150:
             color = ORANGE
         else:
             color = GREEN
-            
-        self.rect.width = width
-        
-        pygame.draw.rect(screen, color,
-                         pygame.Rect(self.rect.x,
-                                     self.rect.y - camera_y,
-                                     width,
-                                     self.rect.height))
+
+        # Crumbling platforms shake while they give way
+        shake = (self.crumble_timer % 4) - 2 if self.crumble_timer > 0 else 0
+        x = round(self.x)
+        y = round(self.y - camera_y)
+        pygame.draw.rect(screen, color, (x + shake, y, width, PLATFORM_HEIGHT))
         
-        if self.type == "special":
+        if self.type == "special" and detailed:
             pygame.draw.rect(screen, WHITE,
-                           pygame.Rect(self.rect.x + 2,
-                                      self.rect.y - camera_y + 2,
-                                      width - 4,
-                                      self.rect.height - 4), 2)
\ No newline at end of file
+                           (x + 2, y + 2, width - 4, PLATFORM_HEIGHT - 4), 2)
+
+class PlatformScheduler:
+    """Ticks only the platforms that are animating near the camera.
+
+    Moving platforms are kept in generation order, which is also height
+    order, and the ones inside the wake band are a contiguous run found by
+    two indexes that shift as the camera does. Platforms outside the band
+    sleep and cost nothing; since a moving platform's position is a function
+    of the frame number, one that wakes up simply jumps to where it should
+    be. Crumbling platforms join once stood on and leave when they give way.
+    """
+
+    def __init__(self):
+        self.movers = []
+        self.crumbling = []
+        self.low = 0
+        self.high = 0
+
+    def reset(self, platforms):
+        self.movers = [platform for platform in platforms if platform.axis]
+        self.crumbling = [platform for platform in platforms
+                          if platform.crumble_timer > 0 and not platform.crumbled]
+        self.low = 0
+        self.high = 0
+
+    def add(self, platform):
+        if platform.axis:
+            self.movers.append(platform)
+
+    def trigger(self, platform):
+        if platform.type == "crumbling" and platform.crumble_timer < 0:
+            platform.crumble_timer = CRUMBLE_FRAMES
+            self.crumbling.append(platform)
+
+    def cull(self, bottom):
+        # Drops what the game culled: everything whose home is below `bottom`
+        movers = self.movers
+        culled = 0
+        for platform in movers:
+            if platform.home_y < bottom:
+                break
+            culled += 1
+        if culled:
+            del movers[:culled]
+            self.low = max(0, self.low - culled)
+            self.high = max(0, self.high - culled)
+        if self.crumbling:
+            self.crumbling = [platform for platform in self.crumbling if platform.home_y < bottom]
+
+    def tick(self, frame, top, bottom, grid):
+        """Advance the platforms woken by the band from `top` to `bottom`.
+
+        Returns the platforms that crumbled away this frame.
+        """
+        movers = self.movers
+        count = len(movers)
+        low = self.low
+        # Heights fall along the list; the band starts at the first
+        # platform above `bottom` and ends before the first above `top`
+        while low < count and movers[low].home_y > bottom:
+            low += 1
+        while low > 0 and movers[low - 1].home_y <= bottom:
+            low -= 1
+        high = max(self.high, low)
+        while high < count and movers[high].home_y >= top:
+            high += 1
+        while high > low and movers[high - 1].home_y < top:
+            high -= 1
+        self.low = low
+        self.high = high
+
+        for index in range(low, high):
+            platform = movers[index]
+            platform.move_to(frame)
+            grid.move(platform, platform.x, platform.y, platform.x + platform.reach, platform.y)
+
+        fallen = None
+        if self.crumbling:
+            for platform in self.crumbling:
+                platform.crumble_timer -= 1
+                if platform.crumble_timer == 0:
+                    platform.crumbled = True
+                    grid.remove(platform)
+                    if fallen is None:
+                        fallen = []
+                    fallen.append(platform)
+            if fallen:
+                self.crumbling = [platform for platform in self.crumbling if not platform.crumbled]
+        return fallen
@@ -1,25 +1,101 @@
 import pygame
+from collections import deque
 from .constants import *
+from .effects import StatusEffects
+
+TRAIL_LENGTH = 5
+
+# Trail squares only differ by alpha, so they are built once and reused
+_trail_surfaces = {}
+
+def _trail_surface(alpha):
+    surface = _trail_surfaces.get(alpha)
+    if surface is None:
+        surface = pygame.Surface((5, 5))
+        surface.set_alpha(alpha)
+        surface.fill(CYAN)
+        _trail_surfaces[alpha] = surface
+    return surface
 
 class Player:
+    """Player physics state as plain floats.
+
+    The position is the top-left corner in world pixels and is never
+    rounded during the simulation; `rect` builds a pygame.Rect from it for
+    drawing and for callers that want one. __slots__ keeps the attribute
+    reads in the per-frame loops to plain slot lookups.
+    """
+
+    __slots__ = ("x", "y", "vel_x", "vel_y", "fall_start_y", "is_falling", "alive",
+                 "color", "double_jumps_left", "effects", "trail_positions", "recorder")
+
     def __init__(self, x, y):
-        self.rect = pygame.Rect(x, y, 40, 40)
+        self.x = x
+        self.y = y
         self.vel_x = 0
         self.vel_y = 0
-        self.y = y
         self.fall_start_y = y
         self.is_falling = False
+        # Cleared when the player drops out of a multiplayer game
+        self.alive = True
+        self.color = WHITE
         
         # Power-up states
         self.double_jumps_left = 0
-        self.big_platforms_timer = 0
-        self.slow_motion_timer = 0
+        self.effects = StatusEffects()
         
         # Visual effects
-        self.trail_positions = []
+        self.trail_positions = deque(maxlen=TRAIL_LENGTH)
+        # Receives the position every frame for ghost replays
+        self.recorder = None
+
+    @property
+    def rect(self):
+        return pygame.Rect(round(self.x), round(self.y), PLAYER_SIZE, PLAYER_SIZE)
+
+    # Frames left on each timed power-up, kept by self.effects
+    @property
+    def big_platforms_timer(self):
+        return self.effects.remaining(POWERUP_BIG_PLATFORMS)
+
+    @big_platforms_timer.setter
+    def big_platforms_timer(self, frames):
+        self.effects.start(POWERUP_BIG_PLATFORMS, frames)
+
+    @property
+    def slow_motion_timer(self):
+        return self.effects.remaining(POWERUP_SLOW_MOTION)
+
+    @slow_motion_timer.setter
+    def slow_motion_timer(self, frames):
+        self.effects.start(POWERUP_SLOW_MOTION, frames)
+
+    @property
+    def shield_timer(self):
+        return self.effects.remaining(POWERUP_SHIELD)
+
+    @shield_timer.setter
+    def shield_timer(self, frames):
+        self.effects.start(POWERUP_SHIELD, frames)
+
+    @property
+    def magnet_timer(self):
+        return self.effects.remaining(POWERUP_MAGNET)
+
+    @magnet_timer.setter
+    def magnet_timer(self, frames):
+        self.effects.start(POWERUP_MAGNET, frames)
+
+    @property
+    def super_jump_timer(self):
+        return self.effects.remaining(POWERUP_SUPER_JUMP)
+
+    @super_jump_timer.setter
+    def super_jump_timer(self, frames):
+        self.effects.start(POWERUP_SUPER_JUMP, frames)
 
     def update(self):
-        gravity_multiplier = 0.5 if self.slow_motion_timer > 0 else 1.0
+        gravity_multiplier = 0.5 if POWERUP_SLOW_MOTION in self.effects.active else 1.0
         self.vel_y += GRAVITY * gravity_multiplier
 
         max_fall = MAX_FALL_SPEED * gravity_multiplier
@@ -33,52 +109,62 @@ class Player:
         else:
             self.is_falling = False
 
-        self.rect.x += self.vel_x * gravity_multiplier
+        self.x += self.vel_x * gravity_multiplier
         self.y += self.vel_y
-        self.rect.y = self.y
 
         # Screen wrapping
-        if self.rect.right < 0:
-            self.rect.left = SCREEN_WIDTH
-        elif self.rect.left > SCREEN_WIDTH:
-            self.rect.right = 0
+        if self.x + PLAYER_SIZE < 0:
+            self.x = SCREEN_WIDTH
+        elif self.x > SCREEN_WIDTH:
+            self.x = -PLAYER_SIZE
             
         # Update power-up timers
-        if self.big_platforms_timer > 0:
-            self.big_platforms_timer -= 1
-        if self.slow_motion_timer > 0:
-            self.slow_motion_timer -= 1
+        self.effects.advance()
             
         # Update trail
-        self.trail_positions.append((self.rect.centerx, self.rect.centery))
-        if len(self.trail_positions) > 5:
-            self.trail_positions.pop(0)
+        x = round(self.x)
+        y = round(self.y)
+        self.trail_positions.append((x + PLAYER_SIZE // 2, y + PLAYER_SIZE // 2))
+        if self.recorder is not None:
+            self.recorder.record(x, y)
+
+    def bounce_speed(self):
+        # Vertical speed given by landing on a platform
+        if POWERUP_SUPER_JUMP in self.effects.active:
+            return JUMP_SPEED * SUPER_JUMP_BOOST
+        return JUMP_SPEED
 
     def jump(self):
         if self.vel_y > 0 and self.double_jumps_left > 0:
             self.vel_y = JUMP_SPEED * 0.8
             self.double_jumps_left -= 1
+            return True
+        return False
 
-    def draw(self, screen, camera_y):
+    def draw(self, screen, camera_y, show_trail=True):
         # Draw trail
-        for i, (x, y) in enumerate(self.trail_positions):
-            alpha = int(255 * (i + 1) / len(self.trail_positions) * 0.3)
-            trail_surface = pygame.Surface((5, 5))
-            trail_surface.set_alpha(alpha)
-            trail_surface.fill(CYAN)
-            screen.blit(trail_surface, (x - 2, y - camera_y - 2))
+        if show_trail:
+            for i, (x, y) in enumerate(self.trail_positions):
+                alpha = int(255 * (i + 1) / len(self.trail_positions) * 0.3)
+                screen.blit(_trail_surface(alpha), (x - 2, y - camera_y - 2))
         
         # Draw player with power-up effects
-        player_color = WHITE
-        if self.slow_motion_timer > 0:
+        player_color = self.color
+        active = self.effects.active
+        if POWERUP_SLOW_MOTION in active:
             player_color = PURPLE
-        elif self.big_platforms_timer > 0:
+        elif POWERUP_BIG_PLATFORMS in active:
             player_color = ORANGE
         elif self.double_jumps_left > 0:
             player_color = BLUE
+        elif POWERUP_SUPER_JUMP in active:
+            player_color = YELLOW
+        elif POWERUP_MAGNET in active:
+            player_color = RED
             
-        pygame.draw.rect(screen, player_color,
-                         pygame.Rect(self.rect.x,
-                                     self.rect.y - camera_y,
-                                     self.rect.width,
-                                     self.rect.height))
\ No newline at end of file
+        x = round(self.x)
+        y = round(self.y - camera_y)
+        pygame.draw.rect(screen, player_color, (x, y, PLAYER_SIZE, PLAYER_SIZE))
+        if POWERUP_SHIELD in active:
+            pygame.draw.circle(screen, CYAN,
+                               (x + PLAYER_SIZE // 2, y + PLAYER_SIZE // 2), 30, 2)
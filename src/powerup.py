@@ -1,24 +1,35 @@
 import pygame
 from .constants import *
+from .fonts import get_font
+
+_slow_motion_label = None
 
 class PowerUp:
+    __slots__ = ("x", "y", "type", "color")
+
     def __init__(self, x, y, powerup_type):
-        self.rect = pygame.Rect(x, y, 30, 30)
+        self.x = x
+        self.y = y
         self.type = powerup_type
         self.color = {
             POWERUP_DOUBLE_JUMP: BLUE,
             POWERUP_BIG_PLATFORMS: ORANGE,
-            POWERUP_SLOW_MOTION: PURPLE
+            POWERUP_SLOW_MOTION: PURPLE,
+            POWERUP_SHIELD: CYAN,
+            POWERUP_MAGNET: RED,
+            POWERUP_SUPER_JUMP: YELLOW
         }[powerup_type]
+
+    @property
+    def rect(self):
+        return pygame.Rect(round(self.x), round(self.y), POWERUP_SIZE, POWERUP_SIZE)
         
     def draw(self, screen, camera_y):
-        pygame.draw.rect(screen, self.color,
-                         pygame.Rect(self.rect.x,
-                                     self.rect.y - camera_y,
-                                     self.rect.width,
-                                     self.rect.height))
-        center_x = self.rect.x + self.rect.width // 2
-        center_y = self.rect.y - camera_y + self.rect.height // 2
+        x = round(self.x)
+        y = round(self.y - camera_y)
+        pygame.draw.rect(screen, self.color, (x, y, POWERUP_SIZE, POWERUP_SIZE))
+        center_x = x + POWERUP_SIZE // 2
+        center_y = y + POWERUP_SIZE // 2
         
         if self.type == POWERUP_DOUBLE_JUMP:
             pygame.draw.circle(screen, WHITE, (center_x, center_y - 5), 5)
@@ -26,6 +37,17 @@ class PowerUp:
         elif self.type == POWERUP_BIG_PLATFORMS:
             pygame.draw.rect(screen, WHITE, (center_x - 8, center_y - 3, 16, 6))
         elif self.type == POWERUP_SLOW_MOTION:
-            font = pygame.font.Font(None, 20)
-            text = font.render("S", True, WHITE)
-            screen.blit(text, (center_x - 5, center_y - 8))
\ No newline at end of file
+            global _slow_motion_label
+            if _slow_motion_label is None:
+                _slow_motion_label = get_font(20).render("S", True, WHITE)
+            screen.blit(_slow_motion_label, (center_x - 5, center_y - 8))
+        elif self.type == POWERUP_SHIELD:
+            pygame.draw.circle(screen, WHITE, (center_x, center_y), 9, 2)
+        elif self.type == POWERUP_MAGNET:
+            pygame.draw.rect(screen, WHITE, (center_x - 8, center_y - 8, 4, 14))
+            pygame.draw.rect(screen, WHITE, (center_x + 4, center_y - 8, 4, 14))
+            pygame.draw.rect(screen, WHITE, (center_x - 8, center_y + 4, 16, 4))
+        elif self.type == POWERUP_SUPER_JUMP:
+            pygame.draw.polygon(screen, BLACK, ((center_x, center_y - 9),
+                                                (center_x - 8, center_y + 6),
+                                                (center_x + 8, center_y + 6)))
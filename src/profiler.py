@@ -0,0 +1,158 @@
+import marshal
+import os
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import datetime
+
+# Seconds between stack samples
+SAMPLE_INTERVAL = 0.005
+# Length of a session started without one
+DEFAULT_DURATION = 10.0
+
+def _label(code):
+    name = getattr(code, "co_qualname", code.co_name)
+    return f"{os.path.basename(code.co_filename)}:{name}"
+
+class SamplingProfiler:
+    """Samples one thread's Python stack from a background thread.
+
+    A session reads the target thread's current frame every `interval`
+    seconds for a fixed duration and counts each distinct stack, so the
+    profiled code runs untouched (unlike cProfile, which hooks every call)
+    and the cost is a stack walk a few hundred times a second. The thread
+    being profiled names what it is doing in `phase`; each sample is
+    filed under the phase that was set when it was taken.
+
+    When a session ends the stacks are written as collapsed text (one
+    "phase;outer;...;inner count" line per stack, the input flamegraph.pl
+    and speedscope take), plus optionally a pstats file built from the
+    same samples, where times are sample counts times the interval.
+    """
+
+    def __init__(self, interval=SAMPLE_INTERVAL, output_dir="profiles", pstats=False):
+        self.interval = interval
+        self.output_dir = output_dir
+        self.pstats = pstats
+        self.phase = "idle"
+        self.samples = Counter()
+        self.elapsed = 0.0
+        # Files written by the last session
+        self.paths = []
+        self.thread_id = None
+        self.thread = None
+        self.stopping = threading.Event()
+
+    @property
+    def running(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    def start(self, duration=DEFAULT_DURATION, thread_id=None):
+        """Profile the calling thread (or `thread_id`) for `duration` seconds."""
+        if self.running:
+            return False
+        self.thread_id = thread_id or threading.get_ident()
+        self.samples = Counter()
+        self.stopping.clear()
+        self.thread = threading.Thread(target=self.sample, args=(duration,),
+                                       name="profiler", daemon=True)
+        self.thread.start()
+        return True
+
+    def stop(self):
+        """End the session early and wait for its files to be written."""
+        if self.thread is None:
+            return
+        self.stopping.set()
+        self.thread.join()
+        self.thread = None
+
+    def sample(self, duration):
+        current_frames = sys._current_frames
+        target = self.thread_id
+        samples = self.samples
+        interval = self.interval
+        start = time.perf_counter()
+        end = start + duration
+        next_sample = start
+        while not self.stopping.is_set():
+            frame = current_frames().get(target)
+            if frame is None:
+                # The profiled thread has exited
+                break
+            stack = []
+            while frame is not None:
+                stack.append(frame.f_code)
+                frame = frame.f_back
+            samples[(self.phase, tuple(stack))] += 1
+            next_sample += interval
+            now = time.perf_counter()
+            if now >= end:
+                break
+            self.stopping.wait(max(0.0, next_sample - now))
+        self.elapsed = time.perf_counter() - start
+        self.write()
+
+    def write(self):
+        self.paths = []
+        if not self.samples:
+            return
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            base = os.path.join(self.output_dir,
+                                f"profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+            path = base + ".collapsed"
+            with open(path, "w") as f:
+                f.write(self.collapsed())
+            self.paths.append(path)
+            if self.pstats:
+                path = base + ".prof"
+                with open(path, "wb") as f:
+                    marshal.dump(self.stats(), f)
+                self.paths.append(path)
+        except OSError:
+            pass
+        else:
+            print(self.format_report())
+
+    def collapsed(self):
+        stacks = Counter()
+        for (phase, stack), count in self.samples.items():
+            stacks[";".join([phase] + [_label(code) for code in reversed(stack)])] += count
+        return "".join(f"{stack} {count}\n" for stack, count in sorted(stacks.items()))
+
+    def stats(self):
+        """The samples in the dict layout pstats.Stats loads (see cProfile)."""
+        totals = defaultdict(lambda: [0, 0])
+        callers = defaultdict(Counter)
+        for (_, stack), count in self.samples.items():
+            keys = [(code.co_filename, code.co_firstlineno, code.co_name) for code in stack]
+            totals[keys[0]][0] += count
+            # Recursive functions are counted once per sample
+            for key in set(keys):
+                totals[key][1] += count
+            for callee, caller in zip(keys, keys[1:]):
+                callers[callee][caller] += count
+        interval = self.interval
+        stats = {}
+        for key, (own, inclusive) in totals.items():
+            stats[key] = (inclusive, inclusive, own * interval, inclusive * interval,
+                          {caller: (count, count, 0.0, count * interval)
+                           for caller, count in callers[key].items()})
+        return stats
+
+    def phase_shares(self):
+        phases = Counter()
+        for (phase, _), count in self.samples.items():
+            phases[phase] += count
+        total = sum(phases.values()) or 1
+        return [(phase, count / total) for phase, count in phases.most_common()]
+
+    def format_report(self):
+        total = sum(self.samples.values())
+        rate = total / self.elapsed if self.elapsed else 0
+        lines = [f"Profiled {total} samples over {self.elapsed:.1f}s ({rate:.0f}/s)"]
+        lines.append("  " + ", ".join(f"{phase} {share:.0%}" for phase, share in self.phase_shares()))
+        lines.extend(f"  wrote {path}" for path in self.paths)
+        return "\n".join(lines)
@@ -0,0 +1,101 @@
+class QualityLevel:
+    def __init__(self, name, particle_density, trail, platform_borders, hud_interval,
+                 background_layers):
+        self.name = name
+        self.particle_density = particle_density
+        self.trail = trail
+        self.platform_borders = platform_borders
+        # Frames between HUD text refreshes
+        self.hud_interval = hud_interval
+        # Parallax layers drawn, furthest first; 0 is a plain black fill
+        self.background_layers = background_layers
+
+# Ordered from full detail to the cheapest presentation
+QUALITY_LEVELS = [
+    QualityLevel("high", 1.0, True, True, 1, 3),
+    QualityLevel("medium", 0.6, True, True, 4, 2),
+    QualityLevel("low", 0.3, False, True, 10, 1),
+    QualityLevel("minimal", 0.0, False, False, 30, 0),
+]
+
+class QualityGovernor:
+    """Sheds visual load when frames run over budget.
+
+    Fed with the work time of each frame from a PerformanceMonitor, it steps
+    down one level while the rolling p95 is over budget and steps back up
+    once there is clear headroom. Each change is followed by a cooldown so
+    the window only judges frames rendered at the new level, and restoring
+    needs a longer streak than degrading so the level does not oscillate.
+    Simulation is never touched, only what gets drawn.
+    """
+
+    def __init__(self, budget_ms=1000 / 60, percentile=95, headroom=0.7,
+                 degrade_after=30, restore_after=240, cooldown_frames=120, enabled=True):
+        self.budget_ms = budget_ms
+        self.percentile = percentile
+        self.headroom = headroom
+        self.degrade_after = degrade_after
+        self.restore_after = restore_after
+        # Should cover the monitor's sample window
+        self.cooldown_frames = cooldown_frames
+        self.enabled = enabled
+        self.level_index = 0
+        self.cooldown = 0
+        self.over_budget = 0
+        self.under_budget = 0
+        self.last_p95 = 0
+
+    @property
+    def level(self):
+        return QUALITY_LEVELS[self.level_index]
+
+    @property
+    def particle_density(self):
+        return self.level.particle_density
+
+    @property
+    def trail(self):
+        return self.level.trail
+
+    @property
+    def platform_borders(self):
+        return self.level.platform_borders
+
+    @property
+    def hud_interval(self):
+        return self.level.hud_interval
+
+    @property
+    def background_layers(self):
+        return self.level.background_layers
+
+    def set_level(self, index):
+        index = max(0, min(index, len(QUALITY_LEVELS) - 1))
+        if index != self.level_index:
+            self.level_index = index
+            self.cooldown = self.cooldown_frames
+        self.over_budget = 0
+        self.under_budget = 0
+
+    def update(self, monitor):
+        if not self.enabled:
+            return self.level
+        if self.cooldown > 0:
+            self.cooldown -= 1
+            return self.level
+
+        self.last_p95 = p95 = monitor.get_percentile_ms(self.percentile)
+        if p95 > self.budget_ms:
+            self.over_budget += 1
+            self.under_budget = 0
+            if self.over_budget >= self.degrade_after:
+                self.set_level(self.level_index + 1)
+        elif p95 < self.budget_ms * self.headroom:
+            self.under_budget += 1
+            self.over_budget = 0
+            if self.under_budget >= self.restore_after:
+                self.set_level(self.level_index - 1)
+        else:
+            self.over_budget = 0
+            self.under_budget = 0
+        return self.level
@@ -0,0 +1,138 @@
+import math
+from .constants import *
+
+# Pixels of height given up so float drift and Rect truncation in the real
+# simulation can never make a "reachable" platform miss by one frame
+HEIGHT_MARGIN = 1
+# Player.update teleports from left < -40 to 800 and from left > 800 to -40
+WRAP_PERIOD = SCREEN_WIDTH + PLAYER_SIZE + 1
+
+def apex_frame(jump_speed, gravity):
+    # Last frame on which the player is still rising
+    return math.ceil(-jump_speed / gravity) - 1
+
+def height_after(frames, jump_speed, gravity, fall_cap):
+    """Height above take-off after `frames` updates of a bounce.
+
+    Player.update adds gravity before moving, so after n frames the player
+    has risen -(n * v0 + g * n * (n + 1) / 2), until the fall speed cap is
+    reached, after which the descent is linear.
+    """
+    cap_frame = math.ceil((fall_cap - jump_speed) / gravity)
+    if frames < cap_frame:
+        return -(frames * jump_speed + gravity * frames * (frames + 1) / 2)
+    capped = cap_frame - 1
+    return (-(capped * jump_speed + gravity * capped * (capped + 1) / 2) -
+            (frames - capped) * fall_cap)
+
+def landing_frame(gap, jump_speed, gravity, fall_cap):
+    """First frame on the way down at which the feet reach `gap` above take-off.
+
+    Solves g/2 n^2 + (v0 + g/2) n + gap = 0 for the larger root, falling
+    back to the linear capped descent once the cap frame is passed. Returns
+    None if the apex is lower than `gap`.
+    """
+    apex = height_after(apex_frame(jump_speed, gravity), jump_speed, gravity, fall_cap)
+    if gap > apex:
+        return None
+    b = jump_speed + gravity / 2
+    root = (-b + math.sqrt(b * b - 2 * gravity * gap)) / gravity
+    # The epsilon keeps exact integer roots from rounding up a frame
+    frames = math.ceil(root - 1e-9)
+    cap_frame = math.ceil((fall_cap - jump_speed) / gravity)
+    if frames >= cap_frame:
+        capped = cap_frame - 1
+        above = height_after(capped, jump_speed, gravity, fall_cap) - gap
+        frames = capped + math.ceil(above / fall_cap - 1e-9)
+    return frames
+
+class ReachTable:
+    """Horizontal reach of a bounce for every integer vertical gap.
+
+    reach[gap] is how far the player can travel sideways while bouncing up
+    to (or dropping down to) a platform `gap` pixels above the take-off
+    platform. Gaps run from the deepest drop that stays within
+    MAX_FALL_DISTANCE of the apex up to HEIGHT_MARGIN below the apex.
+    """
+
+    def __init__(self, jump_speed=JUMP_SPEED, gravity=GRAVITY, move_speed=MOVE_SPEED,
+                 fall_cap=MAX_FALL_SPEED, max_fall=MAX_FALL_DISTANCE, margin=HEIGHT_MARGIN):
+        self.apex = height_after(apex_frame(jump_speed, gravity), jump_speed, gravity, fall_cap)
+        self.max_gap = int(math.floor(self.apex - margin))
+        self.min_gap = int(math.ceil(self.apex - max_fall))
+        self.reach = []
+        for gap in range(self.min_gap, self.max_gap + 1):
+            frames = landing_frame(gap + margin, jump_speed, gravity, fall_cap)
+            self.reach.append(frames * move_speed)
+
+    def get(self, gap):
+        if gap < self.min_gap or gap > self.max_gap:
+            return -1
+        return self.reach[gap - self.min_gap]
+
+NORMAL = ReachTable()
+# Slow motion halves gravity, the fall cap and sideways speed
+SLOW_MOTION = ReachTable(gravity=GRAVITY * 0.5, move_speed=MOVE_SPEED * 0.5,
+                         fall_cap=MAX_FALL_SPEED * 0.5)
+
+def safe_reach(gap):
+    # A platform must be reachable whether or not slow motion is running
+    normal = NORMAL.get(gap)
+    slow = SLOW_MOTION.get(gap)
+    if normal < 0 or slow < 0:
+        return -1
+    return min(normal, slow)
+
+# Lookup for generation, covering every gap either table knows about
+_SAFE_MIN = min(NORMAL.min_gap, SLOW_MOTION.min_gap)
+_SAFE_MAX = max(NORMAL.max_gap, SLOW_MOTION.max_gap)
+SAFE_REACH = [safe_reach(gap) for gap in range(_SAFE_MIN, _SAFE_MAX + 1)]
+
+def max_reach(gap):
+    """Sideways distance that is reachable for a platform `gap` pixels higher, or -1."""
+    if gap < _SAFE_MIN or gap > _SAFE_MAX:
+        return -1
+    return SAFE_REACH[gap - _SAFE_MIN]
+
+def horizontal_gap(from_x, from_width, to_x, to_width):
+    # Sideways distance the player must cover between standing anywhere on
+    # one platform and overlapping the other, the short way round the wrap
+    stand_left = from_x - PLAYER_SIZE
+    stand_right = from_x + from_width
+    best = None
+    for shift in (-WRAP_PERIOD, 0, WRAP_PERIOD):
+        land_left = to_x + shift - PLAYER_SIZE
+        land_right = to_x + shift + to_width
+        gap = max(0, land_left - stand_right, stand_left - land_right)
+        if best is None or gap < best:
+            best = gap
+    return best
+
+def is_reachable(from_x, from_y, from_width, to_x, to_y, to_width):
+    reach = max_reach(int(from_y - to_y))
+    return reach >= 0 and horizontal_gap(from_x, from_width, to_x, to_width) <= reach
+
+def reachable_range(from_x, from_y, from_width, to_y, to_width):
+    """Leftmost and rightmost on-screen x for a reachable platform, or None."""
+    reach = max_reach(int(from_y - to_y))
+    if reach < 0:
+        return None
+    low = max(0, from_x - PLAYER_SIZE - to_width - reach)
+    high = min(SCREEN_WIDTH - to_width, from_x + from_width + PLAYER_SIZE + reach)
+    if low > high:
+        return None
+    return low, high
+
+def validate_level(platforms):
+    """Return the indexes of platforms that cannot be reached from the one before.
+
+    `platforms` is any sequence of (x, y, width) in climbing order, such as
+    a pregenerated level.
+    """
+    unreachable = []
+    for i in range(1, len(platforms)):
+        from_x, from_y, from_width = platforms[i - 1]
+        to_x, to_y, to_width = platforms[i]
+        if not is_reachable(from_x, from_y, from_width, to_x, to_y, to_width):
+            unreachable.append(i)
+    return unreachable
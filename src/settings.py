@@ -1,11 +1,12 @@
 import pygame
 from .constants import *
+from .fonts import get_font
 
 class Settings:
     def __init__(self, screen):
         self.screen = screen
-        self.font = pygame.font.Font(None, 36)
-        self.small_font = pygame.font.Font(None, 24)
+        self.font = get_font(36)
+        self.small_font = get_font(24)
         self.selected = 0
         self.options = ["Music Volume", "SFX Volume", "Back"]
         self.music_volume = 70
@@ -59,6 +60,4 @@ class Settings:
         # Instructions
         inst_text = self.small_font.render("Use Left/Right arrows to adjust, Enter to select", True, GRAY)
         inst_rect = inst_text.get_rect(center=(SCREEN_WIDTH//2, 450))
-        self.screen.blit(inst_text, inst_rect)
-        
-        pygame.display.flip()
\ No newline at end of file
+        self.screen.blit(inst_text, inst_rect)
\ No newline at end of file
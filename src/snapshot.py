@@ -0,0 +1,212 @@
+import struct
+from array import array
+from .constants import *
+from .platform import Platform
+from .powerup import PowerUp
+from .particles import Particle
+from .player import Player
+
+MAGIC = b"EJSN"
+FORMAT_VERSION = 7
+
+PLATFORM_TYPES = ("normal", "special", "moving", "crumbling")
+AXES = (None, "x", "y")
+POWERUP_TYPES = (POWERUP_DOUBLE_JUMP, POWERUP_BIG_PLATFORMS, POWERUP_SLOW_MOTION,
+                 POWERUP_SHIELD, POWERUP_MAGNET, POWERUP_SUPER_JUMP)
+
+# All records are little-endian with fixed sizes, so a snapshot is a header,
+# the fixed game record, a counted run of players, then three counted runs.
+# Each player is followed by its running effects, as frames left and the
+# UTF-8 name, then its trail. After the players comes the ghost track
+# recorded so far, so a rollback also takes back the frames it undoes.
+HEADER = struct.Struct("<4sH")
+GAME = struct.Struct("<ddddqqIIIBBBB")
+RECORDER = struct.Struct("<IiiiiI")
+PLAYER = struct.Struct("<dddddBBBBB")
+EFFECT = struct.Struct("<IB")
+COUNTS = struct.Struct("<III")
+PLATFORM = struct.Struct("<dddddBBiiiiB")
+POWERUP = struct.Struct("<ddB")
+PARTICLE = struct.Struct("<ddddBBBii")
+RNG = struct.Struct("<Bd")
+RNG_WORDS = 625
+
+def snapshot_game(game):
+    """Pack the simulation state of a Game into bytes.
+
+    Covers everything update() reads or writes: players and their status
+    effects, the ghost track being recorded, platforms, power-ups,
+    particles, score and timers, and both RNGs (level and particles). The
+    raced ghost is put back at the restored frame. Presentation caches (HUD
+    text, overlays) are left out and rebuilt.
+    """
+    parts = [
+        HEADER.pack(MAGIC, FORMAT_VERSION),
+        GAME.pack(game.camera_y, game.score, game.highest_point, game.high_score,
+                  game.start_time, -1 if game.end_time is None else game.end_time,
+                  game.total_jumps, game.powerups_collected, game.frame,
+                  game.game_over, game.paused, game.new_record, len(game.players)),
+    ]
+    for player in game.players:
+        effects = player.effects
+        parts.append(PLAYER.pack(player.x, player.y, player.fall_start_y,
+                                 player.vel_x, player.vel_y, player.is_falling,
+                                 player.double_jumps_left, player.alive,
+                                 len(effects.expiry), len(player.trail_positions)))
+        for name in effects.expiry:
+            encoded = name.encode("utf-8")
+            parts.append(EFFECT.pack(effects.remaining(name), len(encoded)))
+            parts.append(encoded)
+        trail = array("i")
+        for x, y in player.trail_positions:
+            trail.append(x)
+            trail.append(y)
+        parts.append(trail.tobytes())
+    recorder = game.recorder
+    parts.append(RECORDER.pack(recorder.frames, recorder.x, recorder.y,
+                               recorder.vx, recorder.vy, len(recorder.buffer)))
+    parts.append(recorder.buffer)
+
+    parts.append(COUNTS.pack(len(game.platforms), len(game.powerups),
+                             len(game.particles.particles)))
+    pack = PLATFORM.pack
+    for platform in game.platforms:
+        parts.append(pack(platform.home_x, platform.home_y, platform.x, platform.y,
+                          platform.width, PLATFORM_TYPES.index(platform.type),
+                          AXES.index(platform.axis), platform.amplitude, platform.period,
+                          platform.phase, platform.crumble_timer, platform.crumbled))
+    pack = POWERUP.pack
+    for powerup in game.powerups:
+        parts.append(pack(powerup.x, powerup.y, POWERUP_TYPES.index(powerup.type)))
+    pack = PARTICLE.pack
+    for particle in game.particles.particles:
+        r, g, b = particle.color
+        parts.append(pack(particle.x, particle.y, particle.vel_x, particle.vel_y,
+                          r, g, b, particle.life, particle.max_life))
+
+    pack_rng(parts, game.rng)
+    pack_rng(parts, game.particles.rng)
+    return b"".join(parts)
+
+def pack_rng(parts, rng):
+    _, words, gauss_next = rng.getstate()
+    parts.append(RNG.pack(gauss_next is not None, gauss_next or 0.0))
+    parts.append(array("I", words).tobytes())
+
+def unpack_rng(data, offset, rng):
+    has_gauss, gauss_next = RNG.unpack_from(data, offset)
+    offset += RNG.size
+    words = array("I")
+    words.frombytes(data[offset:offset + RNG_WORDS * words.itemsize])
+    rng.setstate((3, tuple(words), gauss_next if has_gauss else None))
+    return offset + RNG_WORDS * words.itemsize
+
+def restore_game(game, data):
+    """Load a snapshot made by snapshot_game() into an existing Game."""
+    data = memoryview(data)
+    magic, version = HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ValueError("Not a game snapshot")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported snapshot version: {version}")
+    offset = HEADER.size
+
+    (game.camera_y, game.score, game.highest_point, game.high_score,
+     game.start_time, end_time, game.total_jumps, game.powerups_collected, game.frame,
+     game_over, paused, new_record, player_count) = GAME.unpack_from(data, offset)
+    offset += GAME.size
+    game.end_time = None if end_time < 0 else end_time
+    game.game_over = bool(game_over)
+    game.paused = bool(paused)
+    game.new_record = bool(new_record)
+
+    # Existing players are reused, so the first keeps its ghost recorder
+    players = game.players[:player_count]
+    while len(players) < player_count:
+        players.append(Player(0, 0))
+    for index, player in enumerate(players):
+        (x, y, fall_start_y, vel_x, vel_y, is_falling, double_jumps_left,
+         alive, effect_count, trail_count) = PLAYER.unpack_from(data, offset)
+        offset += PLAYER.size
+        player.x = x
+        player.y = y
+        player.fall_start_y = fall_start_y
+        player.vel_x = vel_x
+        player.vel_y = vel_y
+        player.is_falling = bool(is_falling)
+        player.double_jumps_left = double_jumps_left
+        player.alive = bool(alive)
+        player.effects.clear()
+        for _ in range(effect_count):
+            remaining, length = EFFECT.unpack_from(data, offset)
+            offset += EFFECT.size
+            name = str(data[offset:offset + length], "utf-8")
+            offset += length
+            player.effects.start(name, remaining)
+        player.color = PLAYER_COLORS[index % len(PLAYER_COLORS)]
+        trail = array("i")
+        trail.frombytes(data[offset:offset + trail_count * 2 * trail.itemsize])
+        offset += trail_count * 2 * trail.itemsize
+        player.trail_positions.clear()
+        for i in range(0, len(trail), 2):
+            player.trail_positions.append((trail[i], trail[i + 1]))
+    game.players = players
+    game.player_count = player_count
+    game.player = players[0]
+
+    recorder = game.recorder
+    (recorder.frames, recorder.x, recorder.y, recorder.vx, recorder.vy,
+     length) = RECORDER.unpack_from(data, offset)
+    offset += RECORDER.size
+    recorder.buffer[:] = data[offset:offset + length]
+    offset += length
+    game.player.recorder = recorder
+    # The ghost is advanced once per simulation frame
+    if game.ghost is not None:
+        game.ghost_position = game.ghost.seek(game.frame)
+
+    platform_count, powerup_count, particle_count = COUNTS.unpack_from(data, offset)
+    offset += COUNTS.size
+
+    platforms = []
+    end = offset + platform_count * PLATFORM.size
+    for (home_x, home_y, x, y, width, platform_type, axis, amplitude,
+         period, phase, crumble_timer, crumbled) in PLATFORM.iter_unpack(data[offset:end]):
+        platform = Platform(home_x, home_y, width, PLATFORM_TYPES[platform_type])
+        platform.x = x
+        platform.y = y
+        if axis:
+            platform.set_motion(AXES[axis], amplitude, period, phase)
+        platform.crumble_timer = crumble_timer
+        platform.crumbled = bool(crumbled)
+        platforms.append(platform)
+    game.platforms = platforms
+    offset = end
+
+    powerups = []
+    end = offset + powerup_count * POWERUP.size
+    for x, y, powerup_type in POWERUP.iter_unpack(data[offset:end]):
+        powerups.append(PowerUp(x, y, POWERUP_TYPES[powerup_type]))
+    game.powerups = powerups
+    offset = end
+
+    system = game.particles
+    system.pool.extend(system.particles)
+    system.particles.clear()
+    end = offset + particle_count * PARTICLE.size
+    for x, y, vel_x, vel_y, r, g, b, life, max_life in PARTICLE.iter_unpack(data[offset:end]):
+        if system.pool:
+            particle = system.pool.pop()
+            particle.reset(x, y, vel_x, vel_y, (r, g, b), life)
+        else:
+            particle = Particle(x, y, vel_x, vel_y, (r, g, b), life)
+        particle.max_life = max_life
+        system.particles.append(particle)
+    offset = end
+
+    offset = unpack_rng(data, offset, game.rng)
+    unpack_rng(data, offset, system.rng)
+
+    game.events.clear()
+    # The HUD is rebuilt from the restored counters on the next draw
+    game.hud_age = 0
@@ -0,0 +1,197 @@
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+from collections import Counter
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+import pygame
+from .bot import AutoPlayer
+from .game import Game
+from .logger import setup_logger
+
+def rss_bytes():
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        if resource is None:
+            return 0
+        # Peak RSS is the best we can do without procfs (KiB on Linux, bytes on macOS)
+        usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return usage if sys.platform == "darwin" else usage * 1024
+
+def open_file_count():
+    for path in ("/proc/self/fd", "/dev/fd"):
+        try:
+            return len(os.listdir(path))
+        except OSError:
+            continue
+    return 0
+
+def object_counts():
+    return Counter(type(obj).__name__ for obj in gc.get_objects())
+
+def detect_growth(values, segments=4, min_increase=0):
+    """Return True if a series keeps rising across all of its segments.
+
+    The series is split into equal segments and the median of each one is
+    compared, so ordinary jitter between samples does not count as growth
+    but a slow leak that never gives memory back does.
+    """
+    if len(values) < segments * 2:
+        return False
+    size = len(values) // segments
+    medians = []
+    for i in range(segments):
+        chunk = sorted(values[i * size:(i + 1) * size])
+        medians.append(chunk[len(chunk) // 2])
+    rising = all(b > a for a, b in zip(medians, medians[1:]))
+    return rising and medians[-1] - medians[0] > min_increase
+
+class SoakSample:
+    def __init__(self, frame, runs, rss, files, objects, particles, platforms, powerups):
+        self.frame = frame
+        self.runs = runs
+        self.rss = rss
+        self.files = files
+        self.objects = objects
+        self.particles = particles
+        self.platforms = platforms
+        self.powerups = powerups
+
+class SoakRunner:
+    """Drives the headless game with the autoplayer for a long session.
+
+    The game is restarted through init_game() whenever it ends, exactly as
+    the R key does, and process-level resources are sampled periodically.
+    """
+
+    # Metrics checked for growth and the minimum rise that counts as a leak
+    THRESHOLDS = {
+        "rss": 4 * 1024 * 1024,
+        "objects": 1000,
+        "files": 0,
+        "particles": 0,
+        "platforms": 0,
+        "powerups": 0,
+    }
+
+    def __init__(self, frames, sample_every=10000, render=False, seed=None,
+                 track_types=20, log=True, stall_frames=3600):
+        self.frames = frames
+        # Runs where the bot stops climbing are ended so restarts keep happening
+        self.stall_frames = stall_frames
+        self.sample_every = sample_every
+        self.render = render
+        self.track_types = track_types
+        self.rng = random.Random(seed)
+        self.log = log
+        self.samples = []
+        self.type_history = {}
+        self.runs = 0
+
+    def sample(self, game, frame):
+        gc.collect()
+        counts = object_counts()
+        for name, count in counts.most_common(self.track_types):
+            self.type_history.setdefault(name, [])
+        for name, history in self.type_history.items():
+            history.append(counts.get(name, 0))
+        # The samples themselves are the only thing the harness keeps growing
+        objects = sum(counts.values()) - len(self.samples)
+        self.samples.append(SoakSample(frame, self.runs, rss_bytes(), open_file_count(),
+                                       objects, len(game.particles.particles),
+                                       len(game.platforms), len(game.powerups)))
+
+    def run(self):
+        game = Game(seed=self.rng.random())
+        bot = AutoPlayer(self.rng, wobble=0.02)
+        logger = setup_logger("soak") if self.log else None
+        best_score = 0
+        last_progress = 0
+
+        for frame in range(self.frames):
+            if frame % self.sample_every == 0:
+                self.sample(game, frame)
+            if game.score > best_score:
+                best_score = game.score
+                last_progress = frame
+            elif frame - last_progress > self.stall_frames:
+                game.end_game("stalled")
+            if game.game_over:
+                self.runs += 1
+                if logger:
+                    # Mirrors the game logging each finished run
+                    logger = setup_logger("soak")
+                    logger.info("run %d ended with score %d", self.runs, game.score)
+                game.game_over = False
+                game.init_game()
+                bot.reset()
+                best_score = 0
+                last_progress = frame
+            bot.act(game)
+            game.update()
+            if self.render:
+                game.draw()
+            pygame.event.pump()
+        self.sample(game, self.frames)
+        return self.report()
+
+    def report(self):
+        growth = []
+        for metric, threshold in self.THRESHOLDS.items():
+            values = [getattr(sample, metric) for sample in self.samples]
+            if detect_growth(values, min_increase=threshold):
+                growth.append(metric)
+        for name, history in self.type_history.items():
+            # Types that only show up midway are compared from zero
+            values = [0] * (len(self.samples) - len(history)) + history
+            if detect_growth(values, min_increase=100):
+                growth.append(f"objects[{name}]")
+        return growth
+
+    def format_samples(self):
+        lines = [f"{'frame':>10} {'runs':>6} {'rss MiB':>8} {'files':>6} "
+                 f"{'objects':>8} {'particles':>9} {'platforms':>9} {'powerups':>8}"]
+        for s in self.samples:
+            lines.append(f"{s.frame:>10} {s.runs:>6} {s.rss / (1024 * 1024):>8.1f} "
+                         f"{s.files:>6} {s.objects:>8} {s.particles:>9} "
+                         f"{s.platforms:>9} {s.powerups:>8}")
+        return "\n".join(lines)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Long-session soak test for the headless game")
+    parser.add_argument("--frames", type=int, default=1000000)
+    parser.add_argument("--sample-every", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--render", action="store_true",
+                        help="also draw every frame to the dummy display")
+    args = parser.parse_args(argv)
+
+    runner = SoakRunner(args.frames, args.sample_every, args.render, args.seed)
+    start = time.perf_counter()
+    growth = runner.run()
+    elapsed = time.perf_counter() - start
+    pygame.quit()
+
+    print(runner.format_samples())
+    print(f"{args.frames} frames, {runner.runs} runs in {elapsed:.1f}s "
+          f"({args.frames / elapsed:.0f} frames/s)")
+    if growth:
+        print("Monotonic growth detected: " + ", ".join(growth))
+        return 1
+    print("No monotonic growth detected")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
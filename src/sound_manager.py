@@ -1,24 +1,160 @@
-import pygame
 import os
+import threading
+import pygame
+
+# Channels reserved for each category, so a burst of one kind of sound can
+# never take the channels another kind needs
+SOUND_CATEGORIES = {
+    "landing": 4,
+    "powerup": 2,
+    "ui": 2,
+}
+
+# name: (category, file, max simultaneous voices)
+SOUND_EFFECTS = {
+    "land": ("landing", "land.wav", 2),
+    "jump": ("landing", "jump.wav", 2),
+    "powerup": ("powerup", "powerup.wav", 2),
+    "select": ("ui", "select.wav", 1),
+    "game_over": ("ui", "game_over.wav", 1),
+}
 
 class SoundManager:
-    def __init__(self):
-        pygame.mixer.init()
+    """Plays effects on per-category channel pools with a voice limit.
+
+    The mixer is opened and the effects decoded on a background thread, so
+    neither startup nor the frame path waits on the audio device or the
+    disk; a sound requested before it has loaded is simply skipped. Each
+    sound may only have max voices playing at once and the oldest one is
+    cut off to make room, as is the oldest voice in the category when its
+    whole pool is busy. Volumes follow the Settings values and are
+    re-applied whenever they change.
+    """
+
+    def __init__(self, settings=None, sound_dir="sounds", effects=SOUND_EFFECTS,
+                 categories=SOUND_CATEGORIES, load=True):
+        self.settings = settings
+        self.sound_dir = sound_dir
+        self.effects = effects
         self.sounds = {}
         self.music_volume = 0.7
         self.sfx_volume = 0.8
-        
+        self.loader = None
+        self.loaded = threading.Event()
+        # Active voices as (channel, sound name) in the order they started
+        self.voices = {name: [] for name in categories}
+        self.categories = categories
+        self.pools = {}
+        self.applied = None
+        self.enabled = True
+        if load:
+            self.start_loading()
+
+    def start_loading(self):
+        if self.loader is not None or not self.enabled:
+            return
+        self.loader = threading.Thread(target=self._load_all, name="sound-loader", daemon=True)
+        self.loader.start()
+
+    def _load_all(self):
+        try:
+            if not self.open_mixer():
+                return
+            for name, (_, filename, _) in self.effects.items():
+                self.load_sound(name, os.path.join(self.sound_dir, filename))
+        finally:
+            self.loaded.set()
+
+    def open_mixer(self):
+        try:
+            if not pygame.mixer.get_init():
+                pygame.mixer.init()
+        except pygame.error:
+            # No audio device; the game runs silently
+            self.enabled = False
+            return False
+
+        total = sum(self.categories.values())
+        pygame.mixer.set_num_channels(max(total, pygame.mixer.get_num_channels()))
+        # Reserved channels are never picked by Sound.play(), only by us
+        pygame.mixer.set_reserved(total)
+        pools = {}
+        index = 0
+        for name, count in self.categories.items():
+            pools[name] = [pygame.mixer.Channel(index + i) for i in range(count)]
+            index += count
+        # Published whole, since the main thread may be applying volumes
+        self.pools = pools
+        self.apply_volumes()
+        return True
+
+    def wait_until_loaded(self, timeout=None):
+        return self.loaded.wait(timeout)
+
     def load_sound(self, name, file_path):
-        if os.path.exists(file_path):
+        if not self.enabled or not os.path.exists(file_path):
+            return
+        try:
             self.sounds[name] = pygame.mixer.Sound(file_path)
-            self.sounds[name].set_volume(self.sfx_volume)
-    
-    def play_sound(self, name):
-        if name in self.sounds:
-            self.sounds[name].play()
-    
+        except pygame.error:
+            pass
+
+    def play(self, name):
+        sound = self.sounds.get(name)
+        if sound is None:
+            return None
+        category, _, max_voices = self.effects[name]
+        voices = self.voices[category]
+        # Forget voices that have finished or were replaced
+        voices[:] = [voice for voice in voices
+                     if voice[0].get_busy() and voice[0].get_sound() is self.sounds[voice[1]]]
+
+        channel = None
+        same = [voice for voice in voices if voice[1] == name]
+        if len(same) >= max_voices:
+            channel = same[0][0]
+            voices.remove(same[0])
+        else:
+            for candidate in self.pools[category]:
+                if not candidate.get_busy():
+                    channel = candidate
+                    break
+            if channel is None and voices:
+                channel = voices.pop(0)[0]
+        if channel is None:
+            return None
+
+        channel.play(sound)
+        voices.append((channel, name))
+        return channel
+
+    # Kept for callers of the old interface
+    play_sound = play
+
+    def active_voices(self, category):
+        return len(self.voices.get(category, ()))
+
+    def apply_volumes(self):
+        if self.settings is not None:
+            self.music_volume = self.settings.music_volume / 100.0
+            self.sfx_volume = self.settings.sfx_volume / 100.0
+        self.applied = (self.music_volume, self.sfx_volume)
+        if not self.pools:
+            # The mixer isn't open yet; open_mixer() applies them
+            return
+        pygame.mixer.music.set_volume(self.music_volume)
+        for pool in self.pools.values():
+            for channel in pool:
+                channel.set_volume(self.sfx_volume)
+
+    def update(self):
+        # Called once per frame; cheap unless a volume was changed
+        if self.settings is not None and self.applied != (self.settings.music_volume / 100.0,
+                                                          self.settings.sfx_volume / 100.0):
+            self.apply_volumes()
+
     def play_music(self, file_path, loop=-1):
-        if os.path.exists(file_path):
+        if self.pools and os.path.exists(file_path):
             pygame.mixer.music.load(file_path)
             pygame.mixer.music.set_volume(self.music_volume)
-            pygame.mixer.music.play(loop)
\ No newline at end of file
+            pygame.mixer.music.play(loop)
@@ -0,0 +1,103 @@
+class SpatialGrid:
+    """Uniform grid for broad-phase collision queries.
+
+    Each item is filed under every cell its bounds touch. A query only
+    looks at the cells covering the query box, so its cost depends on what
+    is near the box rather than on how many items the level holds.
+    Results come back in insertion order, which for the level is climbing
+    order, so callers see candidates in the same order as a list scan.
+    """
+
+    def __init__(self, cell_size=100):
+        self.cell_size = cell_size
+        self.cells = {}
+        # item -> (insertion number, cell keys)
+        self.items = {}
+        self.counter = 0
+
+    def __len__(self):
+        return len(self.items)
+
+    def __contains__(self, item):
+        return item in self.items
+
+    def cell_range(self, left, top, right, bottom):
+        size = self.cell_size
+        return (int(left // size), int(top // size),
+                int(right // size), int(bottom // size))
+
+    def insert(self, item, left, top, right, bottom):
+        if item in self.items:
+            self.remove(item)
+        self.items[item] = (self.counter, self.file(item, left, top, right, bottom))
+        self.counter += 1
+
+    def file(self, item, left, top, right, bottom):
+        # Adds the item to every cell the bounds touch; returns their keys
+        x0, y0, x1, y1 = self.cell_range(left, top, right, bottom)
+        keys = []
+        cells = self.cells
+        for cy in range(y0, y1 + 1):
+            for cx in range(x0, x1 + 1):
+                key = (cx, cy)
+                bucket = cells.get(key)
+                if bucket is None:
+                    bucket = cells[key] = []
+                bucket.append(item)
+                keys.append(key)
+        return keys
+
+    def move(self, item, left, top, right, bottom):
+        """Refile an item under new bounds, keeping its place in the order."""
+        counter, keys = self.items[item]
+        x0, y0, x1, y1 = self.cell_range(left, top, right, bottom)
+        if keys[0] == (x0, y0) and keys[-1] == (x1, y1):
+            return
+        self.unfile(item, keys)
+        self.items[item] = (counter, self.file(item, left, top, right, bottom))
+
+    def remove(self, item):
+        entry = self.items.pop(item, None)
+        if entry is not None:
+            self.unfile(item, entry[1])
+
+    def unfile(self, item, keys):
+        cells = self.cells
+        for key in keys:
+            bucket = cells[key]
+            bucket.remove(item)
+            if not bucket:
+                del cells[key]
+
+    def clear(self):
+        self.cells.clear()
+        self.items.clear()
+        self.counter = 0
+
+    def query(self, left, top, right, bottom):
+        """Items whose cells overlap the box, in insertion order.
+
+        This is a broad phase: callers still test the exact bounds. An empty
+        result is a shared tuple, so misses allocate nothing.
+        """
+        x0, y0, x1, y1 = self.cell_range(left, top, right, bottom)
+        cells = self.cells
+        found = None
+        for cy in range(y0, y1 + 1):
+            for cx in range(x0, x1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    if found is None:
+                        found = list(bucket)
+                    else:
+                        found.extend(bucket)
+        if found is None:
+            return ()
+        if len(found) > 1:
+            items = self.items
+            found = sorted(set(found), key=lambda item: items[item][0])
+        return found
+
+    def query_radius(self, x, y, radius):
+        """Broad phase for a circle: the items near its bounding box."""
+        return self.query(x - radius, y - radius, x + radius, y + radius)
@@ -0,0 +1,146 @@
+import argparse
+import asyncio
+import sys
+
+import pygame
+
+from .background import get_background
+from .broadcast import (DEFAULT_PORT, GAME_OVER_FLAG, KEYFRAME, LENGTH, PAUSED_FLAG,
+                        PLATFORM, PLATFORM_TYPES, PLAYER, PLAYER_EFFECTS, POWERUP,
+                        POWERUP_TYPES, RECORDS, parse)
+from .config import load_config
+from .constants import *
+from .display import get_display
+from .fonts import get_font
+from .platform import Platform
+from .player import Player
+from .powerup import PowerUp
+
+class Spectator:
+    """A view of a broadcast game, rebuilt from its messages.
+
+    Entities are real Player, Platform and PowerUp objects updated from
+    the records, so drawing is the game's own draw code.
+    """
+
+    def __init__(self):
+        self.objects = {}
+        self.players = []
+        self.platforms = []
+        self.powerups = []
+        self.frame = 0
+        self.camera_y = 0
+        self.score = 0
+        self.high_score = 0
+        self.flags = 0
+        self.messages = 0
+
+    def apply(self, message):
+        header, removed, changed = parse(message)
+        kind, self.frame, self.camera_y, self.score, self.high_score, self.flags = header[:6]
+        self.messages += 1
+        objects = self.objects
+        if kind == KEYFRAME:
+            objects.clear()
+        for entity in removed:
+            objects.pop(entity, None)
+        for entity, kind, record in changed:
+            item = objects.get(entity)
+            if kind == PLAYER:
+                x, y, color, flags = RECORDS[PLAYER].unpack(record)
+                if item is None:
+                    item = objects[entity] = Player(x, y)
+                    item.color = PLAYER_COLORS[color]
+                item.x, item.y = x, y
+                item.trail_positions.append((x + PLAYER_SIZE // 2, y + PLAYER_SIZE // 2))
+                item.double_jumps_left = flags & 1
+                item.effects.active = frozenset(effect for bit, effect in enumerate(PLAYER_EFFECTS, 1)
+                                                if flags & (1 << bit))
+            elif kind == PLATFORM:
+                x, y, width, platform_type, crumble_timer = RECORDS[PLATFORM].unpack(record)
+                if item is None:
+                    item = objects[entity] = Platform(x, y, width, PLATFORM_TYPES[platform_type])
+                item.x, item.y = x, y
+                item.crumble_timer = crumble_timer
+            else:
+                x, y, powerup_type = RECORDS[POWERUP].unpack(record)
+                if item is None:
+                    item = objects[entity] = PowerUp(x, y, POWERUP_TYPES[powerup_type])
+                item.x, item.y = x, y
+        self.players = [item for item in objects.values() if type(item) is Player]
+        self.platforms = [item for item in objects.values() if type(item) is Platform]
+        self.powerups = [item for item in objects.values() if type(item) is PowerUp]
+
+    def draw(self, screen):
+        camera_y = self.camera_y
+        get_background(screen).draw(screen, camera_y)
+        big_platforms_active = any(POWERUP_BIG_PLATFORMS in player.effects.active
+                                   for player in self.players)
+        for platform in self.platforms:
+            platform.draw(screen, camera_y, big_platforms_active)
+        for powerup in self.powerups:
+            powerup.draw(screen, camera_y)
+        for player in self.players:
+            player.draw(screen, camera_y)
+
+        font = get_font(36)
+        small_font = get_font(24)
+        screen.blit(font.render(f'Score: {self.score}', True, WHITE), (10, 10))
+        screen.blit(small_font.render(f'High Score: {self.high_score}', True, YELLOW), (10, 50))
+        status = 'SPECTATING'
+        if self.flags & GAME_OVER_FLAG:
+            status = 'GAME OVER'
+        elif self.flags & PAUSED_FLAG:
+            status = 'PAUSED'
+        text = small_font.render(status, True, GRAY)
+        screen.blit(text, text.get_rect(topright=(SCREEN_WIDTH - 10, 10)))
+
+async def receive(reader, spectator):
+    try:
+        while True:
+            length, = LENGTH.unpack(await reader.readexactly(LENGTH.size))
+            spectator.apply(await reader.readexactly(length))
+    except (asyncio.IncompleteReadError, ConnectionError):
+        # The broadcast ended
+        pass
+
+async def watch(host, port, display):
+    """Show the broadcast on `display` until the window closes or the game goes away."""
+    reader, writer = await asyncio.open_connection(host, port)
+    spectator = Spectator()
+    receiving = asyncio.create_task(receive(reader, spectator))
+    loop = asyncio.get_running_loop()
+    interval = 1 / 60
+    try:
+        while not receiving.done():
+            start = loop.time()
+            if any(event.type == pygame.QUIT for event in pygame.event.get()):
+                break
+            spectator.draw(display.surface)
+            display.present()
+            await asyncio.sleep(max(0.0, start + interval - loop.time()))
+    finally:
+        receiving.cancel()
+        writer.close()
+    return spectator
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Watch a broadcast game")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args(argv)
+
+    display = get_display(load_config())
+    pygame.display.set_caption("Endless Jumper - Spectator")
+    try:
+        spectator = asyncio.run(watch(args.host, args.port, display))
+    except OSError as error:
+        print(f"Could not connect to {args.host}:{args.port}: {error}")
+        return 1
+    finally:
+        pygame.quit()
+    print(f"Watched {spectator.messages} updates")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,48 @@
+import os
+import time
+
+def process_age():
+    """Seconds since the process started, or None without procfs."""
+    try:
+        with open("/proc/self/stat", "r") as f:
+            stat = f.read()
+        with open("/proc/uptime", "r") as f:
+            uptime = float(f.read().split()[0])
+        # The command name may contain spaces, so count fields after it
+        start_ticks = int(stat[stat.rindex(")") + 2:].split()[19])
+        return max(0.0, uptime - start_ticks / os.sysconf("SC_CLK_TCK"))
+    except (OSError, ValueError, IndexError):
+        return None
+
+class StartupTimer:
+    """Records how long each startup phase takes.
+
+    Times are measured from process start where the OS reports it, so
+    interpreter startup and imports are included; otherwise from when the
+    timer was created.
+    """
+
+    def __init__(self):
+        now = time.perf_counter()
+        age = process_age()
+        self.from_process = age is not None
+        self.origin = now - (age or 0.0)
+        self.marks = []
+
+    def mark(self, name):
+        self.marks.append((name, time.perf_counter()))
+
+    def elapsed_ms(self):
+        if not self.marks:
+            return 0
+        return (self.marks[-1][1] - self.origin) * 1000
+
+    def format_report(self):
+        origin = "process start" if self.from_process else "launch"
+        lines = [f"Startup: {self.elapsed_ms():.0f} ms from {origin} to {self.marks[-1][0]}"
+                 if self.marks else "Startup: no phases recorded"]
+        previous = self.origin
+        for name, at in self.marks:
+            lines.append(f"  {name:<12} {(at - previous) * 1000:7.1f} ms")
+            previous = at
+        return "\n".join(lines)
@@ -0,0 +1,68 @@
+import unittest
+import random
+import pygame
+from src.game import Game
+from src.allocations import AllocationTracker
+
+# Net tracemalloc blocks a steady-state frame may leave behind on average.
+# Interpreter and pygame free lists make this jitter by a block or so.
+STEADY_STATE_BLOCK_BUDGET = 2.0
+# Bytes allocated and released again within a single frame
+STEADY_STATE_PEAK_BUDGET = 8 * 1024
+WARMUP_FRAMES = 1500
+MEASURED_FRAMES = 120
+
+class TestAllocations(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        random.seed(1234)
+        self.game = Game(seed=1234)
+        self.tracker = AllocationTracker()
+
+    def step(self):
+        # The player keeps bouncing on the start platform, which exercises
+        # landing particles, the trail and a full draw every frame
+        self.game.update()
+        self.game.draw()
+
+    def test_steady_state_frame_budget(self):
+        """Test that steady-state frames stay within the allocation budget"""
+        # A long warmup lets the interpreter's free lists settle first
+        for _ in range(WARMUP_FRAMES):
+            self.step()
+
+        self.tracker.start()
+        try:
+            for _ in range(MEASURED_FRAMES):
+                self.tracker.begin_frame()
+                self.step()
+                self.tracker.end_frame()
+        finally:
+            self.tracker.stop()
+
+        self.assertFalse(self.game.game_over)
+        self.assertEqual(len(self.tracker.frames), MEASURED_FRAMES)
+        self.assertLessEqual(self.tracker.average_blocks(), STEADY_STATE_BLOCK_BUDGET,
+                             self.tracker.format_report())
+        self.assertLessEqual(self.tracker.average_peak(), STEADY_STATE_PEAK_BUDGET,
+                             self.tracker.format_report())
+
+    def test_report_groups_by_function(self):
+        """Test that allocations are attributed to module and function"""
+        self.tracker.start()
+        try:
+            self.tracker.begin_frame()
+            self.game.particles.add_explosion(100, 100, count=50)
+            frame = self.tracker.end_frame()
+        finally:
+            self.tracker.stop()
+
+        self.assertGreater(frame.blocks, 0)
+        self.assertIn(("src/particles.py", "ParticleSystem.add_explosion"), frame.by_function)
+        self.assertIn("ParticleSystem.add_explosion", self.tracker.format_report())
+
+    def tearDown(self):
+        pygame.quit()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+import pygame
+from src.constants import SCREEN_WIDTH, SCREEN_HEIGHT, BLACK
+from src.game import Game
+from src.background import get_background
+
+class TestBackground(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        self.screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+
+    def render(self, camera_y, layers=None):
+        get_background(self.screen).draw(self.screen, camera_y, layers)
+        return pygame.image.tobytes(self.screen, "RGB")
+
+    def test_layers_wrap_seamlessly(self):
+        """Test that the bottom of each strip repeats its top, so any window is a seamless view"""
+        background = get_background(self.screen)
+        for index, layer in enumerate(background.layers):
+            top = layer.strip.subsurface((0, 0, SCREEN_WIDTH, SCREEN_HEIGHT))
+            wrapped = layer.strip.subsurface((0, layer.height, SCREEN_WIDTH, SCREEN_HEIGHT))
+            self.assertEqual(pygame.image.tobytes(wrapped, "RGB"),
+                             pygame.image.tobytes(top, "RGB"), f"layer {index}")
+
+    def test_layers_scroll_at_different_speeds(self):
+        """Test that moving the camera scrolls the near layers further"""
+        background = get_background(self.screen)
+        offsets = []
+        for layer in background.layers:
+            layer.draw(self.screen, -1000)
+            offsets.append((layer.height - layer.area.y) % layer.height)
+        self.assertEqual(offsets, sorted(offsets))
+        self.assertNotEqual(self.render(0), self.render(-1000))
+
+    def test_no_layers_is_a_black_screen(self):
+        """Test that the lowest quality level draws no background"""
+        self.screen.fill((255, 0, 0))
+        self.render(-500, 0)
+        self.assertEqual(self.screen.get_at((10, 10))[:3], BLACK)
+
+    def test_built_once(self):
+        """Test that games share the prerendered background"""
+        first = Game(high_score_path=None)
+        second = Game(high_score_path=None)
+        first.draw()
+        second.draw()
+        self.assertIs(first.background, second.background)
+
+    def tearDown(self):
+        pygame.quit()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import unittest
+import random
+import pygame
+from src.constants import MOVE_SPEED, SCREEN_WIDTH
+from src.game import Game
+from src.bot import AutoPlayer
+from src.level import LevelGenerator
+from src.platform import Platform
+from src.reachability import is_reachable
+
+try:
+    import numpy as np
+    from src.batch import BatchSim
+except ImportError:
+    np = None
+
+class TestLevelGenerator(unittest.TestCase):
+    def test_same_seed_same_level(self):
+        """Test that a seed always produces the same platforms and power-ups"""
+        def build(seed):
+            level = LevelGenerator(random.Random(seed))
+            platforms = level.initial_platforms()
+            rolls = []
+            for _ in range(50):
+                platforms.append(level.next_platform(platforms[-1]))
+                rolls.append(level.roll_powerup())
+            return [(p.x, p.y, p.width, p.type) for p in platforms], rolls
+
+        self.assertEqual(build(4), build(4))
+        self.assertNotEqual(build(4), build(5))
+
+    def test_unreachable_step_is_pulled_back(self):
+        """Test that a platform rolled out of reach is moved to where it can be landed on"""
+        class TallGap(random.Random):
+            # The first roll is the vertical gap
+            gaps = [300]
+            def randint(self, a, b):
+                if self.gaps:
+                    return self.gaps.pop()
+                return super().randint(a, b)
+
+        prev = Platform(300, 500, 200)
+        platform = LevelGenerator(TallGap(1)).next_platform(prev)
+        self.assertGreater(platform.home_y, prev.home_y - 300)
+        self.assertTrue(is_reachable(prev.home_x, prev.home_y, prev.width,
+                                     platform.home_x, platform.home_y, platform.width))
+
+        # A platform off the side of the screen has nothing on screen in reach
+        prev = Platform(3000, 500, 200)
+        platform = LevelGenerator(random.Random(1)).next_platform(prev)
+        self.assertEqual(platform.home_x, SCREEN_WIDTH - platform.width)
+
+@unittest.skipUnless(np is not None, "numpy is not installed")
+class TestBatchSim(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+
+    def test_matches_scalar_game(self):
+        """Test that every world follows Game frame for frame given the same inputs"""
+        seeds = [0, 1, 2, 3, 7]
+        games = [Game(seed=seed, high_score_path=None) for seed in seeds]
+        bots = [AutoPlayer(random.Random(seed), wobble=0.02) for seed in seeds]
+        sim = BatchSim(seeds)
+
+        for frame in range(1500):
+            vel_x = np.zeros(len(seeds))
+            jump = np.zeros(len(seeds), dtype=bool)
+            for i, (game, bot) in enumerate(zip(games, bots)):
+                if not game.game_over:
+                    vel_x[i], jump[i] = bot.act(game)
+                    game.update()
+            sim.step(vel_x, jump)
+
+            for i, game in enumerate(games):
+                player = game.player
+                self.assertEqual(
+                    (sim.x[i], sim.y[i], sim.vel_y[i], sim.score[i], sim.double_jumps_left[i],
+                     sim.big_platforms_timer[i], sim.slow_motion_timer[i], bool(sim.alive[i]),
+                     sim.total_jumps[i], sim.powerups_collected[i]),
+                    (player.x, player.y, player.vel_y, game.score, player.double_jumps_left,
+                     player.big_platforms_timer, player.slow_motion_timer, not game.game_over,
+                     game.total_jumps, game.powerups_collected),
+                    f"world {i} diverged on frame {frame}")
+
+    def test_dead_worlds_stay_frozen(self):
+        """Test that a world stops updating once its game is over"""
+        sim = BatchSim([0, 1])
+        # Walking off the start platform with no input to get back ends the run
+        while sim.alive.any():
+            sim.step([MOVE_SPEED, MOVE_SPEED])
+        frames = sim.frames.copy()
+        y = sim.y.copy()
+        self.assertEqual(sim.step([MOVE_SPEED, MOVE_SPEED]), 0)
+        self.assertEqual(list(sim.frames), list(frames))
+        self.assertEqual(list(sim.y), list(y))
+
+    def test_steer_climbs(self):
+        """Test that the vectorized policy makes progress in most worlds"""
+        sim = BatchSim(range(50))
+        for _ in range(600):
+            sim.step(*sim.steer())
+        self.assertGreater(np.median(sim.score), 30)
+
+    def tearDown(self):
+        pygame.quit()
+
+if __name__ == '__main__':
+    unittest.main()
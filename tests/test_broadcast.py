@@ -0,0 +1,102 @@
+import asyncio
+import random
+import unittest
+import pygame
+from src.bot import AutoPlayer
+from src.broadcast import BroadcastServer, StateEncoder, StateMirror
+from src.game import Game
+from src.spectator import Spectator, receive
+
+class TestBroadcast(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        self.game = Game(seed=5, high_score_path=None)
+        self.bot = AutoPlayer(random.Random(5))
+
+    def step(self, frames):
+        for _ in range(frames):
+            self.bot.act(self.game)
+            self.game.update()
+
+    def assertMatchesGame(self, spectator):
+        game = self.game
+        self.assertEqual([(p.x, p.y) for p in spectator.players],
+                         [(round(p.x), round(p.y)) for p in game.players])
+        self.assertEqual(sorted((p.x, p.y, p.type) for p in spectator.platforms),
+                         sorted((round(p.x), round(p.y), p.type) for p in game.platforms
+                                if not p.crumbled))
+        self.assertEqual(sorted((p.x, p.y, p.type) for p in spectator.powerups),
+                         sorted((round(p.x), round(p.y), p.type) for p in game.powerups))
+        self.assertEqual(spectator.score, int(game.score))
+
+    def test_deltas_rebuild_the_game(self):
+        """Test that a keyframe plus deltas reproduce every frame and deltas stay small"""
+        encoder = StateEncoder()
+        spectator = Spectator()
+        keyframe = encoder.encode(self.game)
+        self.assertEqual(keyframe[:1], b"K")
+        spectator.apply(keyframe)
+        self.assertMatchesGame(spectator)
+        sizes = []
+        for _ in range(300):
+            self.step(1)
+            message = encoder.encode(self.game)
+            if message is not None:
+                self.assertEqual(message[:1], b"D")
+                sizes.append(len(message))
+                spectator.apply(message)
+            self.assertMatchesGame(spectator)
+        self.assertLess(sum(sizes) / len(sizes), len(keyframe) / 4)
+        self.assertIsNone(encoder.encode(self.game))
+
+    def test_mirror_keyframe_matches_deltas(self):
+        """Test that the server's mirror greets late spectators with the current state"""
+        encoder = StateEncoder()
+        mirror = StateMirror()
+        for _ in range(100):
+            self.step(1)
+            message = encoder.encode(self.game)
+            if message is not None:
+                mirror.apply(message)
+        late = Spectator()
+        late.apply(mirror.keyframe())
+        self.assertMatchesGame(late)
+
+    def test_server_streams_to_spectators(self):
+        """Test that spectators connected to the server follow the published game"""
+        server = BroadcastServer(port=0)
+        port = server.start()
+        server.publish(self.game)
+
+        async def watch():
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            spectator = Spectator()
+            task = asyncio.create_task(receive(reader, spectator))
+            while spectator.messages == 0:
+                await asyncio.sleep(0.01)
+            for _ in range(60):
+                self.step(1)
+                server.publish(self.game)
+                # Pace frames like the game loop does; publishing faster than
+                # the server thread runs would skip frames on a busy machine
+                while server.delivered != server.submitted:
+                    await asyncio.sleep(0.001)
+            frame = self.game.frame
+            while spectator.frame != frame:
+                await asyncio.sleep(0.01)
+            task.cancel()
+            writer.close()
+            return spectator
+
+        try:
+            spectator = asyncio.run(asyncio.wait_for(watch(), 10))
+        finally:
+            server.stop()
+        self.assertMatchesGame(spectator)
+        self.assertEqual(server.skipped, 0)
+
+    def tearDown(self):
+        pygame.quit()
+
+if __name__ == '__main__':
+    unittest.main()
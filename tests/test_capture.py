@@ -0,0 +1,49 @@
+import os
+import tempfile
+import unittest
+import pygame
+from src.capture import FrameCapture
+
+class TestFrameCapture(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        self.surface = pygame.Surface((64, 48), 0, 32)
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def test_png_sequence(self):
+        """Test that captured frames are written as numbered PNGs with the drawn pixels"""
+        path = os.path.join(self.tmp.name, "frames")
+        capture = FrameCapture(path, self.surface, slots=4)
+        for frame in range(3):
+            self.surface.fill((frame * 100, 50, 0))
+            capture.capture(self.surface)
+        capture.close()
+        self.assertEqual(capture.captured + capture.dropped, 3)
+        files = sorted(os.listdir(path))
+        self.assertEqual(len(files), capture.captured)
+        frame = int(files[-1][6:12])
+        image = pygame.image.load(os.path.join(path, files[-1]))
+        self.assertEqual(image.get_at((10, 10))[:3], (frame * 100, 50, 0))
+
+    def test_raw_video_drops_instead_of_waiting(self):
+        """Test that a full pool drops frames and the rest reach the raw file intact"""
+        path = os.path.join(self.tmp.name, "capture.raw")
+        capture = FrameCapture(path, self.surface, slots=1)
+        self.surface.fill((1, 2, 3))
+        for _ in range(200):
+            capture.capture(self.surface)
+        capture.close()
+        self.assertEqual(capture.captured + capture.dropped, 200)
+        self.assertGreater(capture.dropped, 0)
+        frame_bytes = 64 * 48 * 4
+        with open(path, "rb") as f:
+            data = f.read()
+        self.assertEqual(len(data), capture.captured * frame_bytes)
+        self.assertEqual(data[:frame_bytes], self.surface.get_view("0").raw)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+        pygame.quit()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import json
+import os
+import tempfile
+import unittest
+import warnings
+import pygame
+from src.constants import SCREEN_WIDTH, SCREEN_HEIGHT
+from src.game import Game
+from src.config import load_config
+from src.display import Display, get_display
+
+class TestDisplay(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+
+    def test_window_created_once(self):
+        """Test that starting new games reuses the existing window"""
+        display = get_display()
+        first = Game(display=display)
+        second = Game()
+        self.assertIs(second.display, display)
+        self.assertIs(first.screen, second.screen)
+        self.assertIs(pygame.display.get_surface(), display.window)
+
+    def test_integer_scale_fills_target(self):
+        """Test that a 2x window is filled by nearest-neighbour scaling"""
+        display = Display(window_size=(SCREEN_WIDTH * 2, SCREEN_HEIGHT * 2))
+        self.assertFalse(display.smooth)
+        self.assertEqual(display.target.get_size(), (SCREEN_WIDTH * 2, SCREEN_HEIGHT * 2))
+        display.surface.fill((255, 0, 0))
+        display.present()
+        self.assertEqual(display.window.get_at((SCREEN_WIDTH * 2 - 1, SCREEN_HEIGHT * 2 - 1))[:3],
+                         (255, 0, 0))
+
+    def test_fractional_scale_letterboxes(self):
+        """Test that a non-integer window uses smooth scaling with centred bars"""
+        display = Display(window_size=(1920, 1080))
+        self.assertTrue(display.smooth)
+        self.assertEqual(display.target.get_size(), (1440, 1080))
+        self.assertEqual(display.target.get_abs_offset(), (240, 0))
+        display.surface.fill((0, 255, 0))
+        display.present()
+        self.assertEqual(display.window.get_at((960, 540))[:3], (0, 255, 0))
+        self.assertEqual(display.window.get_at((10, 540))[:3], (0, 0, 0))
+
+    def test_matching_size_draws_directly(self):
+        """Test that no scaling is done when the window is the render size"""
+        display = Display()
+        self.assertIs(display.surface, display.window)
+        self.assertIsNone(display.target)
+
+    def test_vsync_uses_sdl_scaling_or_warns(self):
+        """Test that vsync is only reported when the window was made with a renderer"""
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            display = Display(window_size=(SCREEN_WIDTH * 2, SCREEN_HEIGHT * 2), vsync=True)
+        if display.vsync:
+            # SDL scales the render-sized surface itself
+            self.assertIs(display.surface, display.window)
+            self.assertEqual(display.scale_mode, "hardware")
+            self.assertEqual(caught, [])
+        else:
+            # No renderer can sync here (e.g. the dummy video driver)
+            self.assertEqual(len(caught), 1)
+            self.assertEqual(display.window_size, (SCREEN_WIDTH * 2, SCREEN_HEIGHT * 2))
+            self.assertFalse(display.smooth)
+
+    def test_load_config_defaults(self):
+        """Test that missing display settings fall back to defaults"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "config.json")
+            with open(path, "w") as f:
+                json.dump({"display": {"scale": "nearest"}}, f)
+            config = load_config(path)
+        self.assertEqual(config["display"]["scale"], "nearest")
+        self.assertFalse(config["display"]["fullscreen"])
+        self.assertEqual(config["game"]["fps"], 60)
+
+    def test_late_input_without_vsync_warns(self):
+        """Test that late input sampling without vsync pacing is flagged as a no-op"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "config.json")
+            with open(path, "w") as f:
+                json.dump({"game": {"input_timing": "late"}}, f)
+            with self.assertWarns(UserWarning):
+                load_config(path)
+            with open(path, "w") as f:
+                json.dump({"game": {"input_timing": "late", "pacing": "vsync"}}, f)
+            with warnings.catch_warnings():
+                warnings.simplefilter("error")
+                load_config(path)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+from src.constants import POWERUP_SHIELD, POWERUP_MAGNET
+from src.player import Player
+from src.effects import StatusEffects
+
+def advance(effects, frames):
+    for _ in range(frames):
+        effects.advance()
+
+class TestStatusEffects(unittest.TestCase):
+    def test_effects_expire_in_order(self):
+        """Test that each effect runs for exactly its duration"""
+        effects = StatusEffects()
+        effects.start("long", 5)
+        effects.start("short", 2)
+        self.assertEqual(effects.active, {"long", "short"})
+        advance(effects, 2)
+        self.assertEqual(effects.active, {"long"})
+        self.assertEqual(effects.remaining("long"), 3)
+        self.assertEqual(effects.remaining("short"), 0)
+        advance(effects, 3)
+        self.assertEqual(effects.active, frozenset())
+
+    def test_refresh_and_stack(self):
+        """Test that restarting an effect refreshes it and stacking extends it"""
+        effects = StatusEffects()
+        effects.start("haste", 10)
+        advance(effects, 6)
+        effects.start("haste", 10)
+        self.assertEqual(effects.remaining("haste"), 10)
+        effects.start("haste", 5, stack=True)
+        self.assertEqual(effects.remaining("haste"), 15)
+        # The entries the refreshes replaced come due first and are ignored
+        advance(effects, 14)
+        self.assertIn("haste", effects.active)
+        effects.advance()
+        self.assertNotIn("haste", effects.active)
+        self.assertEqual(effects.heap, [])
+
+    def test_active_set_only_changes_on_start_and_expiry(self):
+        """Test that the cached active set is reused between effect changes"""
+        effects = StatusEffects()
+        effects.start("glow", 3)
+        active = effects.active
+        effects.advance()
+        effects.start("glow", 3)
+        effects.advance()
+        self.assertIs(effects.active, active)
+        effects.stop("glow")
+        self.assertNotIn("glow", effects.active)
+        effects.start("glow", 0)
+        self.assertEqual(effects.remaining("glow"), 0)
+
+    def test_player_timers_use_effects(self):
+        """Test that the player's power-up timers read and write its effects"""
+        player = Player(100, 100)
+        player.shield_timer = 3
+        player.magnet_timer = 1
+        self.assertEqual(player.effects.active, {POWERUP_SHIELD, POWERUP_MAGNET})
+        player.update()
+        self.assertEqual(player.shield_timer, 2)
+        self.assertEqual(player.magnet_timer, 0)
+        self.assertEqual(player.effects.active, {POWERUP_SHIELD})
+        player.shield_timer = 0
+        self.assertEqual(player.effects.active, frozenset())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+import unittest
+import pygame
+from src.constants import (PLAYER_SIZE, SHIELD_DURATION, MAGNET_DURATION, SUPER_JUMP_DURATION,
+                           CRUMBLE_FRAMES)
+from src.env import (ACTIONS, PLAYER_FEATURES, PLATFORM_FEATURES, JumperEnv, VectorEnv,
+                     observation_size)
+from src.game import Game
+from src.platform import Platform
+
+class TestEnv(unittest.TestCase):
+    def test_reset_and_step(self):
+        """Test that observations have a fixed size and rewards follow the score"""
+        env = JumperEnv(seed=3)
+        obs, info = env.reset()
+        self.assertEqual(len(obs), observation_size())
+        self.assertEqual(info["score"], 0)
+
+        total = 0
+        for _ in range(30):
+            obs, reward, terminated, truncated, info = env.step(2)
+            total += reward
+        self.assertEqual(total, env.game.score)
+        self.assertEqual(len(obs), env.observation_size)
+        self.assertEqual(env.game.player.vel_x, 6)
+
+    def test_observation_lists_nearest_platforms_first(self):
+        """Test that platform features are present and ordered by height distance"""
+        env = JumperEnv(seed=1)
+        obs, _ = env.reset()
+        distances = []
+        for i in range(PLAYER_FEATURES, len(obs), PLATFORM_FEATURES):
+            self.assertEqual(obs[i], 1.0)
+            distances.append(abs(obs[i + 2]))
+        self.assertEqual(distances, sorted(distances))
+        # Standing on the start platform
+        self.assertEqual(obs[PLAYER_FEATURES + 2], 0.0)
+
+        # Once it crumbles it is no longer listed
+        for platform in env.game.platforms:
+            if platform.y == env.game.player.y + PLAYER_SIZE:
+                platform.crumbled = True
+        obs = env.observe()
+        self.assertNotEqual(obs[PLAYER_FEATURES + 2], 0.0)
+        for platform in env.game.platforms:
+            platform.crumbled = True
+        obs = env.observe()
+        self.assertEqual(list(obs[PLAYER_FEATURES:]), [0.0] * (len(obs) - PLAYER_FEATURES))
+
+    def test_observation_includes_every_effect_timer(self):
+        """Test that each timed power-up shows up in the player features"""
+        env = JumperEnv(seed=2)
+        env.reset()
+        player = env.game.player
+        player.big_platforms_timer = 300
+        player.slow_motion_timer = 150
+        player.shield_timer = SHIELD_DURATION
+        player.magnet_timer = MAGNET_DURATION // 2
+        player.super_jump_timer = SUPER_JUMP_DURATION // 4
+        obs = env.observe()
+        self.assertEqual(list(obs[6:PLAYER_FEATURES]), [0.5, 0.5, 1.0, 0.5, 0.25])
+
+    def test_observation_marks_platform_types(self):
+        """Test that moving and crumbling platforms and the crumble timer are features"""
+        env = JumperEnv(seed=2)
+        env.reset()
+        feet = env.game.player.y + PLAYER_SIZE
+        moving = Platform(100, feet - 1, 90, "moving")
+        crumbling = Platform(300, feet - 2, 90, "crumbling")
+        crumbling.crumble_timer = CRUMBLE_FRAMES // 2
+        env.game.platforms[:] = [moving, crumbling]
+        obs = env.observe()
+        first = PLAYER_FEATURES
+        second = first + PLATFORM_FEATURES
+        self.assertEqual(list(obs[first + 4:second]), [0.0, 1.0, 0.0, 0.0])
+        self.assertEqual(list(obs[second + 4:second + PLATFORM_FEATURES]), [0.0, 0.0, 1.0, 0.5])
+
+    def test_first_reset_matches_seeded_game(self):
+        """Test that an unseeded first reset starts the constructor seed's level"""
+        env = JumperEnv(seed=7)
+        env.reset()
+        game = Game(seed=7, high_score_path=None)
+        self.assertEqual([(p.x, p.y, p.width, p.type) for p in env.game.platforms],
+                         [(p.x, p.y, p.width, p.type) for p in game.platforms])
+        # Later resets go on to new levels
+        env.reset()
+        self.assertNotEqual([(p.x, p.y) for p in env.game.platforms],
+                            [(p.x, p.y) for p in game.platforms])
+
+    def test_seeded_reset_is_repeatable(self):
+        """Test that resetting with a seed replays the same episode"""
+        env = JumperEnv()
+        runs = []
+        for _ in range(2):
+            obs, _ = env.reset(seed=9)
+            trace = [list(obs)]
+            for step in range(200):
+                obs, reward, terminated, truncated, _ = env.step(step % len(ACTIONS))
+                trace.append(list(obs) + [reward, terminated])
+                if terminated:
+                    break
+            runs.append(trace)
+        self.assertEqual(runs[0], runs[1])
+
+    def test_truncation(self):
+        """Test that an episode is cut off after max_steps"""
+        env = JumperEnv(seed=0, max_steps=5)
+        env.reset()
+        for _ in range(4):
+            self.assertFalse(env.step(0)[3])
+        self.assertTrue(env.step(0)[3])
+
+    def test_vector_env_matches_single_envs(self):
+        """Test that worker processes fill shared memory with the same results"""
+        seeds = [4, 5, 6]
+        actions = [[(step + i) % len(ACTIONS) for i in range(len(seeds))] for step in range(120)]
+        singles = [JumperEnv(seed=seed) for seed in seeds]
+        for env, seed in zip(singles, seeds):
+            env.reset(seed=seed)
+
+        with VectorEnv(len(seeds), seeds=seeds, workers=2) as vector:
+            rows = vector.reset().tolist()
+            for i, env in enumerate(singles):
+                self.assertEqual(rows[i], env.obs.tolist())
+            for step_actions in actions:
+                obs, rewards, terminated, truncated = vector.step(step_actions)
+                rows = obs.tolist()
+                for i, env in enumerate(singles):
+                    expected, reward, done, cut, _ = env.step(step_actions[i])
+                    self.assertEqual(rewards[i], reward)
+                    self.assertEqual(bool(terminated[i]), done)
+                    if done or cut:
+                        env.reset()
+                        expected = env.obs
+                    self.assertEqual(rows[i], expected.tolist())
+        self.assertEqual(vector.processes, [])
+
+    def tearDown(self):
+        pygame.quit()
+
+if __name__ == '__main__':
+    unittest.main()
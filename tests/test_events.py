@@ -0,0 +1,104 @@
+import os
+import unittest
+import pygame
+from src.constants import POWERUP_SLOW_MOTION
+from src.game import Game
+from src.powerup import PowerUp
+from src.events import EventBus, LAND, JUMP, POWERUP_COLLECTED, NEW_HIGH_SCORE, GAME_OVER
+
+class TestEventBus(unittest.TestCase):
+    def test_dispatch_in_order(self):
+        """Test that queued events reach their handlers in emit order"""
+        bus = EventBus()
+        seen = []
+        bus.subscribe(LAND, lambda x, y: seen.append(("land", x, y)))
+        bus.subscribe(JUMP, lambda x, y: seen.append(("jump", x, y)))
+        bus.emit(LAND, 1, 2)
+        bus.emit(JUMP, 3, 4)
+        bus.emit(LAND, 5, 6)
+        self.assertEqual(seen, [])
+        self.assertEqual(bus.dispatch(), 3)
+        self.assertEqual(seen, [("land", 1, 2), ("jump", 3, 4), ("land", 5, 6)])
+        self.assertEqual(bus.dispatch(), 0)
+
+    def test_handler_events_same_pass(self):
+        """Test that events emitted by a handler are delivered in the same dispatch"""
+        bus = EventBus()
+        seen = []
+        bus.subscribe(NEW_HIGH_SCORE, lambda score, old: bus.emit(GAME_OVER, score, old))
+        bus.subscribe(GAME_OVER, lambda score, high: seen.append(score))
+        bus.emit(NEW_HIGH_SCORE, 10, 5)
+        bus.dispatch()
+        self.assertEqual(seen, [10])
+
+    def test_unsubscribe(self):
+        """Test that an unsubscribed handler is no longer called"""
+        bus = EventBus()
+        seen = []
+        handler = lambda a, b: seen.append(a)
+        bus.subscribe(JUMP, handler)
+        bus.unsubscribe(JUMP, handler)
+        bus.emit(JUMP, 1)
+        bus.dispatch()
+        self.assertEqual(seen, [])
+
+class TestGameEvents(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        if os.path.exists("high_score.json"):
+            os.remove("high_score.json")
+        self.game = Game()
+        self.seen = []
+        for event_type in (LAND, JUMP, POWERUP_COLLECTED, NEW_HIGH_SCORE, GAME_OVER):
+            self.game.events.subscribe(event_type,
+                                       lambda a, b, t=event_type: self.seen.append((t, a, b)))
+
+    def test_landing_event(self):
+        """Test that a landing is reported once and handled after the frame"""
+        player = self.game.player
+        player.vel_y = 5
+        player.y -= 2
+        self.game.update()
+        self.assertEqual([e[0] for e in self.seen if e[0] == LAND], [LAND])
+        self.assertEqual(self.game.total_jumps, 1)
+        self.assertGreater(len(self.game.particles.particles), 0)
+        self.assertEqual(self.game.events.queue, [])
+
+    def test_powerup_event_applies_effect(self):
+        """Test that collecting a power-up is applied through its event"""
+        player = self.game.player
+        self.game.powerups.append(PowerUp(player.rect.x, player.rect.y, POWERUP_SLOW_MOTION))
+        self.game.update()
+        self.assertIn((POWERUP_COLLECTED, POWERUP_SLOW_MOTION, 0), self.seen)
+        self.assertGreater(player.slow_motion_timer, 0)
+
+    def test_jump_only_counted_when_taken(self):
+        """Test that a jump without double jumps left is not reported"""
+        player = self.game.player
+        player.vel_y = 5
+        player.double_jumps_left = 0
+        self.assertFalse(self.game.jump())
+        player.double_jumps_left = 1
+        self.assertTrue(self.game.jump())
+        self.game.events.dispatch()
+        self.assertEqual([e[0] for e in self.seen], [JUMP])
+        self.assertEqual(self.game.total_jumps, 1)
+
+    def test_new_high_score_once_per_run(self):
+        """Test that beating the high score is reported only the first time in a run"""
+        self.game.high_score = 5
+        for _ in range(2):
+            self.game.player.y -= 100
+            self.game.update()
+        records = [e for e in self.seen if e[0] == NEW_HIGH_SCORE]
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0][2], 5)
+
+    def test_game_over_delivered_before_restart(self):
+        """Test that a game over ended outside update is still delivered"""
+        self.game.end_game()
+        self.game.init_game()
+        self.assertEqual([e[0] for e in self.seen], [GAME_OVER])
+
+if __name__ == '__main__':
+    unittest.main()
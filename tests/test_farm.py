@@ -0,0 +1,60 @@
+import unittest
+import pygame
+from src.farm import FarmReport, SeedResult, run_farm, run_seed
+
+class TestFarm(unittest.TestCase):
+    def test_run_seed_is_deterministic(self):
+        """Test that a seed always plays out the same way"""
+        first = run_seed(11, max_frames=3000)
+        self.assertEqual(first, run_seed(11, max_frames=3000))
+        seed, height, cause, frames, powerups = first
+        self.assertEqual(seed, 11)
+        self.assertIn(cause, ("bottom", "fall", "stalled", "timeout"))
+        self.assertLessEqual(frames, 3000)
+        self.assertGreaterEqual(height, 0)
+
+    def test_run_seed_stops_at_frame_limit(self):
+        """Test that a run still alive at the frame limit is reported as a timeout"""
+        seed, height, cause, frames, powerups = run_seed(5, max_frames=50)
+        self.assertEqual(cause, "timeout")
+        self.assertEqual(frames, 50)
+
+    def test_report_summary(self):
+        """Test that the report aggregates causes, heights and pickups"""
+        results = [SeedResult(0, 100, "fall", 600, 1),
+                   SeedResult(1, 300, "fall", 1800, 2),
+                   SeedResult(2, 200, "stalled", 1200, 0),
+                   SeedResult(3, 400, "timeout", 3600, 3)]
+        summary = FarmReport(results).summary()
+        self.assertEqual(summary["seeds"], 4)
+        self.assertEqual(summary["causes"], {"fall": 2, "stalled": 1, "timeout": 1})
+        self.assertEqual(summary["height"]["mean"], 250)
+        self.assertEqual(summary["height"]["median"], 200)
+        self.assertEqual(summary["height"]["max"], 400)
+        self.assertEqual(summary["frames_to_death"]["deaths"], 2)
+        self.assertEqual(summary["frames_to_death"]["mean"], 1200)
+        # 7200 frames is two minutes of play
+        self.assertEqual(summary["powerups_per_minute"], 3)
+        self.assertIn("fall 2", FarmReport(results).format())
+
+    def test_farm_matches_single_runs(self):
+        """Test that worker processes give the same results as running seeds in-process"""
+        report = run_farm(range(4), workers=2, max_frames=600, chunksize=1, wobble=0.1)
+        self.assertEqual([r.seed for r in report.results], [0, 1, 2, 3])
+        for result in report.results:
+            expected = run_seed(result.seed, max_frames=600, wobble=0.1)
+            self.assertEqual((result.seed, result.height, result.cause,
+                              result.frames, result.powerups), expected)
+
+    def test_autoplayer_takes_wrap_routes(self):
+        """Test that the autoplayer repositions for a jump that only works across the wrap"""
+        # Seed 0 reaches (672, -3008) from (186, -2899) by leaving the left edge
+        seed, height, cause, frames, powerups = run_seed(0, max_frames=4000)
+        self.assertNotEqual(cause, "stalled")
+        self.assertGreater(height, 1000)
+
+    def tearDown(self):
+        pygame.quit()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,12 +1,15 @@
 import unittest
 import pygame
 import os
-import json
-from main import (
-    Game, Player, Platform, PowerUp, SCREEN_WIDTH, SCREEN_HEIGHT, 
-    MAX_FALL_DISTANCE, PLATFORM_WIDTH, MIN_PLATFORM_WIDTH,
-    SAFE_VERTICAL_GAP, POWERUP_DOUBLE_JUMP, POWERUP_BIG_PLATFORMS, POWERUP_SLOW_MOTION
+from src.constants import (
+    SCREEN_WIDTH, SCREEN_HEIGHT, MAX_FALL_DISTANCE, PLATFORM_WIDTH, MIN_PLATFORM_WIDTH,
+    POWERUP_DOUBLE_JUMP, POWERUP_BIG_PLATFORMS, POWERUP_SLOW_MOTION,
+    POWERUP_SHIELD, POWERUP_MAGNET, POWERUP_SUPER_JUMP, JUMP_SPEED, MAGNET_RADIUS
 )
+from src.game import Game
+from src.platform import Platform
+from src.player import Player
+from src.powerup import PowerUp
 
 class TestGame(unittest.TestCase):
     def setUp(self):
@@ -32,7 +35,6 @@ class TestGame(unittest.TestCase):
         """Test that player's fall speed is limited"""
         # Move player up to create falling scenario
         self.game.player.y -= 500
-        self.game.player.rect.y = self.game.player.y
         
         # Update several times to build up fall speed
         for _ in range(20):
@@ -45,7 +47,6 @@ class TestGame(unittest.TestCase):
         """Test that falling too far without hitting a platform ends the game"""
         # Move player up to create falling scenario
         self.game.player.y -= MAX_FALL_DISTANCE + 10
-        self.game.player.rect.y = self.game.player.y
         self.game.player.is_falling = True
         self.game.player.fall_start_y = self.game.player.y - (MAX_FALL_DISTANCE + 5)
         
@@ -90,7 +91,6 @@ class TestGame(unittest.TestCase):
         """Test that game can be restarted after game over"""
         # Force game over
         self.game.game_over = True
-        initial_score = self.game.score
         
         # Create restart event
         restart_event = pygame.event.Event(pygame.KEYDOWN, {'key': pygame.K_r})
@@ -168,6 +168,21 @@ class TestGame(unittest.TestCase):
         self.assertLess(self.game.player.vel_y, initial_vel_y)
         self.assertEqual(self.game.player.double_jumps_left, 1)
 
+    def test_apply_input_reports_changed_players(self):
+        """Test that apply_input flags a player only when the keys changed their movement"""
+        from src.game import KEY_PLAYERS
+        keys = dict.fromkeys(KEY_PLAYERS, 0)
+        keys[pygame.K_RIGHT] = 1
+        self.assertEqual(self.game.apply_input(keys), 1)
+        self.assertEqual(self.game.apply_input(keys), 0)
+
+        keys[pygame.K_UP] = 1
+        self.game.player.double_jumps_left = 0
+        self.assertEqual(self.game.apply_input(keys), 0)
+        self.game.player.double_jumps_left = 1
+        self.game.player.vel_y = 5
+        self.assertEqual(self.game.apply_input(keys), 1)
+
     def test_big_platforms_powerup(self):
         """Test big platforms power-up functionality"""
         # Create a normal platform
@@ -193,6 +208,71 @@ class TestGame(unittest.TestCase):
         # Velocity should increase more slowly due to reduced gravity
         self.assertLess(self.game.player.vel_y - initial_vel_y, 0.6)  # Normal gravity is 0.6
 
+    def test_slow_motion_steering_is_not_rounded(self):
+        """Test that half-speed steering moves the same distance either way"""
+        player = Player(400, 100)
+        player.slow_motion_timer = 100
+        player.vel_x = 5
+        player.update()
+        self.assertEqual(player.x, 402.5)
+        player.vel_x = -5
+        player.update()
+        self.assertEqual(player.x, 400)
+        # Rects are only built for drawing, from the float position
+        self.assertEqual(player.rect.topleft, (round(player.x), round(player.y)))
+
+    def test_shield_powerup(self):
+        """Test that a shield saves the player from one fatal fall"""
+        player = self.game.player
+        self.game.powerups.append(PowerUp(player.rect.x, player.rect.y, POWERUP_SHIELD))
+        self.game.update()
+        self.assertGreater(player.shield_timer, 0)
+
+        # Drop the player from well above the fall limit
+        player.vel_y = 10
+        player.is_falling = True
+        player.fall_start_y = player.y - MAX_FALL_DISTANCE - 50
+        self.game.update()
+        self.assertFalse(self.game.game_over)
+        self.assertEqual(player.shield_timer, 0)
+        self.assertLess(player.vel_y, JUMP_SPEED)
+
+        # The next fall is fatal again
+        player.vel_y = 10
+        player.is_falling = True
+        player.fall_start_y = player.y - MAX_FALL_DISTANCE - 50
+        self.game.update()
+        self.assertTrue(self.game.game_over)
+
+    def test_super_jump_powerup(self):
+        """Test that super jump makes platform bounces stronger"""
+        player = self.game.player
+        self.game.on_powerup_collected(POWERUP_SUPER_JUMP, 0)
+        self.assertGreater(player.super_jump_timer, 0)
+        self.assertLess(player.bounce_speed(), JUMP_SPEED)
+        player.super_jump_timer = 0
+        self.assertEqual(player.bounce_speed(), JUMP_SPEED)
+
+    def test_magnet_powerup(self):
+        """Test that a magnet pulls in nearby power-ups and leaves distant ones"""
+        player = self.game.player
+        self.game.on_powerup_collected(POWERUP_MAGNET, 0)
+        near = PowerUp(player.rect.centerx + 100, player.rect.y - 100, POWERUP_DOUBLE_JUMP)
+        far = PowerUp(player.rect.centerx + MAGNET_RADIUS + 100, player.rect.y - 300, POWERUP_DOUBLE_JUMP)
+        self.game.powerups.extend([near, far])
+        far_position = far.rect.topleft
+
+        start = abs(near.rect.centerx - player.rect.centerx)
+        self.game.update()
+        self.assertLess(abs(near.rect.centerx - player.rect.centerx), start)
+        self.assertEqual(far.rect.topleft, far_position)
+
+        for _ in range(60):
+            self.game.update()
+        self.assertNotIn(near, self.game.powerups)
+        self.assertIn(far, self.game.powerups)
+        self.assertEqual(player.double_jumps_left, 2)
+
     def test_high_score_system(self):
         """Test high score loading and saving"""
         # Set a high score
@@ -304,9 +384,7 @@ class TestGame(unittest.TestCase):
         self.game.platforms = [Platform(SCREEN_WIDTH // 2, SCREEN_HEIGHT - 100, PLATFORM_WIDTH)]
         
         # Generate platforms at low difficulty
-        initial_platform_count = len(self.game.platforms)
         self.game.update()
-        low_diff_count = len(self.game.platforms)
         
         # Reset and test high difficulty
         self.game.platforms = [Platform(SCREEN_WIDTH // 2, -2000, PLATFORM_WIDTH)]
@@ -0,0 +1,112 @@
+import json
+import os
+import unittest
+import pygame
+from src.game import Game
+from src.ghost import (GhostRecorder, GhostPlayer, CHUNK, MAX_FRAME_BYTES,
+                       zigzag, unzigzag)
+
+class TestGhostTrack(unittest.TestCase):
+    def test_zigzag(self):
+        """Test that zigzag encoding maps small signed values to small unsigned ones"""
+        self.assertEqual([zigzag(v) for v in (0, -1, 1, -2, 2)], [0, 1, 2, 3, 4])
+        for value in (-1000, -3, 0, 7, 123456):
+            self.assertEqual(unzigzag(zigzag(value)), value)
+
+    def test_roundtrip(self):
+        """Test that a track plays back exactly as recorded, including wraps"""
+        positions = [(x * 6 % 840 - 40, 500 - x * 3 + (x % 7) ** 2) for x in range(500)]
+        recorder = GhostRecorder()
+        for x, y in positions:
+            recorder.record(x, y)
+        player = GhostPlayer(recorder.encode())
+        played = []
+        while not player.finished():
+            played.append(player.next())
+        self.assertEqual(played, positions)
+        self.assertIsNone(player.next())
+
+    def test_long_climb_stays_small(self):
+        """Test that ten minutes of bouncing encodes to a few kilobytes"""
+        recorder = GhostRecorder()
+        x, y, vel_y = 400, 500.0, -16.0
+        for frame in range(60 * 60 * 10):
+            vel_y += 0.6
+            if vel_y > 16:
+                vel_y = -16.0
+            x = (x + (6 if (frame // 90) % 2 else -6)) % 840
+            y += vel_y
+            recorder.record(x, int(y))
+        self.assertLess(len(recorder.encode()), 8 * 1024)
+
+    def test_playback_streams(self):
+        """Test that playback only keeps a small window of decoded data"""
+        recorder = GhostRecorder()
+        for frame in range(5000):
+            recorder.record(frame * 3 % 800, -frame)
+        player = GhostPlayer(recorder.encode())
+        for _ in range(5000):
+            player.next()
+            self.assertLessEqual(len(player.buffer), CHUNK + MAX_FRAME_BYTES)
+
+    def test_seek(self):
+        """Test that seeking either way lands where the same number of next() calls would"""
+        recorder = GhostRecorder()
+        for frame in range(300):
+            recorder.record(frame * 5 % 800, 400 - frame * 2)
+        player = GhostPlayer(recorder.encode())
+        played = [player.next() for _ in range(301)]
+        self.assertEqual(player.seek(120), played[119])
+        self.assertEqual(player.next(), played[120])
+        self.assertEqual(player.seek(250), played[249])
+        self.assertIsNone(player.seek(0))
+        self.assertIsNone(player.seek(301))
+
+    def test_rejects_bad_data(self):
+        """Test that data that is not a ghost track is refused"""
+        with self.assertRaises(ValueError):
+            GhostPlayer(b"NOPE\x01\x00\x00\x00\x00")
+
+class TestGameGhost(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        if os.path.exists("high_score.json"):
+            os.remove("high_score.json")
+
+    def tearDown(self):
+        if os.path.exists("high_score.json"):
+            os.remove("high_score.json")
+
+    def test_record_run_becomes_ghost(self):
+        """Test that a record run is saved and raced as a ghost in the next game"""
+        game = Game(seed=2)
+        path = []
+        record = game.recorder.record
+        def capture(x, y):
+            path.append((x, y))
+            record(x, y)
+        game.recorder.record = capture
+        for frame in range(120):
+            game.player.vel_x = 6 if (frame // 30) % 2 else -6
+            game.update()
+        game.end_game()
+        with open("high_score.json") as f:
+            self.assertIn("ghost", json.load(f))
+
+        rival = Game(seed=5)
+        self.assertIsNotNone(rival.ghost)
+        for expected in path[:60]:
+            rival.update()
+            self.assertEqual(rival.ghost_position, expected)
+        rival.draw()
+
+    def test_corrupt_ghost_ignored(self):
+        """Test that an unreadable ghost does not stop the game from loading"""
+        with open("high_score.json", "w") as f:
+            json.dump({"high_score": 50, "ghost": "not base64!"}, f)
+        game = Game()
+        self.assertEqual(game.high_score, 50)
+        self.assertIsNone(game.ghost)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+import json
+import os
+import socket
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pygame
+from src.game import Game
+from src.leaderboard import BATCH_SIZE, LeaderboardClient, Outbox
+
+class LeaderboardHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def do_POST(self):
+        runs = json.loads(self.rfile.read(int(self.headers["Content-Length"])))["runs"]
+        self.server.batches.append(len(runs))
+        for run in runs:
+            self.server.runs[run["id"]] = run
+        self.reply({"accepted": len(runs)})
+
+    def do_GET(self):
+        limit = int(self.path.rsplit("=", 1)[1])
+        top = sorted(self.server.runs.values(), key=lambda run: -run["score"])[:limit]
+        self.reply({"top": [{"name": run["name"], "score": run["score"]} for run in top]})
+
+    def reply(self, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+class FinishedGame:
+    def __init__(self, score):
+        self.score = score
+        self.start_time = 0
+        self.end_time = 12000
+        self.total_jumps = 30
+        self.powerups_collected = 2
+
+class TestLeaderboard(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.outbox_path = os.path.join(self.tmp.name, "outbox.json")
+        self.server = None
+
+    def start_server(self, port=0):
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), LeaderboardHandler)
+        self.server.daemon_threads = True
+        self.server.connections = 0
+        self.server.batches = []
+        self.server.runs = {}
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self.server.server_address[1]
+
+    def wait_for(self, condition):
+        deadline = time.monotonic() + 5
+        while not condition():
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.01)
+
+    def test_batches_share_one_connection(self):
+        """Test that runs upload in batches over one connection and fill the top table"""
+        port = self.start_server()
+        client = LeaderboardClient(f"http://127.0.0.1:{port}/api", self.outbox_path, top_count=3)
+        for score in range(BATCH_SIZE + 5):
+            client.submit(FinishedGame(score))
+        self.wait_for(lambda: client.uploaded == BATCH_SIZE + 5 and len(client.top) == 3)
+        client.close()
+        self.assertEqual(client.top, (("Player", 24), ("Player", 23), ("Player", 22)))
+        self.assertEqual(self.server.connections, 1)
+        self.assertTrue(all(size <= BATCH_SIZE for size in self.server.batches))
+        self.assertEqual(Outbox(self.outbox_path).runs, [])
+        run = next(iter(self.server.runs.values()))
+        self.assertEqual((run["time"], run["jumps"], run["powerups"]), (12.0, 30, 2))
+
+    def test_offline_runs_survive_until_the_server_is_back(self):
+        """Test that runs stay in the outbox while offline and upload on a later start"""
+        with socket.socket() as probe:
+            probe.bind(("127.0.0.1", 0))
+            port = probe.getsockname()[1]
+        client = LeaderboardClient(f"http://127.0.0.1:{port}", self.outbox_path,
+                                   timeout=0.5, backoff=(0.01, 0.05))
+        client.submit(FinishedGame(100))
+        client.submit(FinishedGame(50))
+        self.wait_for(lambda: client.failures >= 3)
+        client.close()
+        self.assertEqual(len(Outbox(self.outbox_path).runs), 2)
+        self.assertEqual(client.top, ())
+
+        self.start_server(port)
+        client = LeaderboardClient(f"http://127.0.0.1:{port}", self.outbox_path)
+        self.wait_for(lambda: client.top)
+        client.close()
+        self.assertEqual(client.uploaded, 2)
+        self.assertEqual(client.top[0], ("Player", 100))
+        self.assertEqual(Outbox(self.outbox_path).runs, [])
+
+    def test_game_submits_finished_runs(self):
+        """Test that a game hands each finished run to the leaderboard once"""
+        class Recorder:
+            top = ()
+            def __init__(self):
+                self.scores = []
+            def submit(self, game):
+                self.scores.append(game.score)
+
+        pygame.init()
+        try:
+            recorder = Recorder()
+            game = Game(seed=2, high_score_path=None, leaderboard=recorder)
+            game.score = 42
+            game.end_game()
+            game.end_game()
+            game.events.dispatch()
+            game.draw()
+            self.assertEqual(recorder.scores, [42])
+        finally:
+            pygame.quit()
+
+    def tearDown(self):
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+        self.tmp.cleanup()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+import time
+import unittest
+import pygame
+from main import GameManager
+from src.game import KEY_PLAYERS
+from src.pacing import FramePacer
+from src.performance import PerformanceMonitor
+
+class TestFramePacer(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+
+    def test_hybrid_holds_interval(self):
+        """Test that hybrid pacing averages the configured frame interval"""
+        pacer = FramePacer(100, "hybrid")
+        pacer.wait()
+        start = time.perf_counter()
+        for _ in range(20):
+            time.sleep(0.002)
+            pacer.wait()
+        elapsed = time.perf_counter() - start
+        self.assertAlmostEqual(elapsed, 0.2, delta=0.02)
+
+    def test_resyncs_after_stall(self):
+        """Test that a long frame does not cause a burst of unpaced frames"""
+        pacer = FramePacer(100, "hybrid")
+        pacer.wait()
+        time.sleep(0.05)
+        self.assertEqual(pacer.wait(), 0)
+        start = time.perf_counter()
+        pacer.wait()
+        self.assertGreater(time.perf_counter() - start, 0.008)
+
+    def test_tick_modes(self):
+        """Test that the pygame clock modes return the elapsed milliseconds"""
+        for mode in ("tick", "busy"):
+            pacer = FramePacer(200, mode)
+            pacer.wait()
+            self.assertGreaterEqual(pacer.wait(), 4)
+
+    def test_unknown_mode(self):
+        """Test that an unknown pacing mode is rejected"""
+        with self.assertRaises(ValueError):
+            FramePacer(60, "sleepy")
+
+    def test_jitter(self):
+        """Test that jitter is the spread of frame intervals"""
+        monitor = PerformanceMonitor()
+        monitor.frame_times.extend([0.016] * 10)
+        self.assertAlmostEqual(monitor.get_jitter_ms(), 0.0)
+        monitor.frame_times.extend([0.012, 0.020] * 5)
+        self.assertAlmostEqual(monitor.get_jitter_ms(), 8 ** 0.5, places=6)
+
+    def test_overlay_is_drawn_when_toggled(self):
+        """Test that F3 toggles the performance overlay the run loop draws"""
+        manager = GameManager()
+        drawn = []
+        manager.performance.draw_stats = lambda screen, x=10, y=10: drawn.append(x)
+        pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_F3, mod=0))
+        pygame.event.post(pygame.event.Event(pygame.QUIT))
+        manager.run()
+        self.assertEqual(len(drawn), 1)
+
+    def test_overlay_lines(self):
+        """Test that the overlay draws its stats onto the screen"""
+        monitor = PerformanceMonitor()
+        monitor.frame_times.extend([0.016] * 10)
+        screen = pygame.Surface((300, 120))
+        monitor.draw_stats(screen)
+        white = pygame.mask.from_threshold(screen, (255, 255, 255), (1, 1, 1, 255))
+        self.assertGreater(white.count(), 0)
+
+    def test_late_input_wait(self):
+        """Test that late input sampling only holds the frame back under vsync"""
+        self.assertEqual(FramePacer(100, "hybrid").wait_for_input(0.004), 0)
+        pacer = FramePacer(100, "vsync")
+        start = time.perf_counter()
+        waited = pacer.wait_for_input(0.004)
+        elapsed = time.perf_counter() - start
+        self.assertAlmostEqual(waited, 4, places=6)
+        self.assertGreaterEqual(elapsed, 0.004)
+        self.assertEqual(pacer.wait_for_input(0.02), 0)
+
+    def test_late_input_waits_under_vsync(self):
+        """Test that the lead comes from the pre-flip work, so late input really waits"""
+        monitor = PerformanceMonitor()
+        for _ in range(5):
+            monitor.start_work()
+            time.sleep(0.001)
+            monitor.end_draw()
+            # flip() blocking until the refresh
+            time.sleep(0.015)
+            monitor.end_work()
+        pacer = FramePacer(60, "vsync")
+        # The whole frame's work would leave no room to wait at all
+        self.assertEqual(pacer.wait_for_input(monitor.get_percentile_ms(95) / 1000), 0)
+        lead = monitor.get_percentile_ms(95, monitor.draw_times) / 1000
+        self.assertLess(lead, 0.01)
+        start = time.perf_counter()
+        self.assertGreater(pacer.wait_for_input(lead), 0)
+        self.assertGreater(time.perf_counter() - start, 0.004)
+
+    def test_input_latency(self):
+        """Test that key events are timed from pump to use and to the flip"""
+        monitor = PerformanceMonitor()
+        events = [pygame.event.Event(pygame.KEYDOWN, key=pygame.K_RIGHT),
+                  pygame.event.Event(pygame.KEYDOWN, key=pygame.K_a),
+                  pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE)]
+        monitor.input_pumped(events, KEY_PLAYERS)
+        time.sleep(0.002)
+        # Only player 1's movement changed
+        monitor.input_applied(0b1)
+        time.sleep(0.002)
+        monitor.frame_presented()
+        self.assertEqual(len(monitor.input_applied_times), 1)
+        self.assertGreaterEqual(monitor.input_applied_times[0], 0.002)
+        self.assertGreaterEqual(monitor.input_presented_times[0], 0.004)
+
+        # Input a frame never applied is not carried into the next one
+        monitor.input_pumped(events, KEY_PLAYERS)
+        monitor.frame_presented()
+        monitor.input_applied(0b11)
+        monitor.frame_presented()
+        self.assertEqual(len(monitor.input_presented_times), 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+import unittest
+import pygame
+from src.constants import SCREEN_HEIGHT, CRUMBLE_FRAMES
+from src.game import Game
+from src.platform import Platform
+from src.platform import PlatformScheduler, wave_offset
+from src.spatial import SpatialGrid
+
+def moving_platform(y, axis="x"):
+    platform = Platform(300, y, 120, "moving")
+    platform.set_motion(axis, 60, 120, 0)
+    return platform
+
+class TestPlatformScheduler(unittest.TestCase):
+    def setUp(self):
+        self.grid = SpatialGrid(100)
+        self.scheduler = PlatformScheduler()
+
+    def add(self, platform):
+        self.grid.insert(platform, platform.x, platform.y, platform.x + platform.reach, platform.y)
+        self.scheduler.add(platform)
+
+    def test_only_platforms_near_the_camera_move(self):
+        """Test that moving platforms outside the band sleep and catch up on waking"""
+        near = moving_platform(400)
+        far = moving_platform(-2000)
+        self.add(near)
+        self.add(far)
+        self.scheduler.tick(30, 0, SCREEN_HEIGHT, self.grid)
+        self.assertEqual(near.x, near.home_x + wave_offset(30, 60, 120, 0))
+        self.assertEqual(far.x, far.home_x)
+
+        self.scheduler.tick(45, -2200, -1400, self.grid)
+        self.assertEqual(far.x, far.home_x + wave_offset(45, 60, 120, 0))
+        self.assertEqual(near.x, near.home_x + wave_offset(30, 60, 120, 0))
+
+    def test_grid_follows_moving_platforms(self):
+        """Test that the collision grid finds a platform where it has moved to"""
+        platform = moving_platform(400)
+        self.add(platform)
+        self.scheduler.tick(60, 0, SCREEN_HEIGHT, self.grid)
+        right = platform.x
+        self.assertEqual(self.grid.query(right, 400, right + 10, 400), [platform])
+        self.scheduler.tick(120, 0, SCREEN_HEIGHT, self.grid)
+        left = platform.x
+        self.assertLess(left, right)
+        # Its old right end is in a cell it has left
+        self.assertEqual(list(self.grid.query(right + platform.reach - 10, 400, right + platform.reach, 400)), [])
+        self.assertEqual(self.grid.query(left, 400, left + 10, 400), [platform])
+
+    def test_culling_drops_sleeping_platforms(self):
+        """Test that culled platforms leave the scheduler"""
+        low = moving_platform(900)
+        high = moving_platform(300)
+        self.add(low)
+        self.add(high)
+        self.scheduler.tick(10, 0, 1000, self.grid)
+        self.scheduler.cull(800)
+        self.assertEqual(self.scheduler.movers, [high])
+        self.scheduler.tick(11, 0, SCREEN_HEIGHT, self.grid)
+        self.assertEqual(high.x, high.home_x + wave_offset(11, 60, 120, 0))
+
+class TestCrumblingPlatforms(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        self.game = Game(seed=3, high_score_path=None)
+
+    def test_crumbling_platform_gives_way(self):
+        """Test that a crumbling platform holds one landing and then drops out"""
+        game = self.game
+        start = game.platforms[0]
+        start.type = "crumbling"
+        # The second platform shares the first one's height
+        del game.platforms[1]
+        # Land on it once
+        for _ in range(200):
+            game.update()
+            if start.crumble_timer >= 0:
+                break
+        self.assertEqual(start.crumble_timer, CRUMBLE_FRAMES)
+        for _ in range(CRUMBLE_FRAMES):
+            game.update()
+        self.assertTrue(start.crumbled)
+        self.assertNotIn(start, game.platform_grid)
+
+        # The next fall goes straight through
+        for _ in range(200):
+            game.update()
+            if game.game_over:
+                break
+        self.assertTrue(game.game_over)
+
+    def test_snapshot_keeps_platform_motion(self):
+        """Test that moving and crumbling state survives a snapshot"""
+        game = self.game
+        mover = moving_platform(350, "y")
+        game.platforms.append(mover)
+        game.platforms[1].type = "crumbling"
+        game.platforms[1].crumble_timer = 12
+        for _ in range(5):
+            game.update()
+        data = game.snapshot()
+        other = Game(seed=8, high_score_path=None)
+        other.restore(data)
+        self.assertEqual(other.snapshot(), data)
+        for _ in range(20):
+            game.update()
+            other.update()
+        self.assertEqual(other.platforms[-1].rect, game.platforms[-1].rect)
+        self.assertNotEqual(mover.y, mover.home_y)
+        self.assertTrue(other.platforms[1].crumbled)
+
+    def tearDown(self):
+        pygame.quit()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import io
+import os
+import pstats
+import tempfile
+import time
+import unittest
+from src.profiler import SamplingProfiler
+
+def spin(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+def work(profiler):
+    profiler.phase = "update"
+    spin(0.15)
+    profiler.phase = "pacing"
+    time.sleep(0.15)
+
+class TestSamplingProfiler(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def test_collapsed_stacks_by_phase(self):
+        """Test that samples land under the phase and stack that was running"""
+        profiler = SamplingProfiler(interval=0.002, output_dir=self.tmp.name)
+        profiler.start(duration=10)
+        work(profiler)
+        profiler.stop()
+
+        self.assertEqual(len(profiler.paths), 1)
+        with open(profiler.paths[0]) as f:
+            lines = f.read().splitlines()
+        stacks = {line.rsplit(" ", 1)[0]: int(line.rsplit(" ", 1)[1]) for line in lines}
+        spinning = sum(count for stack, count in stacks.items()
+                       if stack.startswith("update;") and "test_profiler.py:work;test_profiler.py:spin" in stack)
+        sleeping = sum(count for stack, count in stacks.items()
+                       if stack.startswith("pacing;") and stack.endswith("test_profiler.py:work"))
+        self.assertGreater(spinning, 10)
+        self.assertGreater(sleeping, 10)
+        shares = dict(profiler.phase_shares())
+        self.assertGreater(shares["update"], 0.2)
+        self.assertGreater(shares["pacing"], 0.2)
+
+    def test_pstats_dump_and_duration(self):
+        """Test that a session ends on its own and its pstats file loads"""
+        profiler = SamplingProfiler(interval=0.002, output_dir=self.tmp.name, pstats=True)
+        profiler.start(duration=0.2)
+        spin(0.3)
+        profiler.thread.join(5)
+        self.assertFalse(profiler.running)
+        profiler.stop()
+
+        prof = [path for path in profiler.paths if path.endswith(".prof")]
+        self.assertEqual(len(prof), 1)
+        stats = pstats.Stats(prof[0], stream=io.StringIO())
+        spin_stats = [value for (filename, _, name), value in stats.stats.items()
+                      if name == "spin" and os.path.basename(filename) == "test_profiler.py"]
+        self.assertEqual(len(spin_stats), 1)
+        calls, _, own, inclusive, callers = spin_stats[0]
+        self.assertGreater(own, 0.1)
+        self.assertGreaterEqual(inclusive, own)
+        self.assertIn("test_pstats_dump_and_duration", [name for _, _, name in callers])
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import unittest
+import pygame
+from src.constants import PLATFORM_WIDTH
+from src.game import Game
+from src.platform import Platform
+from src.performance import PerformanceMonitor
+from src.quality import QualityGovernor, QUALITY_LEVELS
+
+class TestQualityGovernor(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        self.monitor = PerformanceMonitor(max_samples=20)
+        self.governor = QualityGovernor(budget_ms=10, degrade_after=5,
+                                        restore_after=20, cooldown_frames=20)
+
+    def run_frames(self, frame_ms, frames):
+        for _ in range(frames):
+            self.monitor.work_times.append(frame_ms / 1000.0)
+            self.governor.update(self.monitor)
+
+    def test_degrades_progressively(self):
+        """Test that sustained slow frames step quality down one level at a time"""
+        self.run_frames(15, 5)
+        self.assertEqual(self.governor.level_index, 1)
+
+        # Nothing changes during the cooldown after a step
+        self.run_frames(15, 20)
+        self.assertEqual(self.governor.level_index, 1)
+
+        self.run_frames(15, 200)
+        self.assertEqual(self.governor.level_index, len(QUALITY_LEVELS) - 1)
+        self.assertEqual(self.governor.particle_density, 0.0)
+        self.assertFalse(self.governor.trail)
+        self.assertFalse(self.governor.platform_borders)
+
+    def test_restores_with_hysteresis(self):
+        """Test that quality only comes back once there is clear headroom"""
+        self.governor.set_level(2)
+        self.governor.cooldown = 0
+
+        # Just under budget is not enough headroom to restore
+        self.run_frames(9, 100)
+        self.assertEqual(self.governor.level_index, 2)
+
+        # The old frames have to leave the window before the streak counts
+        self.run_frames(2, 30)
+        self.assertEqual(self.governor.level_index, 2)
+        self.run_frames(2, 10)
+        self.assertEqual(self.governor.level_index, 1)
+        self.run_frames(2, 40)
+        self.assertEqual(self.governor.level_index, 0)
+
+    def test_percentile_uses_work_times(self):
+        """Test that the rolling percentile ignores a few outliers"""
+        for i in range(20):
+            self.monitor.work_times.append(0.020 if i == 0 else 0.005)
+        self.assertAlmostEqual(self.monitor.get_percentile_ms(95), 5.0)
+        self.assertAlmostEqual(self.monitor.get_percentile_ms(100), 20.0)
+
+    def test_game_applies_quality_level(self):
+        """Test that the game sheds particles and the HUD refresh rate"""
+        game = Game(quality=self.governor)
+        self.governor.set_level(len(QUALITY_LEVELS) - 1)
+
+        game.player.vel_y = 5
+        game.update()
+        game.particles.add_explosion(100, 100, count=10)
+        self.assertEqual(len(game.particles.particles), 0)
+
+        game.draw()
+        hud = list(game.hud_lines)
+        game.score += 100
+        game.draw()
+        # The HUD is replayed until the refresh interval elapses
+        self.assertEqual(game.hud_lines, hud)
+
+    def test_platform_border_toggle(self):
+        """Test that special platforms can skip their border"""
+        screen = pygame.Surface((PLATFORM_WIDTH + 20, 40))
+        platform = Platform(10, 10, PLATFORM_WIDTH, "special")
+        platform.draw(screen, 0, detailed=False)
+        self.assertNotEqual(screen.get_at((12, 12))[:3], (255, 255, 255))
+        platform.draw(screen, 0, detailed=True)
+        self.assertEqual(screen.get_at((12, 12))[:3], (255, 255, 255))
+
+    def tearDown(self):
+        pygame.quit()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+import pygame
+from src.constants import SAFE_HORIZONTAL_DISTANCE, SAFE_VERTICAL_GAP, JUMP_SPEED, MOVE_SPEED
+from src.game import Game
+from src.player import Player
+from src.reachability import (NORMAL, SLOW_MOTION, max_reach, horizontal_gap,
+                              is_reachable, validate_level, WRAP_PERIOD)
+
+def simulate_reach(gap, slow):
+    # Bounce a real Player and measure how far it gets sideways before its
+    # feet come back down through `gap` pixels above the take-off point
+    player = Player(0, 1000)
+    player.vel_y = JUMP_SPEED
+    player.vel_x = MOVE_SPEED
+    if slow:
+        player.slow_motion_timer = 10000
+    take_off = player.y
+    start_x = player.rect.x
+    while True:
+        player.update()
+        if player.vel_y > 0 and take_off - player.rect.y <= gap:
+            return player.rect.x - start_x
+
+class TestReachability(unittest.TestCase):
+    def test_table_matches_player_physics(self):
+        """Test that the table never promises more reach than Player.update gives"""
+        for table, slow in ((NORMAL, False), (SLOW_MOTION, True)):
+            for gap in range(max(table.min_gap, 0), table.max_gap + 1, 7):
+                reach = table.get(gap)
+                self.assertLessEqual(reach, simulate_reach(gap, slow))
+                # ...and stays within a couple of frames of it
+                self.assertGreater(reach, simulate_reach(gap, slow) - 3 * MOVE_SPEED)
+
+    def test_safe_constants_agree(self):
+        """Test that the safe gap constants are within the jump model"""
+        self.assertGreaterEqual(max_reach(SAFE_VERTICAL_GAP), SAFE_HORIZONTAL_DISTANCE)
+        self.assertEqual(max_reach(int(NORMAL.apex) + 1), -1)
+
+    def test_horizontal_gap_wraps(self):
+        """Test that platforms on opposite edges are close through the wrap"""
+        self.assertEqual(horizontal_gap(100, 100, 150, 100), 0)
+        self.assertEqual(horizontal_gap(0, 100, 400, 100), 260)
+        self.assertEqual(horizontal_gap(0, 100, 700, 100), 1)
+        self.assertLess(horizontal_gap(10, 90, 800 - 90, 90), WRAP_PERIOD)
+
+    def test_validate_level(self):
+        """Test that the bulk validator reports steps that are too far"""
+        level = [(300, 500, 200), (320, 420, 150), (0, 300, 90), (400, 110, 90)]
+        self.assertTrue(is_reachable(300, 500, 200, 320, 420, 150))
+        self.assertEqual(validate_level(level), [3])
+
+    def test_generated_levels_are_reachable(self):
+        """Test that every generated platform is reachable from the previous one"""
+        pygame.init()
+        for seed in range(5):
+            game = Game(seed=seed)
+            level = [(p.home_x, p.home_y, p.width) for p in game.platforms]
+            for _ in range(600):
+                game.player.y -= 30
+                game.player.vel_y = JUMP_SPEED
+                game.update()
+                for platform in game.platforms:
+                    if platform.home_y < level[-1][1]:
+                        level.append((platform.home_x, platform.home_y, platform.width))
+            # The hand-placed starting layout is not generated
+            self.assertEqual(validate_level(level[9:]), [])
+
+if __name__ == '__main__':
+    unittest.main()
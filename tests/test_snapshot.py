@@ -0,0 +1,104 @@
+import time
+import unittest
+import pygame
+from src.game import Game
+from src.ghost import GhostRecorder
+from src.snapshot import HEADER, GAME, MAGIC
+
+def play(game, frames):
+    # Steer back and forth so the run covers landings and level generation
+    for frame in range(frames):
+        game.player.vel_x = 6 if (frame // 40) % 2 else -6
+        game.update()
+
+class TestSnapshot(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        self.game = Game(seed=11)
+        play(self.game, 150)
+
+    def test_roundtrip_is_exact(self):
+        """Test that restoring a snapshot reproduces the same snapshot"""
+        data = self.game.snapshot()
+        other = Game(seed=99)
+        other.restore(data)
+        self.assertEqual(other.snapshot(), data)
+        self.assertEqual(len(other.platforms), len(self.game.platforms))
+        self.assertEqual(other.player.rect, self.game.player.rect)
+
+    def test_restored_game_continues_identically(self):
+        """Test that a restored game plays out exactly like the original"""
+        data = self.game.snapshot()
+        branch = Game(seed=99)
+        branch.restore(data)
+        play(self.game, 300)
+        play(branch, 300)
+        # Start and end times are wall-clock ticks, so only those may differ
+        skip = HEADER.size + GAME.size
+        self.assertEqual(branch.snapshot()[skip:], self.game.snapshot()[skip:])
+        self.assertEqual(branch.score, self.game.score)
+        self.assertEqual(branch.game_over, self.game.game_over)
+
+    def test_every_effect_survives(self):
+        """Test that running effects come back with their names and frames left"""
+        effects = self.game.player.effects
+        effects.start("haste", 40)
+        self.game.player.shield_timer = 25
+        data = self.game.snapshot()
+        other = Game(seed=99)
+        other.player.effects.start("stale", 10)
+        other.restore(data)
+        self.assertEqual(other.player.effects.active, effects.active)
+        self.assertEqual(other.player.effects.remaining("haste"), 40)
+        self.assertEqual(other.player.shield_timer, 25)
+        self.assertEqual(other.snapshot(), data)
+
+    def test_rollback_rewinds_ghosts(self):
+        """Test that restoring takes back recorded frames and puts the raced ghost in step"""
+        track = GhostRecorder()
+        for frame in range(400):
+            track.record(frame * 3 % 800, 500 - frame)
+        game = Game(seed=4, high_score_path=None)
+        game.best_ghost = track.encode()
+        game.init_game()
+        play(game, 100)
+        data = game.snapshot()
+        recorded = game.recorder.encode()
+        position = game.ghost_position
+        play(game, 50)
+        self.assertGreater(game.recorder.frames, 100)
+
+        game.restore(data)
+        self.assertEqual(game.recorder.frames, 100)
+        self.assertEqual(game.recorder.encode(), recorded)
+        self.assertEqual(game.ghost_position, position)
+        game.update()
+        self.assertEqual(game.ghost_position, ((100 * 3) % 800, 400))
+
+    def test_rollback(self):
+        """Test that a game can be rewound to an earlier snapshot"""
+        data = self.game.snapshot()
+        score = self.game.score
+        play(self.game, 200)
+        self.game.end_game()
+        self.game.restore(data)
+        self.assertFalse(self.game.game_over)
+        self.assertEqual(self.game.score, score)
+
+    def test_rejects_other_versions(self):
+        """Test that snapshots with an unknown header are refused"""
+        data = self.game.snapshot()
+        with self.assertRaises(ValueError):
+            self.game.restore(HEADER.pack(MAGIC, 999) + data[HEADER.size:])
+        with self.assertRaises(ValueError):
+            self.game.restore(b"XXXX" + data[4:])
+
+    def test_snapshot_is_fast(self):
+        """Test that snapshot and restore each take well under a millisecond"""
+        start = time.perf_counter()
+        for _ in range(100):
+            self.game.restore(self.game.snapshot())
+        self.assertLess((time.perf_counter() - start) / 100, 0.001)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+import logging
+import os
+import tempfile
+import pygame
+from src.game import Game
+from src.bot import AutoPlayer
+from src.logger import setup_logger
+from src.soak import SoakRunner, detect_growth
+
+class TestSoak(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+
+    def test_detect_growth(self):
+        """Test that only steady growth is flagged, not jitter"""
+        leak = [100 + i * 3 + (i % 2) * 5 for i in range(40)]
+        self.assertTrue(detect_growth(leak))
+
+        jitter = [100 + (i * 7) % 11 for i in range(40)]
+        self.assertFalse(detect_growth(jitter))
+
+        # Growth smaller than the threshold is ignored
+        self.assertFalse(detect_growth(leak, min_increase=1000))
+        # Too few samples to tell
+        self.assertFalse(detect_growth([1, 2, 3]))
+
+    def test_soak_runner_samples(self):
+        """Test that a short soak session restarts runs and samples resources"""
+        # A short stall limit forces plenty of restarts through init_game()
+        runner = SoakRunner(6000, sample_every=500, seed=7, log=False, stall_frames=60)
+        growth = runner.run()
+
+        self.assertEqual(len(runner.samples), 13)
+        self.assertGreater(runner.runs, 0)
+        self.assertNotIn("files", growth)
+        self.assertNotIn("platforms", growth)
+        for sample in runner.samples:
+            self.assertGreater(sample.objects, 0)
+
+    def test_autoplayer_climbs(self):
+        """Test that the autoplayer makes progress on its own"""
+        game = Game(seed=3)
+        bot = AutoPlayer()
+        for _ in range(1200):
+            if game.game_over:
+                break
+            bot.act(game)
+            game.update()
+        self.assertGreater(game.score, 50)
+
+    def test_setup_logger_is_idempotent(self):
+        """Test that repeated logger setup does not stack handlers"""
+        name = "soak_test_logger"
+        with tempfile.TemporaryDirectory() as log_dir:
+            logger = setup_logger(name, log_dir=log_dir)
+            handlers = len(logger.handlers)
+            for _ in range(5):
+                setup_logger(name, log_dir=log_dir)
+            self.assertEqual(len(logging.getLogger(name).handlers), handlers)
+            self.assertEqual(len(os.listdir(log_dir)), 1)
+
+            for handler in list(logger.handlers):
+                handler.close()
+                logger.removeHandler(handler)
+
+    def tearDown(self):
+        pygame.quit()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import os
+import shutil
+import tempfile
+import unittest
+import wave
+
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+from src.game import Game
+from src.settings import Settings
+from src.sound_manager import SoundManager, SOUND_EFFECTS
+
+class TestSoundManager(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        self.sound_dir = tempfile.mkdtemp()
+        for _, filename, _ in SOUND_EFFECTS.values():
+            with wave.open(os.path.join(self.sound_dir, filename), "wb") as f:
+                f.setnchannels(1)
+                f.setsampwidth(2)
+                f.setframerate(22050)
+                # One second, long enough to still be playing during the test
+                f.writeframes(b"\x01\x00" * 22050)
+        self.settings = Settings(pygame.Surface((10, 10)))
+        self.sound = SoundManager(self.settings, sound_dir=self.sound_dir)
+        self.assertTrue(self.sound.wait_until_loaded(5))
+        if not self.sound.enabled:
+            self.skipTest("no audio driver available")
+
+    def tearDown(self):
+        pygame.mixer.stop()
+        shutil.rmtree(self.sound_dir)
+
+    def test_effects_loaded_in_background(self):
+        """Test that every effect is decoded by the loader thread"""
+        self.assertEqual(set(self.sound.sounds), set(SOUND_EFFECTS))
+        self.assertIsNot(self.sound.loader, None)
+
+    def test_voice_limit_steals_oldest(self):
+        """Test that rapid repeats of a sound reuse its oldest voice"""
+        first = self.sound.play("land")
+        second = self.sound.play("land")
+        self.assertIsNot(first, second)
+        self.assertIs(self.sound.play("land"), first)
+        self.assertEqual(self.sound.active_voices("landing"), 2)
+
+    def test_categories_do_not_share_channels(self):
+        """Test that a full landing pool never takes power-up channels"""
+        for _ in range(10):
+            self.sound.play("land")
+            self.sound.play("jump")
+        channel = self.sound.play("powerup")
+        self.assertIn(channel, self.sound.pools["powerup"])
+        for channel, _ in self.sound.voices["landing"]:
+            self.assertIn(channel, self.sound.pools["landing"])
+
+    def test_volume_follows_settings(self):
+        """Test that changing the settings volume is applied on the next update"""
+        self.settings.sfx_volume = 30
+        self.settings.music_volume = 50
+        self.sound.update()
+        self.assertAlmostEqual(self.sound.pools["ui"][0].get_volume(), 0.3, places=2)
+        self.assertAlmostEqual(pygame.mixer.music.get_volume(), 0.5, places=2)
+
+    def test_missing_sound_is_skipped(self):
+        """Test that playing an effect that is not loaded does nothing"""
+        self.sound.sounds.clear()
+        self.assertIsNone(self.sound.play("land"))
+
+    def test_game_plays_landing(self):
+        """Test that landing on a platform plays the landing sound"""
+        game = Game(sound=self.sound)
+        game.player.vel_y = 5
+        game.player.y -= 2
+        for _ in range(5):
+            game.update()
+        self.assertGreater(self.sound.active_voices("landing"), 0)
+
+if __name__ == '__main__':
+    unittest.main()
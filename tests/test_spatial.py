@@ -0,0 +1,99 @@
+import unittest
+import pygame
+from src.constants import POWERUP_DOUBLE_JUMP, SCREEN_HEIGHT, MAX_FALL_DISTANCE
+from src.game import Game
+from src.powerup import PowerUp
+from src.spatial import SpatialGrid
+
+class TestSpatialGrid(unittest.TestCase):
+    def test_query_returns_nearby_items_in_insertion_order(self):
+        """Test that a query finds overlapping items once each, oldest first"""
+        grid = SpatialGrid(100)
+        grid.insert("wide", 0, 0, 350, 10)
+        grid.insert("far", 900, 900, 950, 950)
+        grid.insert("small", 120, 5, 140, 15)
+        self.assertEqual(grid.query(50, 0, 250, 20), ["wide", "small"])
+        self.assertEqual(grid.query(900, 900, 910, 910), ["far"])
+        self.assertEqual(list(grid.query(500, 500, 510, 510)), [])
+
+    def test_remove_and_reinsert(self):
+        """Test that removed items stop matching and reinserting moves them"""
+        grid = SpatialGrid(100)
+        grid.insert("a", 0, 0, 10, 10)
+        grid.insert("b", 0, 0, 10, 10)
+        grid.remove("a")
+        self.assertEqual(grid.query(0, 0, 10, 10), ["b"])
+        grid.insert("b", 500, 500, 510, 510)
+        self.assertEqual(list(grid.query(0, 0, 10, 10)), [])
+        self.assertEqual(len(grid), 1)
+        self.assertEqual(grid.cells.keys(), {(5, 5)})
+
+    def test_move_keeps_insertion_order(self):
+        """Test that moving an item refiles it without changing its order"""
+        grid = SpatialGrid(100)
+        grid.insert("first", 0, 0, 10, 10)
+        grid.insert("second", 300, 0, 310, 10)
+        grid.move("first", 290, 0, 300, 10)
+        self.assertEqual(grid.query(290, 0, 310, 10), ["first", "second"])
+        self.assertEqual(list(grid.query(0, 0, 10, 10)), [])
+        self.assertEqual(grid.query_radius(300, 5, 20), ["first", "second"])
+
+class TestMultiplayer(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        self.game = Game(seed=5, players=3, high_score_path=None)
+
+    def test_players_share_the_level(self):
+        """Test that every player starts on the first platform and can land on it"""
+        platform = self.game.platforms[0]
+        self.assertEqual(len(self.game.players), 3)
+        for player in self.game.players:
+            self.assertEqual(player.rect.bottom, platform.rect.top)
+        for _ in range(120):
+            self.game.update()
+        self.assertFalse(self.game.game_over)
+        self.assertEqual(len(self.game.platform_grid), len(self.game.platforms))
+
+    def test_powerup_goes_to_the_player_who_took_it(self):
+        """Test that a power-up only affects the player who touched it"""
+        second = self.game.players[1]
+        self.game.powerups.append(PowerUp(second.rect.x, second.rect.y, POWERUP_DOUBLE_JUMP))
+        self.game.update()
+        self.assertEqual(second.double_jumps_left, 2)
+        self.assertEqual(self.game.players[0].double_jumps_left, 0)
+        self.assertEqual(self.game.players[2].double_jumps_left, 0)
+
+    def test_game_ends_when_every_player_is_out(self):
+        """Test that players drop out one by one and the last one ends the game"""
+        players = self.game.players
+        # Well below the others, who set the camera
+        players[0].y = players[1].y + SCREEN_HEIGHT
+        self.game.update()
+        self.assertFalse(players[0].alive)
+        self.assertFalse(self.game.game_over)
+        # The camera follows the survivors, so the rest have to fall out
+        for player in players[1:]:
+            player.vel_y = 5
+            player.is_falling = True
+            player.fall_start_y = player.y - MAX_FALL_DISTANCE - 50
+            player.y += 300
+        self.game.update()
+        self.assertTrue(self.game.game_over)
+        self.assertEqual(self.game.death_cause, "fall")
+
+    def test_snapshot_keeps_every_player(self):
+        """Test that a snapshot restores all players into a single-player game"""
+        for _ in range(60):
+            self.game.update()
+        data = self.game.snapshot()
+        other = Game(seed=1, high_score_path=None)
+        other.restore(data)
+        self.assertEqual(other.snapshot(), data)
+        self.assertEqual([p.rect for p in other.players], [p.rect for p in self.game.players])
+        self.assertIs(other.player, other.players[0])
+
+    def tearDown(self):
+        pygame.quit()
+
+if __name__ == '__main__':
+    unittest.main()
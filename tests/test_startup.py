@@ -0,0 +1,43 @@
+import unittest
+import pygame
+from main import GameManager
+from src.fonts import get_font
+from src.startup import StartupTimer, process_age
+
+class TestStartup(unittest.TestCase):
+    def test_fonts_are_shared(self):
+        """Test that the same font size is only loaded once"""
+        self.assertIs(get_font(24), get_font(24))
+        self.assertIsNot(get_font(24), get_font(36))
+
+    def test_fonts_reload_after_quit(self):
+        """Test that the registry does not hand out fonts from before pygame.quit()"""
+        font = get_font(30)
+        pygame.quit()
+        fresh = get_font(30)
+        self.assertIsNot(font, fresh)
+        self.assertGreater(fresh.render("x", True, (255, 255, 255)).get_width(), 0)
+
+    def test_lazy_init(self):
+        """Test that the menu comes up without initialising unused pygame modules"""
+        pygame.quit()
+        manager = GameManager()
+        self.assertTrue(pygame.display.get_init())
+        self.assertFalse(pygame.mixer.get_init())
+        self.assertIsNone(manager.sound.loader)
+        self.assertEqual([name for name, _ in manager.startup.marks], ["display", "menu"])
+
+    def test_startup_report(self):
+        """Test that the report lists every phase in order"""
+        timer = StartupTimer()
+        timer.mark("imports")
+        timer.mark("first frame")
+        report = timer.format_report()
+        self.assertIn("to first frame", report)
+        self.assertLess(report.index("imports"), report.index("  first frame"))
+        self.assertGreaterEqual(timer.elapsed_ms(), 0)
+        if process_age() is not None:
+            self.assertTrue(timer.from_process)
+
+if __name__ == '__main__':
+    unittest.main()